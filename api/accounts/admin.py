@@ -3,12 +3,19 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from .models import User
+from .models import OutboxEmail, ProfilerConfig, User
+from .pagination import EstimatedCountPaginator
 
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
-    """Custom User admin."""
+    """
+    Custom User admin.
+
+    Built for large tables: counts are estimated, the unfiltered total is
+    not counted, and ordering, filters and search are index-backed (see
+    ``User.Meta.indexes``).
+    """
 
     list_display = (
         "email",
@@ -19,7 +26,10 @@ class UserAdmin(BaseUserAdmin):
     )
     list_filter = ("is_active", "is_staff", "agreed_to_terms")
     search_fields = ("email", "full_name")
-    ordering = ("-date_joined",)
+    ordering = ("-date_joined", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
 
     fieldsets = (
         (None, {"fields": ("email", "password")}),
@@ -55,3 +65,33 @@ class UserAdmin(BaseUserAdmin):
             },
         ),
     )
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """Read-only view of queued and delivered emails."""
+
+    list_display = ("subject", "to", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    ordering = ("-created_at",)
+    readonly_fields = [field.name for field in OutboxEmail._meta.fields]
+
+    def has_add_permission(self, request) -> bool:
+        """Emails are only queued by the application."""
+        return False
+
+
+@admin.register(ProfilerConfig)
+class ProfilerConfigAdmin(admin.ModelAdmin):
+    """Turn the sampling profiler on for selected routes."""
+
+    list_display = ("__str__", "url_names", "sample_percent", "expires_at")
+    readonly_fields = ("updated_at",)
+
+    def has_add_permission(self, request) -> bool:
+        """Allow creating the single row only once."""
+        return not ProfilerConfig.objects.exists()
+
+    def has_delete_permission(self, request, obj=None) -> bool:
+        """Disable instead of deleting."""
+        return False
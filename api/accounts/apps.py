@@ -8,3 +8,10 @@ class AccountsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self) -> None:
+        """Connect signal handlers, register system checks and JWT keys."""
+        from . import checks, signals  # noqa: F401
+        from .keys import install_token_backend
+
+        install_token_backend()
@@ -0,0 +1,95 @@
+"""Custom authentication classes."""
+
+from functools import cache
+
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import token_cache, token_epochs, user_cache
+from .keys import signing_keys
+from .metrics import metrics
+from .models import User
+from .routers import routing
+from .tokens import TOKEN_EPOCH_CLAIM
+
+
+@cache
+def cached_user_fields() -> tuple[str, ...]:
+    """Return the cached user columns in model field order, as from_db expects."""
+    return tuple(
+        f.attname for f in User._meta.concrete_fields if f.attname in user_cache.fields
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that reuses validated tokens and cached users."""
+
+    def get_validated_token(self, raw_token: bytes) -> Token:
+        """Return the validated token, reusing an earlier validation of it."""
+        if not token_cache.enabled:
+            return super().get_validated_token(raw_token)
+        if signing_keys.enabled:
+            # Re-reads a changed ring, revoking cached tokens of removed keys.
+            signing_keys.keys()
+        token = token_cache.get(raw_token)
+        if token is not None:
+            metrics.inc("auth_token_cache_lookups_total", result="hit")
+            return token
+        metrics.inc("auth_token_cache_lookups_total", result="miss")
+        epoch = token_cache.epoch
+        token = super().get_validated_token(raw_token)
+        token_cache.set(raw_token, token, epoch)
+        return token
+
+    def get_user(self, validated_token: Token) -> User:
+        """Return the user for the token, loading only the cached columns."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        # Users who just wrote must not see (or cache) a lagging replica's row.
+        routing.stick_if_pinned(user_id)
+        fields = cached_user_fields()
+        values = user_cache.get(user_id)
+        if values is None:
+            values = (
+                User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values_list(*fields)
+                .first()
+            )
+            if values is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.set(user_id, values)
+
+        user = User.from_db(router.db_for_read(User), fields, values)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # The row may be a few seconds old, so it only fills a missing epoch.
+        epoch = token_epochs.get(user_id)
+        if epoch is None:
+            epoch = user.token_epoch
+            token_epochs.fill(user_id, epoch)
+        if validated_token.get(TOKEN_EPOCH_CLAIM, 0) < epoch:
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
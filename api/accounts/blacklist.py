@@ -0,0 +1,218 @@
+"""Bloom-filter front for the refresh token blacklist."""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.db.models import Q
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(
+            -self.capacity * math.log(error_rate) / (math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> None:
+        """Add item to the set; items already present are not counted twice."""
+        added = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+
+class BlacklistFilter:
+    """
+    Per-process Bloom filter of blacklisted refresh token JTIs.
+
+    A negative answer means the JTI is definitely not blacklisted and the SQL
+    check can be skipped; a positive answer must be confirmed against the
+    database. Workers learn about each other's writes through a generation
+    counter in the shared cache and catch up with an incremental query for
+    rows above the highest id seen. Ids skipped on the way, whose rows may
+    still be committing, are re-read until they show up or ``GAP_TIMEOUT``
+    passes. The filter is first built by one request while the others check
+    SQL, and later rebuilt in a background thread.
+    """
+
+    generation_key = "accounts:blacklist:generation"
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_BLACKLIST_FILTER
+        self.enabled: bool = config.get("ENABLED", True)
+        self.error_rate: float = config.get("ERROR_RATE", 0.01)
+        self.min_capacity: int = config.get("MIN_CAPACITY", 100_000)
+        self.sync_interval: float = config.get("SYNC_INTERVAL", 1.0)
+        self.rebuild_interval: float = config.get("REBUILD_INTERVAL", 3600.0)
+        self.gap_timeout: float = config.get("GAP_TIMEOUT", 60.0)
+        self.max_gaps: int = config.get("MAX_GAPS", 1000)
+        self.cache_alias: str = config.get("CACHE_ALIAS", "default")
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all state; the next lookup rebuilds from the database."""
+        self._bloom: BloomFilter | None = None
+        self._last_id = 0
+        self._gaps: dict[int, float] = {}
+        self._generation = None
+        self._built_at = 0.0
+        self._synced_at = 0.0
+        self._rebuilding = False
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def might_contain(self, jti: str) -> bool:
+        """Return False only if jti is definitely not blacklisted."""
+        if not self.enabled:
+            return True
+        self._sync()
+        bloom = self._bloom
+        return bloom is None or jti in bloom
+
+    def add(self, jti: str) -> None:
+        """Record a newly blacklisted jti and notify other workers on commit."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+        transaction.on_commit(self._bump_generation)
+
+    def rows_added(self) -> None:
+        """Have every worker catch up with rows inserted without add()."""
+        if self.enabled:
+            transaction.on_commit(self._bump_generation)
+
+    def _bump_generation(self) -> None:
+        try:
+            self.cache.incr(self.generation_key)
+        except ValueError:
+            self.cache.set(self.generation_key, 1, None)
+
+    def _sync(self) -> None:
+        now = time.monotonic()
+        generation = self.cache.get(self.generation_key)
+        bloom = self._bloom
+        if bloom is None:
+            # One request builds the filter; the others check SQL meanwhile.
+            if self._lock.acquire(blocking=False):
+                try:
+                    if self._bloom is None:
+                        self._rebuild(now, generation)
+                finally:
+                    self._lock.release()
+            return
+        if not self._rebuilding and (
+            bloom.count > bloom.capacity
+            or now - self._built_at >= self.rebuild_interval
+        ):
+            self._rebuilding = True
+            threading.Thread(
+                target=self._rebuild_in_background,
+                name="blacklist-filter-rebuild",
+                daemon=True,
+            ).start()
+        if (
+            generation != self._generation
+            or now - self._synced_at >= self.sync_interval
+        ):
+            with self._lock:
+                if (
+                    generation != self._generation
+                    or now - self._synced_at >= self.sync_interval
+                ):
+                    self._catch_up(now, generation)
+
+    def _load(self) -> tuple[BloomFilter, int, dict[int, float]]:
+        """Read every blacklisted JTI into a new filter."""
+        count = BlacklistedToken.objects.count()
+        bloom = BloomFilter(max(self.min_capacity, count * 2), self.error_rate)
+        ids = []
+        rows = BlacklistedToken.objects.order_by().values_list("pk", "token__jti")
+        for pk, jti in rows.iterator(chunk_size=5000):
+            bloom.add(jti)
+            ids.append(pk)
+        last_id = max(ids, default=0)
+        # Rows still committing may sit just below the highest id.
+        recent = {pk for pk in ids if pk > last_id - self.max_gaps}
+        now = time.monotonic()
+        gaps = {
+            pk: now
+            for pk in range(max(1, last_id - self.max_gaps + 1), last_id)
+            if pk not in recent
+        }
+        return bloom, last_id, gaps
+
+    def _rebuild(self, now: float, generation) -> None:
+        self._bloom, self._last_id, self._gaps = self._load()
+        self._generation = generation
+        self._built_at = self._synced_at = now
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            state = self._load()
+            with self._lock:
+                self._bloom, self._last_id, self._gaps = state
+                self._built_at = time.monotonic()
+                # Pick up rows committed while the table was being read.
+                self._catch_up(self._built_at, self._generation)
+        finally:
+            self._rebuilding = False
+            connections.close_all()
+
+    def _catch_up(self, now: float, generation) -> None:
+        query = Q(pk__gt=self._last_id)
+        if self._gaps:
+            query |= Q(pk__in=list(self._gaps))
+        rows = (
+            BlacklistedToken.objects.filter(query)
+            .order_by("pk")
+            .values_list("pk", "token__jti")
+        )
+        for pk, jti in rows:
+            self._bloom.add(jti)
+            self._gaps.pop(pk, None)
+            if pk > self._last_id:
+                # Skipped ids belong to rows not committed yet, or rolled back.
+                skipped = range(max(self._last_id + 1, pk - self.max_gaps), pk)
+                self._gaps.update(dict.fromkeys(skipped, now))
+                self._last_id = pk
+        expired = now - self.gap_timeout
+        self._gaps = {pk: seen for pk, seen in self._gaps.items() if seen > expired}
+        if len(self._gaps) > self.max_gaps:
+            self._gaps = dict(sorted(self._gaps.items())[-self.max_gaps :])
+        self._generation = generation
+        self._synced_at = now
+
+
+blacklist_filter = BlacklistFilter()
@@ -0,0 +1,329 @@
+"""In-process caches used on the authentication hot path."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache with an optional per-entry TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if absent or expired."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store value under key, evicting the least recently used entry."""
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class UserCache:
+    """
+    Cache of the user columns needed to authenticate a request.
+
+    Rows are kept in a per-process LRU and, when ``CACHE_ALIAS`` is set, in
+    the named Django cache so that workers share entries. A committed write
+    leaves an invalidation marker for the user in the ``BROADCAST_ALIAS``
+    cache. Before serving an entry, a worker checks its marker at most every
+    ``SYNC_INTERVAL`` seconds and drops the entry if it predates the marker.
+    Batches of more than ``MAX_MARKERS`` users bump one generation counter
+    instead, which makes every worker drop all of its entries.
+    """
+
+    key_prefix = "accounts:user:"
+    marker_prefix = "accounts:user-invalidated:"
+    generation_key = "accounts:user:generation"
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_USER_CACHE
+        self.enabled: bool = config.get("ENABLED", True)
+        self.fields: tuple[str, ...] = tuple(config["FIELDS"])
+        self.timeout: int = config.get("TIMEOUT", 300)
+        self.alias: str | None = config.get("CACHE_ALIAS")
+        self.local = LRUCache(
+            maxsize=config.get("MAXSIZE", 1024),
+            ttl=config.get("LOCAL_TTL", 30),
+        )
+        self.broadcast_alias: str | None = config.get("BROADCAST_ALIAS", "shared")
+        self.sync_interval: float = config.get("SYNC_INTERVAL", 1.0)
+        self.max_markers: int = config.get("MAX_MARKERS", 100)
+        self._generation: int | None = None
+        self._checked = float("-inf")
+
+    @property
+    def shared(self):
+        """Return the shared Django cache, if one is configured."""
+        return caches[self.alias] if self.alias else None
+
+    @property
+    def broadcast(self):
+        """Return the cache holding invalidation markers, if any."""
+        return caches[self.broadcast_alias] if self.broadcast_alias else None
+
+    @property
+    def marker_timeout(self) -> float | None:
+        """Return how long a marker must outlive the entries it rejects."""
+        if self.local.ttl is None:
+            return None
+        return self.local.ttl + self.sync_interval
+
+    def _sync(self) -> None:
+        """Drop local entries if a batch was invalidated since the last check."""
+        now = time.monotonic()
+        if self.broadcast is None or now - self._checked < self.sync_interval:
+            return
+        self._checked = now
+        generation = self.broadcast.get(self.generation_key, 0)
+        if generation != self._generation:
+            self.local.clear()
+            self._generation = generation
+
+    def _bump_generation(self) -> None:
+        try:
+            generation = self.broadcast.incr(self.generation_key)
+        except ValueError:
+            if self.broadcast.add(self.generation_key, 1, None):
+                return
+            generation = self.broadcast.incr(self.generation_key)
+        if self._generation == generation - 1:
+            # Only our own bump: the batch's local entries are already gone.
+            self._generation = generation
+
+    def _key(self, user_id: Any) -> str:
+        return f"{self.key_prefix}{user_id}"
+
+    def _marker_key(self, user_id: Any) -> str:
+        return f"{self.marker_prefix}{user_id}"
+
+    def _is_current(self, user_id: Any, entry: list) -> bool:
+        """Return whether entry was cached after user_id's last invalidation."""
+        now = time.monotonic()
+        if self.broadcast is None or now - entry[2] < self.sync_interval:
+            return True
+        entry[2] = now
+        invalidated = self.broadcast.get(self._marker_key(user_id))
+        return invalidated is None or invalidated < entry[1]
+
+    def get(self, user_id: Any) -> tuple | None:
+        """Return the cached column values for user_id, if any."""
+        if not self.enabled:
+            return None
+        self._sync()
+        key = self._key(user_id)
+        # [values, wall-clock time cached, monotonic time of the last check]
+        entry = self.local.get(key)
+        if entry is not None:
+            if self._is_current(user_id, entry):
+                return entry[0]
+            self.local.delete(key)
+        if self.shared is None:
+            return None
+        values = self.shared.get(key)
+        if values is not None:
+            self._set_local(key, values)
+        return values
+
+    def _set_local(self, key: str, values: tuple) -> None:
+        self.local.set(key, [values, time.time(), time.monotonic()])
+
+    def set(self, user_id: Any, values: tuple) -> None:
+        """Cache the column values for user_id."""
+        if not self.enabled:
+            return
+        key = self._key(user_id)
+        self._set_local(key, values)
+        if self.shared is not None:
+            self.shared.set(key, values, self.timeout)
+
+    def invalidate(self, user_id: Any, broadcast: bool = True) -> None:
+        """Drop user_id from the caches and tell other workers to drop theirs."""
+        self.invalidate_many([user_id], broadcast)
+
+    def invalidate_many(self, user_ids: list, broadcast: bool = True) -> None:
+        """
+        Drop user_ids from the caches.
+
+        With broadcast, also tell other workers to drop theirs: one marker
+        per user, or one generation bump for more than ``MAX_MARKERS``.
+        """
+        keys = [self._key(user_id) for user_id in user_ids]
+        for key in keys:
+            self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete_many(keys)
+        if not broadcast or self.broadcast is None or not keys:
+            return
+        if len(keys) > self.max_markers:
+            self._bump_generation()
+            return
+        now = time.time()
+        self.broadcast.set_many(
+            {self._marker_key(user_id): now for user_id in user_ids},
+            self.marker_timeout,
+        )
+
+    def clear(self) -> None:
+        """Drop all locally cached users."""
+        self.local.clear()
+        self._generation = None
+        self._checked = float("-inf")
+
+
+class TokenCache:
+    """
+    Cache of validated access tokens, keyed by a digest of the raw token.
+
+    A hit skips decoding, the signature check and claim validation; the user
+    lookup and its checks still run on every request. Entries expire with
+    the token and belong to the epoch they were validated in, so
+    ``revoke_all`` drops them all with one integer bump.
+    """
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_TOKEN_CACHE
+        self.enabled: bool = config.get("ENABLED", True)
+        self.local = LRUCache(maxsize=config.get("MAXSIZE", 8192))
+        self.epoch = 0
+
+    @staticmethod
+    def _key(raw_token: bytes) -> bytes:
+        return hashlib.blake2b(raw_token, digest_size=16).digest()
+
+    def get(self, raw_token: bytes) -> Any:
+        """Return the validated token for raw_token, if it is cached."""
+        entry = self.local.get(self._key(raw_token))
+        if entry is None or entry[0] != self.epoch:
+            return None
+        return entry[1]
+
+    def set(self, raw_token: bytes, token: Any, epoch: int) -> None:
+        """Cache token, validated in epoch, until it expires."""
+        ttl = token["exp"] - time.time()
+        if ttl > 0 and epoch == self.epoch:
+            self.local.set(self._key(raw_token), (epoch, token), ttl)
+
+    def revoke_all(self) -> None:
+        """Make every cached token go through full validation again."""
+        self.epoch += 1
+
+    def clear(self) -> None:
+        """Drop all cached tokens and reset statistics."""
+        self.local.clear()
+
+
+class TokenEpochCache:
+    """
+    Current token epoch of each user, kept in the ``CACHE_ALIAS`` cache.
+
+    Workers keep epochs for ``LOCAL_TTL`` seconds, so checking a token costs
+    an in-memory comparison. Bumps overwrite entries in the shared cache,
+    while fills from possibly stale rows only add missing ones. The shared
+    cache may be local to one host, so its entries expire after
+    ``SHARED_TTL`` seconds and the database stays the source of truth: other
+    hosts see a bump once their entry expires and the user row is read again.
+    """
+
+    key_prefix = "accounts:token-epoch:"
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_TOKEN_EPOCHS
+        self.alias: str = config.get("CACHE_ALIAS", "shared")
+        self.shared_ttl: float = config.get("SHARED_TTL", 5.0)
+        self.local = LRUCache(
+            maxsize=config.get("MAXSIZE", 8192), ttl=config.get("LOCAL_TTL", 1.0)
+        )
+
+    @property
+    def shared(self):
+        """Return the shared Django cache."""
+        return caches[self.alias]
+
+    def _key(self, user_id: Any) -> str:
+        return f"{self.key_prefix}{user_id}"
+
+    def get(self, user_id: Any) -> int | None:
+        """Return the cached token epoch of user_id, if any."""
+        key = self._key(user_id)
+        epoch = self.local.get(key)
+        if epoch is None:
+            epoch = self.shared.get(key)
+            if epoch is not None:
+                self.local.set(key, epoch)
+        return epoch
+
+    def fill(self, user_id: Any, epoch: int) -> None:
+        """Cache an epoch read from the database, unless one is cached."""
+        key = self._key(user_id)
+        if not self.shared.add(key, epoch, self.shared_ttl):
+            epoch = self.shared.get(key, epoch)
+        self.local.set(key, epoch)
+
+    def set(self, user_id: Any, epoch: int) -> None:
+        """Publish a bumped epoch of user_id to every worker."""
+        key = self._key(user_id)
+        self.shared.set(key, epoch, self.shared_ttl)
+        self.local.set(key, epoch)
+
+    def clear(self) -> None:
+        """Drop all locally cached epochs."""
+        self.local.clear()
+
+
+user_cache = UserCache()
+token_cache = TokenCache()
+token_epochs = TokenEpochCache()
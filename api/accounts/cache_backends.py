@@ -0,0 +1,160 @@
+"""Django cache backend shared by all worker processes on a host."""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache stored in a local SQLite file.
+
+    Every worker process on the host opens the same file, so entries and
+    atomic ``incr`` counters are shared between gunicorn workers without an
+    external cache server. Point ``LOCATION`` at a tmpfs path such as
+    ``/dev/shm`` to keep it in memory.
+
+    Integers are stored natively so ``incr``/``decr`` run as a single UPDATE;
+    other values are pickled. ``expires`` holds an absolute timestamp.
+    """
+
+    cull_every = 1000
+
+    def __init__(self, location: str, params: dict) -> None:
+        super().__init__(params)
+        self.path = location
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _encode(value):
+        return value if type(value) is int else pickle.dumps(value)
+
+    @staticmethod
+    def _decode(value):
+        return value if type(value) is int else pickle.loads(value)
+
+    def _key(self, key, version) -> str:
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def _after_write(self, conn: sqlite3.Connection) -> None:
+        self._writes += 1
+        if self._writes % self.cull_every:
+            return
+        conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+        (count,) = conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count > self._max_entries:
+            conn.execute(
+                "DELETE FROM cache WHERE rowid IN "
+                "(SELECT rowid FROM cache ORDER BY rowid LIMIT ?)",
+                (count // self._cull_frequency if self._cull_frequency else count,),
+            )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        """Set key only if it is absent or expired."""
+        key = self._key(key, version)
+        conn = self._connection()
+        cursor = conn.execute(
+            "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+            "expires = excluded.expires WHERE cache.expires <= ?",
+            (key, self._encode(value), self.get_backend_timeout(timeout), time.time()),
+        )
+        self._after_write(conn)
+        return cursor.rowcount > 0
+
+    def get(self, key, default=None, version=None):
+        """Return the value for key, or default if absent or expired."""
+        key = self._key(key, version)
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM cache WHERE key = ? "
+                "AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return default if row is None else self._decode(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> None:
+        """Store value under key."""
+        key = self._key(key, version)
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, self._encode(value), self.get_backend_timeout(timeout)),
+        )
+        self._after_write(conn)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        """Update the expiry of a live key."""
+        key = self._key(key, version)
+        cursor = self._connection().execute(
+            "UPDATE cache SET expires = ? WHERE key = ? "
+            "AND (expires IS NULL OR expires > ?)",
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None) -> bool:
+        """Remove key; return whether it existed."""
+        key = self._key(key, version)
+        cursor = self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def has_key(self, key, version=None) -> bool:
+        """Return whether a live value exists for key."""
+        key = self._key(key, version)
+        row = (
+            self._connection()
+            .execute(
+                "SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row is not None
+
+    def incr(self, key, delta=1, version=None) -> int:
+        """Atomically add delta to an integer value."""
+        key = self._key(key, version)
+        row = (
+            self._connection()
+            .execute(
+                "UPDATE cache SET value = value + ? WHERE key = ? "
+                "AND typeof(value) = 'integer' "
+                "AND (expires IS NULL OR expires > ?) RETURNING value",
+                (delta, key, time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            raise ValueError(f"Key '{key}' not found.")
+        return row[0]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._connection().execute("DELETE FROM cache")
@@ -0,0 +1,97 @@
+"""System checks for the accounts app."""
+
+from django.apps import apps
+from django.conf import settings
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import NoReverseMatch, reverse
+
+from .keys import signing_keys
+from .middleware import route_middleware
+from .routers import routing
+
+SESSION = "django.contrib.sessions.middleware.SessionMiddleware"
+AUTHENTICATION = "django.contrib.auth.middleware.AuthenticationMiddleware"
+MESSAGES = "django.contrib.messages.middleware.MessageMiddleware"
+
+# Cache backends whose entries only the processes of one host can see.
+HOST_LOCAL_CACHES = (
+    "accounts.cache_backends.SQLiteCache",
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.filebased.FileBasedCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+)
+
+
+@checks.register(checks.Tags.admin)
+def check_admin_middleware(app_configs, **kwargs) -> list[checks.CheckMessage]:
+    """Check the admin's route runs the middleware the admin needs."""
+    if not apps.is_installed("django.contrib.admin"):
+        return []
+    try:
+        path = reverse("admin:index")
+    except NoReverseMatch:
+        return []
+    stack = []
+    for middleware in settings.MIDDLEWARE:
+        if middleware == "accounts.middleware.RouteMiddleware":
+            stack.extend(route_middleware(path))
+        else:
+            stack.append(middleware)
+    missing = [m for m in (SESSION, AUTHENTICATION, MESSAGES) if m not in stack]
+    if missing:
+        return [
+            checks.Error(
+                f"The admin at {path} needs {', '.join(missing)}; add them to "
+                "MIDDLEWARE or to its route in ACCOUNTS_ROUTE_MIDDLEWARE.",
+                id="accounts.E001",
+            )
+        ]
+    if stack.index(SESSION) > stack.index(AUTHENTICATION):
+        return [
+            checks.Error(
+                f"{SESSION} must run before {AUTHENTICATION} for the admin.",
+                id="accounts.E001",
+            )
+        ]
+    return []
+
+
+@checks.register(checks.Tags.security)
+def check_signing_keys(app_configs, **kwargs) -> list[checks.CheckMessage]:
+    """Check an asymmetric JWT algorithm has a key to sign with."""
+    if not signing_keys.enabled:
+        return []
+    try:
+        signing_keys.signing_key()
+    except (ImproperlyConfigured, OSError, ValueError) as e:
+        return [checks.Error(str(e), id="accounts.E002")]
+    return []
+
+
+@checks.register(checks.Tags.caches)
+def check_routing_cache(app_configs, **kwargs) -> list[checks.CheckMessage]:
+    """Check replica routing keeps its sticky markers in a cluster-wide cache."""
+    if not routing.enabled:
+        return []
+    backend = settings.CACHES.get(routing.alias, {}).get("BACKEND")
+    if backend is None:
+        return [
+            checks.Error(
+                f"ACCOUNTS_DATABASE_ROUTING CACHE_ALIAS {routing.alias!r} is not "
+                "in CACHES.",
+                id="accounts.E003",
+            )
+        ]
+    if backend in HOST_LOCAL_CACHES:
+        return [
+            checks.Warning(
+                f"Read replicas are configured but the {routing.alias!r} cache "
+                f"({backend}) is local to this host, so users pinned to the "
+                "primary on one app server may read stale rows on another.",
+                hint="Set DB_REPLICA_CACHE_ALIAS to a cache every app server "
+                "reaches, or run a single app server.",
+                id="accounts.W001",
+            )
+        ]
+    return []
@@ -0,0 +1,27 @@
+"""Bounded thread pool for CPU-bound work in async views."""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+cpu_executor = ThreadPoolExecutor(
+    max_workers=settings.ACCOUNTS_CPU_THREADS, thread_name_prefix="accounts-cpu"
+)
+
+
+async def run_cpu_bound(func, /, *args, **kwargs):
+    """
+    Run func in the CPU pool without blocking the event loop.
+
+    Only pass functions that do not touch the database: pool threads do not
+    take part in Django's per-request connection handling.
+    """
+    loop = asyncio.get_running_loop()
+    # run_in_executor does not propagate context variables on its own.
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        cpu_executor, functools.partial(context.run, func, *args, **kwargs)
+    )
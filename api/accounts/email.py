@@ -14,6 +14,8 @@ from djoser.email import (
     PasswordResetEmail as BasePasswordResetEmail,
 )
 
+from .mail import OutboxEmailBackend
+
 
 def get_first_name(user) -> str:
     """Get the first name from full_name, or fall back to email."""
@@ -22,7 +24,17 @@ def get_first_name(user) -> str:
     return user.email if user else ""
 
 
-class ActivationEmail(BaseActivationEmail):
+class OutboxEmailMixin:
+    """Queue the message in the email outbox instead of sending it inline."""
+
+    def get_connection(self, fail_silently: bool = False):
+        """Return the outbox backend when the outbox is enabled."""
+        if settings.EMAIL_OUTBOX["ENABLED"] and not self.connection:
+            self.connection = OutboxEmailBackend(fail_silently=fail_silently)
+        return super().get_connection(fail_silently)  # type: ignore[misc]
+
+
+class ActivationEmail(OutboxEmailMixin, BaseActivationEmail):
     """Custom activation email with frontend URL."""
 
     template_name = "accounts/email/activation.html"
@@ -40,7 +52,7 @@ class ActivationEmail(BaseActivationEmail):
         return context
 
 
-class ConfirmationEmail(BaseConfirmationEmail):
+class ConfirmationEmail(OutboxEmailMixin, BaseConfirmationEmail):
     """Custom confirmation email after activation."""
 
     template_name = "accounts/email/confirmation.html"
@@ -55,7 +67,7 @@ class ConfirmationEmail(BaseConfirmationEmail):
         return context
 
 
-class PasswordResetEmail(BasePasswordResetEmail):
+class PasswordResetEmail(OutboxEmailMixin, BasePasswordResetEmail):
     """Custom password reset email with frontend URL."""
 
     template_name = "accounts/email/password_reset.html"
@@ -73,7 +85,9 @@ class PasswordResetEmail(BasePasswordResetEmail):
         return context
 
 
-class PasswordChangedConfirmationEmail(BasePasswordChangedConfirmationEmail):
+class PasswordChangedConfirmationEmail(
+    OutboxEmailMixin, BasePasswordChangedConfirmationEmail
+):
     """Custom password changed confirmation email."""
 
     template_name = "accounts/email/password_changed_confirmation.html"
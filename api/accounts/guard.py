@@ -0,0 +1,118 @@
+"""Pre-hash rejection of login attempts under credential-stuffing attack."""
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+
+class LoginGuard:
+    """
+    Decaying failure scores per account and per client IP.
+
+    Failures are counted per ``HALF_LIFE``-long slot with atomic ``incr``,
+    so concurrent workers never lose an increment. A key's score is the sum
+    of its recent slot counts, each halved for every ``HALF_LIFE`` seconds
+    since its slot ended. Once a key has collected ``threshold`` recent
+    failures, attempts are rejected before the password hasher runs. Slot
+    counts and scores are capped at ``MAX_SCORE``, which bounds the lockout
+    to roughly ``HALF_LIFE * log2(MAX_SCORE / threshold)`` seconds.
+    """
+
+    key_prefix = "accounts:login-guard:"
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_LOGIN_GUARD
+        self.enabled: bool = config.get("ENABLED", True)
+        self.account_threshold: float = config.get("ACCOUNT_THRESHOLD", 10)
+        self.ip_threshold: float = config.get("IP_THRESHOLD", 50)
+        self.half_life: float = config.get("HALF_LIFE", 300)
+        self.max_score: float = config.get("MAX_SCORE", 160)
+        self.cache_alias: str = config.get("CACHE_ALIAS", "shared")
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @property
+    def window(self) -> int:
+        """Return how many slots are read; older capped slots add under 1."""
+        return math.ceil(math.log2(self.max_score)) + 1
+
+    def keys(self, request, username: str) -> list[tuple[str, float]]:
+        """Return the (cache key, threshold) pairs for an attempt."""
+        account = hashlib.sha256(username.strip().lower().encode()).hexdigest()[:32]
+        ip = BaseThrottle().get_ident(request)
+        return [
+            (f"{self.key_prefix}account:{account}", self.account_threshold),
+            (f"{self.key_prefix}ip:{ip}", self.ip_threshold),
+        ]
+
+    def slot_keys(self, key: str, now: float) -> list[tuple[str, int]]:
+        """Return the (cache key, slot) pairs of key's counters, newest first."""
+        current = int(now // self.half_life)
+        return [
+            (f"{key}:{slot}", slot)
+            for slot in range(current, current - self.window, -1)
+        ]
+
+    def _score(
+        self, counts: dict, slot_keys: list[tuple[str, int]], now: float
+    ) -> float:
+        score = 0.0
+        for slot_key, slot in slot_keys:
+            count = counts.get(slot_key)
+            if count:
+                # Failures are dated to the end of their slot.
+                age = max(now - (slot + 1) * self.half_life, 0.0)
+                score += min(count, self.max_score) * 0.5 ** (age / self.half_life)
+        return min(score, self.max_score)
+
+    def retry_after(self, request, username: str) -> float | None:
+        """Return seconds until the attempt may proceed, or None if allowed."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        keys = [
+            (self.slot_keys(key, now), threshold)
+            for key, threshold in self.keys(request, username)
+        ]
+        counts = self.cache.get_many(
+            [slot_key for slot_keys, _ in keys for slot_key, _ in slot_keys]
+        )
+        waits = []
+        for slot_keys, threshold in keys:
+            # Block once one more failure would push the score past threshold.
+            score = self._score(counts, slot_keys, now)
+            if score + 1 > threshold:
+                allowed = max(threshold - 1, 0.5)
+                waits.append(max(self.half_life * math.log2(score / allowed), 1.0))
+        return max(waits) if waits else None
+
+    def record_failure(self, request, username: str) -> None:
+        """Add a failed attempt to the account and IP scores."""
+        if not self.enabled:
+            return
+        now = time.time()
+        timeout = int(self.half_life * (self.window + 1))
+        for key, _ in self.keys(request, username):
+            slot_key, _ = self.slot_keys(key, now)[0]
+            try:
+                self.cache.incr(slot_key)
+            except ValueError:
+                # First failure of the slot, unless another worker raced us.
+                if not self.cache.add(slot_key, 1, timeout):
+                    self.cache.incr(slot_key)
+
+    def record_success(self, request, username: str) -> None:
+        """Clear the account score after a successful login."""
+        if self.enabled:
+            account_key, _ = self.keys(request, username)[0]
+            slot_keys = self.slot_keys(account_key, time.time())
+            self.cache.delete_many([slot_key for slot_key, _ in slot_keys])
+
+
+login_guard = LoginGuard()
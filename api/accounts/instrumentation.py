@@ -0,0 +1,131 @@
+"""Per-request cost accounting for queries, hashing, serializers and email."""
+
+import functools
+import time
+from collections import Counter
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth.hashers import get_hashers
+from django.db import connections
+from django.db.backends.signals import connection_created
+from djoser.email import BaseEmailMessage
+from rest_framework.serializers import BaseSerializer
+
+_current: ContextVar["RequestMetrics | None"] = ContextVar(
+    "accounts_request_metrics", default=None
+)
+_installed = False
+
+
+class RequestMetrics:
+    """Costs accumulated while handling one request."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.durations: Counter[str] = Counter()
+        self.statements: Counter[str] = Counter()
+        self._depth: Counter[str] = Counter()
+
+    @property
+    def total(self) -> float:
+        """Return the seconds elapsed since the request started."""
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def measure(self, name: str):
+        """Add the block's duration to name; nested blocks count once."""
+        self._depth[name] += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth[name] -= 1
+            if not self._depth[name]:
+                self.durations[name] += time.perf_counter() - started
+
+    def record_query(self, sql: str, duration: float) -> None:
+        """Count one executed statement."""
+        self.queries += 1
+        self.durations["db"] += duration
+        self.statements[sql] += 1
+
+    def duplicates(self, threshold: int) -> list[tuple[str, int]]:
+        """Return statements executed at least threshold times (N+1 suspects)."""
+        return [(sql, n) for sql, n in self.statements.items() if n >= threshold]
+
+
+def current() -> RequestMetrics | None:
+    """Return the metrics of the request being handled, if it is sampled."""
+    return _current.get()
+
+
+@contextmanager
+def collect(metrics: RequestMetrics):
+    """Make metrics current for the duration of the block."""
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def timed(name: str, func: Callable) -> Callable:
+    """Wrap func so its duration is added to name on sampled requests."""
+    if getattr(func, "_timed", False):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return func(*args, **kwargs)
+        with metrics.measure(name):
+            return func(*args, **kwargs)
+
+    wrapper._timed = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - started)
+
+
+def _add_execute_wrapper(connection, **kwargs) -> None:
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+def install() -> None:
+    """
+    Hook the measured operations, once per process.
+
+    Hooks cost one context variable lookup on requests that are not sampled
+    and are never installed while instrumentation is disabled.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    connection_created.connect(_add_execute_wrapper)
+    for connection in connections.all(initialized_only=True):
+        _add_execute_wrapper(connection)
+
+    for hasher in get_hashers():
+        cls = type(hasher)
+        cls.encode = timed("hash", cls.encode)
+        cls.verify = timed("hash", cls.verify)
+
+    BaseSerializer.is_valid = timed("serializer", BaseSerializer.is_valid)
+    BaseSerializer.data = property(timed("serializer", BaseSerializer.data.fget))
+    BaseEmailMessage.send = timed("email", BaseEmailMessage.send)
@@ -0,0 +1,257 @@
+"""Asymmetric JWT signing keys, their rotation and the published JWKS."""
+
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy as _
+from jwt.algorithms import get_default_algorithms
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import token_cache
+
+CURVES = {"ES256": ec.SECP256R1, "ES384": ec.SECP384R1, "ES512": ec.SECP521R1}
+
+
+def generate_private_key(algorithm: str) -> Any:
+    """Return a new private key for the JWT algorithm."""
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm in CURVES:
+        return ec.generate_private_key(CURVES[algorithm]())
+    if algorithm[:2] in ("RS", "PS"):
+        return rsa.generate_private_key(public_exponent=65537, key_size=3072)
+    raise ImproperlyConfigured(f"{algorithm} is not an asymmetric JWT algorithm.")
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """A private key of the ring and its public half."""
+
+    kid: str
+    created: int
+    private_key: Any
+    public_key: Any
+
+    def jwk(self, algorithm: str) -> dict[str, Any]:
+        """Return the public key as a JWK."""
+        jwk = get_default_algorithms()[algorithm].to_jwk(self.public_key, as_dict=True)
+        return {**jwk, "kid": self.kid, "alg": algorithm, "use": "sig"}
+
+
+class SigningKeys:
+    """
+    Ring of private keys in ``DIRECTORY``, one ``<kid>.pem`` file each.
+
+    A kid starts with its key's creation time. A new key is published in the
+    JWKS for ``JWKS_MAX_AGE`` seconds (plus ``RELOAD_INTERVAL``, for workers
+    to notice it) before it signs, so verifiers holding a cached JWKS already
+    know it when tokens start carrying it. ``ACTIVE_KID`` pins the signing
+    key instead. Older keys stay published until every token they signed has
+    expired and ``rotate_signing_key`` prunes them.
+    """
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_SIGNING_KEYS
+        self.algorithm: str = api_settings.ALGORITHM
+        self.directory = Path(config.get("DIRECTORY", settings.BASE_DIR / "keys"))
+        self.active_kid: str | None = config.get("ACTIVE_KID") or None
+        self.max_age: int = config.get("JWKS_MAX_AGE", 3600)
+        self.reload_interval: float = config.get("RELOAD_INTERVAL", 60.0)
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether tokens are signed with an asymmetric algorithm."""
+        return not self.algorithm.startswith("HS")
+
+    @property
+    def publish_delay(self) -> float:
+        """Return how long a new key is published before it signs."""
+        return self.max_age + self.reload_interval
+
+    def reset(self) -> None:
+        """Forget the loaded keys; the next lookup reads the directory."""
+        self._keys: dict[str, SigningKey] = {}
+        self._names: frozenset[str] = frozenset()
+        self._checked = float("-inf")
+        self._jwks: tuple[bytes, str] | None = None
+
+    def keys(self) -> list[SigningKey]:
+        """Return the ring's keys, oldest first, re-reading them if files changed."""
+        now = time.monotonic()
+        if now - self._checked >= self.reload_interval:
+            with self._lock:
+                self._checked = now
+                try:
+                    names = frozenset(
+                        name
+                        for name in os.listdir(self.directory)
+                        if name.endswith(".pem")
+                    )
+                except FileNotFoundError:
+                    names = frozenset()
+                if names != self._names:
+                    keys = self._load(names)
+                    if self._keys.keys() - keys.keys():
+                        # Tokens signed by a removed key must fail again.
+                        token_cache.revoke_all()
+                    self._keys = keys
+                    self._names = names
+                    self._jwks = None
+        return list(self._keys.values())
+
+    def _load(self, names: frozenset[str]) -> dict[str, SigningKey]:
+        keys = []
+        for path in (self.directory / name for name in names):
+            private_key = serialization.load_pem_private_key(
+                path.read_bytes(), password=None
+            )
+            created, _, _ = path.stem.partition("-")
+            if not created.isdigit():
+                raise ImproperlyConfigured(f"{path} is not named <created>-<id>.pem.")
+            keys.append(
+                SigningKey(
+                    path.stem, int(created), private_key, private_key.public_key()
+                )
+            )
+        keys.sort(key=lambda key: (key.created, key.kid))
+        return {key.kid: key for key in keys}
+
+    def get(self, kid: str | None) -> SigningKey | None:
+        """Return the key with kid, if it is in the ring."""
+        self.keys()
+        return self._keys.get(kid) if kid else None
+
+    def signing_key(self) -> SigningKey:
+        """Return the key new tokens are signed with."""
+        keys = self.keys()
+        if not keys:
+            raise ImproperlyConfigured(
+                f"No JWT signing keys in {self.directory}; "
+                "run `python manage.py rotate_signing_key`."
+            )
+        if self.active_kid:
+            if self.active_kid not in self._keys:
+                raise ImproperlyConfigured(
+                    f"ACTIVE_KID {self.active_kid} is not in the ring."
+                )
+            return self._keys[self.active_kid]
+        published = [
+            key for key in keys if key.created <= time.time() - self.publish_delay
+        ]
+        # A fresh ring has nothing to hand over from, so its first key signs.
+        return published[-1] if published else keys[0]
+
+    def jwks(self) -> tuple[bytes, str]:
+        """Return the JWKS document of all keys in the ring and its ETag."""
+        self.keys()
+        jwks = self._jwks
+        if jwks is None:
+            document = json.dumps(
+                {"keys": [key.jwk(self.algorithm) for key in self._keys.values()]}
+            ).encode()
+            etag = f'"{hashlib.blake2b(document, digest_size=16).hexdigest()}"'
+            jwks = self._jwks = (document, etag)
+        return jwks
+
+    def rotate(self) -> SigningKey:
+        """Add a new key to the ring; it signs once it has been published."""
+        created = int(time.time())
+        kid = f"{created}-{secrets.token_hex(4)}"
+        private_key = generate_private_key(self.algorithm)
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Written aside and renamed, so workers never load a partial file.
+        partial = self.directory / f".{kid}.tmp"
+        fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            file.write(pem)
+        os.replace(partial, self.directory / f"{kid}.pem")
+        self._checked = float("-inf")
+        return SigningKey(kid, created, private_key, private_key.public_key())
+
+    def prune(self) -> list[str]:
+        """Delete keys whose tokens have all expired and return their kids."""
+        lifetime = max(
+            api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME
+        ).total_seconds()
+        keys = self.keys()
+        if not keys:
+            return []
+        current = self.signing_key()
+        pruned = []
+        for key, successor in zip(keys, keys[1:], strict=False):
+            # A key signs until its successor takes over.
+            retired = successor.created + self.publish_delay
+            if key is not current and retired + lifetime < time.time():
+                (self.directory / f"{key.kid}.pem").unlink(missing_ok=True)
+                pruned.append(key.kid)
+        self._checked = float("-inf")
+        return pruned
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """Token backend that signs with the ring's current key and verifies by kid."""
+
+    def __init__(self, keys: SigningKeys) -> None:
+        super().__init__(
+            keys.algorithm,
+            audience=api_settings.AUDIENCE,
+            issuer=api_settings.ISSUER,
+            leeway=api_settings.LEEWAY,
+            json_encoder=api_settings.JSON_ENCODER,
+        )
+        self.keys = keys
+
+    def get_verifying_key(self, token: Any) -> Any:
+        """Return the public key named by the token's kid header."""
+        key = self.keys.get(jwt.get_unverified_header(token).get("kid"))
+        if key is None:
+            raise TokenBackendError(_("Token is invalid"))
+        return key.public_key
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        """Return the payload signed with the current key, named in the header."""
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+        key = self.keys.signing_key()
+        return jwt.encode(
+            jwt_payload,
+            key.private_key,
+            algorithm=self.algorithm,
+            headers={"kid": key.kid},
+            json_encoder=self.json_encoder,
+        )
+
+
+def install_token_backend() -> None:
+    """Make simplejwt sign and verify with the key ring, if it is enabled."""
+    if signing_keys.enabled:
+        from rest_framework_simplejwt import state
+
+        state.token_backend = KeyRingTokenBackend(signing_keys)
+
+
+signing_keys = SigningKeys()
@@ -0,0 +1,70 @@
+"""Email backend that queues messages in the outbox."""
+
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .metrics import metrics
+from .models import OutboxEmail
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """
+    Store messages as OutboxEmail rows instead of delivering them.
+
+    Rows are written on the caller's database connection, so they commit or
+    roll back together with the surrounding transaction. The
+    ``process_email_outbox`` command delivers them.
+    """
+
+    def send_messages(self, email_messages) -> int:
+        """Queue the given messages and return how many were queued."""
+        rows = [
+            to_outbox(message) for message in email_messages if message.recipients()
+        ]
+        OutboxEmail.objects.bulk_create(rows)
+        metrics.inc("auth_emails_total", len(rows), state="queued")
+        return len(rows)
+
+
+def to_outbox(message) -> OutboxEmail:
+    """Build an unsaved OutboxEmail from an EmailMessage."""
+    html_body = next(
+        (
+            content
+            for content, mimetype in getattr(message, "alternatives", [])
+            if mimetype == "text/html"
+        ),
+        "",
+    )
+    body = message.body
+    if getattr(message, "content_subtype", "plain") == "html" and not html_body:
+        html_body, body = body, ""
+    return OutboxEmail(
+        subject=message.subject,
+        body=body,
+        html_body=html_body,
+        from_email=message.from_email,
+        to=list(message.to),
+        cc=list(message.cc),
+        bcc=list(message.bcc),
+        reply_to=list(message.reply_to),
+    )
+
+
+def from_outbox(email: OutboxEmail, connection=None) -> EmailMultiAlternatives:
+    """Rebuild a deliverable message from an OutboxEmail row."""
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body or email.html_body,
+        from_email=email.from_email,
+        to=email.to,
+        cc=email.cc,
+        bcc=email.bcc,
+        reply_to=email.reply_to,
+        connection=connection,
+    )
+    if email.body and email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    elif email.html_body:
+        message.content_subtype = "html"
+    return message
@@ -0,0 +1,348 @@
+"""Benchmark the authentication endpoints against a seeded database."""
+
+import itertools
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from accounts.tokens import RefreshToken
+
+BASELINE_PATH = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+PASSWORD = "Bench-Password-1"
+
+
+@dataclass
+class Scenario:
+    """One endpoint call; prepare(i) returns the request for iteration i."""
+
+    name: str
+    method: str
+    path: str
+    status: int
+    prepare: Callable[[int], dict]
+
+
+def seed_users(count: int) -> list[User]:
+    """Insert count users sharing one precomputed password hash."""
+    password = make_password(PASSWORD)
+    now = timezone.now()
+    users = [
+        User(
+            email=f"bench{i}@example.com",
+            username=f"bench{i}",
+            full_name=f"Bench User {i}",
+            agreed_to_terms=True,
+            agreed_at=now,
+            password=password,
+        )
+        for i in range(count)
+    ]
+    User.objects.bulk_create(users, batch_size=1000)
+    return users
+
+
+def build_scenarios(users: list[User]) -> list[Scenario]:
+    """Return the benchmarked endpoints."""
+
+    def user(i: int) -> User:
+        return users[i % len(users)]
+
+    def bearer(i: int) -> dict:
+        return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user(i))}"}
+
+    return [
+        Scenario(
+            "login",
+            "post",
+            "/api/v1/auth/jwt/create/",
+            200,
+            lambda i: {"data": {"email": user(i).email, "password": PASSWORD}},
+        ),
+        Scenario(
+            "refresh",
+            "post",
+            "/api/v1/auth/jwt/refresh/",
+            200,
+            lambda i: {"data": {"refresh": str(RefreshToken.for_user(user(i)))}},
+        ),
+        Scenario(
+            "me",
+            "get",
+            "/api/v1/auth/users/me/",
+            200,
+            lambda i: {"extra": bearer(i)},
+        ),
+        Scenario(
+            "profile_update",
+            "patch",
+            "/api/v1/auth/users/me/",
+            200,
+            lambda i: {"data": {"full_name": f"Renamed {i}"}, "extra": bearer(i)},
+        ),
+        Scenario(
+            "logout",
+            "post",
+            "/api/v1/auth/logout/",
+            200,
+            lambda i: {
+                "data": {"refresh": str(RefreshToken.for_user(user(i)))},
+                "extra": bearer(i),
+            },
+        ),
+        Scenario(
+            "registration",
+            "post",
+            "/api/v1/auth/users/",
+            201,
+            lambda i: {
+                "data": {
+                    "email": f"new{i}@example.com",
+                    "username": f"new{i}",
+                    "password": PASSWORD,
+                    "re_password": PASSWORD,
+                    "full_name": "New User",
+                    "agreed_to_terms": True,
+                }
+            },
+        ),
+    ]
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Return the nearest-rank q-th percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))]
+
+
+def run_benchmarks(
+    users: int,
+    iterations: int,
+    warmup: int = 10,
+    profile_iterations: int = 20,
+    only: list[str] | None = None,
+) -> dict[str, dict]:
+    """
+    Seed the database and measure every scenario.
+
+    Latency is timed without instrumentation. Query counts and allocation
+    peaks come from a separate, instrumented pass.
+    """
+    client = APIClient()
+    seq = itertools.count()
+    scenarios = build_scenarios(seed_users(users))
+
+    def prepare(scenario: Scenario) -> Callable:
+        """Build the next request outside the measured section."""
+        i = next(seq)
+        request = scenario.prepare(i)
+        # A fresh client address per call keeps IP throttles out of the way.
+        extra = {"REMOTE_ADDR": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"}
+        extra.update(request.get("extra", {}))
+        method = getattr(client, scenario.method)
+        return lambda: method(
+            scenario.path, request.get("data"), format="json", **extra
+        )
+
+    def check(scenario: Scenario, response) -> None:
+        if response.status_code != scenario.status:
+            raise CommandError(
+                f"{scenario.name}: expected {scenario.status}, got "
+                f"{response.status_code}: {response.content[:200]!r}"
+            )
+
+    results = {}
+    for scenario in scenarios:
+        if only and scenario.name not in only:
+            continue
+
+        for _ in range(warmup):
+            send = prepare(scenario)
+            check(scenario, send())
+
+        latencies = []
+        for _ in range(iterations):
+            send = prepare(scenario)
+            started = time.perf_counter()
+            response = send()
+            latencies.append((time.perf_counter() - started) * 1000)
+            check(scenario, response)
+
+        queries, allocations = [], []
+        tracemalloc.start()
+        try:
+            for _ in range(profile_iterations):
+                send = prepare(scenario)
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                with CaptureQueriesContext(connection) as captured:
+                    response = send()
+                allocations.append(tracemalloc.get_traced_memory()[1] - before)
+                queries.append(len(captured))
+                check(scenario, response)
+        finally:
+            tracemalloc.stop()
+
+        results[scenario.name] = {
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "queries": round(statistics.median(queries)) if queries else 0,
+            "alloc_kib": (
+                round(statistics.median(allocations) / 1024, 1) if allocations else 0.0
+            ),
+        }
+    return results
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    latency_tolerance: float,
+    memory_tolerance: float,
+) -> list[str]:
+    """Return a description of every metric that regressed past baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["queries"] > base["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries (baseline {base['queries']})"
+            )
+        for metric, tolerance in (
+            ("p95_ms", latency_tolerance),
+            ("alloc_kib", memory_tolerance),
+        ):
+            limit = base[metric] * (1 + tolerance)
+            if result[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]} exceeds {limit:.1f} "
+                    f"(baseline {base[metric]})"
+                )
+    return regressions
+
+
+class Command(BaseCommand):
+    """Run the endpoint benchmark suite in a throwaway test database."""
+
+    help = (
+        "Benchmark login, refresh, me, profile update, logout and registration "
+        "and fail if they regress against the stored baseline."
+    )
+
+    def add_arguments(self, parser) -> None:
+        """Register command options."""
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--profile-iterations", type=int, default=20)
+        parser.add_argument(
+            "--only", nargs="+", metavar="SCENARIO", help="Run only these scenarios."
+        )
+        parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Write the results as the new baseline instead of comparing.",
+        )
+        parser.add_argument(
+            "--latency-tolerance",
+            type=float,
+            default=0.5,
+            help="Allowed p95 increase as a fraction of baseline.",
+        )
+        parser.add_argument(
+            "--memory-tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed allocation increase as a fraction of baseline.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Set up a test database, run the suite and check the baseline."""
+        setup_test_environment()
+        old_config = setup_databases(
+            verbosity=0, interactive=False, aliases={DEFAULT_DB_ALIAS}
+        )
+        try:
+            results = run_benchmarks(
+                users=options["users"],
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                profile_iterations=options["profile_iterations"],
+                only=options["only"],
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results)
+        path = options["baseline"]
+        settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "")
+        if options["update_baseline"]:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps(
+                    {
+                        "settings": settings_module,
+                        "users": options["users"],
+                        "endpoints": results,
+                    },
+                    indent=2,
+                )
+                + "\n"
+            )
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {path}."))
+            return
+
+        if not path.exists():
+            raise CommandError(f"No baseline at {path}; run with --update-baseline.")
+        baseline = json.loads(path.read_text())
+        if baseline.get("settings") != settings_module:
+            self.stderr.write(
+                f"Baseline was recorded with {baseline.get('settings')!r}, "
+                f"not {settings_module!r}; latencies may not be comparable."
+            )
+        regressions = compare(
+            results,
+            baseline["endpoints"],
+            options["latency_tolerance"],
+            options["memory_tolerance"],
+        )
+        if regressions:
+            raise CommandError("Regressions:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    def report(self, results: dict[str, dict]) -> None:
+        """Print one row per scenario."""
+        self.stdout.write(
+            f"{'endpoint':<16}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'queries':>9}{'alloc KiB':>11}"
+        )
+        for name, r in results.items():
+            self.stdout.write(
+                f"{name:<16}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+                f"{r['p99_ms']:>10.2f}{r['queries']:>9}{r['alloc_kib']:>11.1f}"
+            )
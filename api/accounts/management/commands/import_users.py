@@ -0,0 +1,296 @@
+"""Bulk import users from CSV or JSON Lines."""
+
+import csv
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import User
+
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+STRING_FIELDS = (
+    "email",
+    "username",
+    "full_name",
+    "password",
+    "password_hash",
+    "agreed_at",
+    "date_joined",
+)
+
+
+def _init_worker() -> None:
+    """Configure Django in pool processes started with the spawn method."""
+    django.setup()
+
+
+def _as_bool(value, default: bool = False) -> bool:
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def _as_datetime(row: dict, field: str):
+    """Return row[field] as a datetime, None if blank; raise ValueError if invalid."""
+    if not row.get(field):
+        return None
+    value = parse_datetime(row[field])
+    if value is None:
+        raise ValueError(f"invalid {field}")
+    return value
+
+
+def _messages(exc: ValidationError) -> list[str]:
+    """Return 'field: message' strings for a model validation error."""
+    return [
+        f"{field}: {message}"
+        for field, messages in exc.message_dict.items()
+        for message in messages
+    ]
+
+
+def read_rows(stream, fmt: str, on_error: Callable[[int, str], None]) -> Iterator[dict]:
+    """
+    Yield one dict per input record without loading the whole file.
+
+    Lines that are not a JSON object are passed to on_error with their line
+    number and skipped.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            on_error(number, f"invalid JSON ({exc})")
+            continue
+        if not isinstance(row, dict):
+            on_error(number, "not a JSON object")
+            continue
+        yield row
+
+
+def chunked(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    """Yield lists of at most size rows."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    """Stream users into the database with parallel password hashing."""
+
+    help = (
+        "Import users from a CSV or JSON Lines file. Records may contain email, "
+        "username, full_name, password or password_hash, agreed_to_terms, "
+        "agreed_at, is_active, is_staff and date_joined."
+    )
+
+    def add_arguments(self, parser) -> None:
+        """Register command options."""
+        parser.add_argument("path", help="Input file, or '-' for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Input format. Defaults to the file extension.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Hashing processes. 0 hashes in the current process.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Run the import."""
+        path = options["path"]
+        fmt = options["format"]
+        if fmt is None:
+            if path == "-" or not path.endswith((".csv", ".jsonl", ".ndjson")):
+                raise CommandError("Cannot infer the input format; pass --format.")
+            fmt = "csv" if path.endswith(".csv") else "jsonl"
+
+        self.imported = self.skipped = 0
+        self.started = time.monotonic()
+        workers = options["workers"]
+        pool = (
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            if workers > 0
+            else None
+        )
+
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            pending = None
+            rows = read_rows(stream, fmt, on_error=self.skip_line)
+            for chunk in chunked(rows, options["chunk_size"]):
+                # Hash the next chunk in the pool while this process inserts
+                # the previous one.
+                users = self.build_users(chunk, pending[0] if pending else [])
+                hashes = self.hash_passwords(pool, users, workers)
+                if pending is not None:
+                    self.insert(*pending)
+                pending = (users, hashes)
+            if pending is not None:
+                self.insert(*pending)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if pool is not None:
+                pool.shutdown()
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {self.imported} user(s), skipped {self.skipped} in "
+                f"{elapsed:.1f}s ({self.imported / elapsed if elapsed else 0:.0f} rows/s)."
+            )
+        )
+
+    def build_users(
+        self, rows: list[dict], unsaved: list[tuple[User, str | None]]
+    ) -> list[tuple[User, str | None]]:
+        """
+        Validate rows and return (user, raw_password) pairs to insert.
+
+        ``unsaved`` holds the previous chunk, which is still being hashed and
+        is not yet visible to the uniqueness queries.
+        """
+        emails = {user.email for user, _ in unsaved}
+        usernames = {user.username for user, _ in unsaved}
+        candidates = []
+        for row in rows:
+            invalid = [
+                field
+                for field in STRING_FIELDS
+                if row.get(field) not in (None, "") and not isinstance(row[field], str)
+            ]
+            if invalid:
+                self.skip(row, f"{', '.join(invalid)} must be text")
+                continue
+            email = User.objects.normalize_email((row.get("email") or "").strip())
+            if not email:
+                self.skip(row, "missing email")
+                continue
+            username = (row.get("username") or "").strip() or email
+            if email in emails or username in usernames:
+                self.skip(row, "duplicate in input")
+                continue
+            emails.add(email)
+            usernames.add(username)
+            candidates.append((row, email, username))
+
+        taken_emails = set(
+            User.objects.filter(
+                email__in=[email for _, email, _ in candidates]
+            ).values_list("email", flat=True)
+        )
+        taken_usernames = set(
+            User.objects.filter(
+                username__in=[username for _, _, username in candidates]
+            ).values_list("username", flat=True)
+        )
+
+        users = []
+        for row, email, username in candidates:
+            if email in taken_emails or username in taken_usernames:
+                self.skip(row, "already exists")
+                continue
+            password_hash = row.get("password_hash") or None
+            if password_hash:
+                try:
+                    identify_hasher(password_hash)
+                except ValueError:
+                    self.skip(row, "unrecognized password_hash")
+                    continue
+            try:
+                agreed_at = _as_datetime(row, "agreed_at")
+                date_joined = _as_datetime(row, "date_joined")
+            except ValueError as exc:
+                self.skip(row, str(exc))
+                continue
+            user = User(
+                email=email,
+                username=username,
+                full_name=(row.get("full_name") or "").strip(),
+                agreed_to_terms=_as_bool(row.get("agreed_to_terms")),
+                agreed_at=agreed_at,
+                is_active=_as_bool(row.get("is_active"), default=True),
+                is_staff=_as_bool(row.get("is_staff")),
+                password=password_hash or "",
+            )
+            if date_joined:
+                user.date_joined = date_joined
+            try:
+                # Overlong or malformed values would fail the whole chunk.
+                user.clean_fields(exclude=["password"])
+            except ValidationError as exc:
+                self.skip(row, "; ".join(_messages(exc)))
+                continue
+            user.stamp_agreed_at()
+            users.append((user, None if password_hash else row.get("password") or None))
+        return users
+
+    def hash_passwords(self, pool, users, workers: int) -> Iterator[str | None]:
+        """Start hashing the raw passwords of users; return the results lazily."""
+        raw = [password for _, password in users if password is not None]
+        if pool is None:
+            return map(make_password, raw)
+        return pool.map(make_password, raw, chunksize=max(1, len(raw) // (workers * 4)))
+
+    def insert(self, users, hashes: Iterator[str]) -> None:
+        """Assign computed hashes and insert users in one statement per batch."""
+        objs = []
+        for user, password in users:
+            if password is not None:
+                user.password = next(hashes)
+            elif not user.password:
+                user.set_unusable_password()
+            objs.append(user)
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(objs, batch_size=1000)
+            self.imported += len(objs)
+        except IntegrityError:
+            # A user registered meanwhile; insert the chunk row by row.
+            for obj in objs:
+                try:
+                    with transaction.atomic():
+                        User.objects.bulk_create([obj])
+                except IntegrityError:
+                    self.skip({"email": obj.email}, "already exists")
+                else:
+                    self.imported += 1
+        elapsed = time.monotonic() - self.started
+        self.stderr.write(
+            f"{self.imported} imported, {self.skipped} skipped, "
+            f"{self.imported / elapsed if elapsed else 0:.0f} rows/s"
+        )
+
+    def skip(self, row: dict, reason: str) -> None:
+        """Record a skipped row."""
+        self.skipped += 1
+        self.stderr.write(f"Skipping {row.get('email') or row!r}: {reason}")
+
+    def skip_line(self, number: int, reason: str) -> None:
+        """Record an input line that could not be read as a record."""
+        self.skipped += 1
+        self.stderr.write(f"Skipping line {number}: {reason}")
@@ -0,0 +1,105 @@
+"""Deliver queued emails from the outbox."""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.mail import from_outbox
+from accounts.metrics import metrics
+from accounts.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    """Claim pending outbox rows and deliver them over one SMTP connection."""
+
+    help = "Deliver pending emails from the outbox."
+
+    def add_arguments(self, parser) -> None:
+        """Register command options."""
+        config = settings.EMAIL_OUTBOX
+        parser.add_argument(
+            "--batch-size", type=int, default=config.get("BATCH_SIZE", 50)
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=config.get("POLL_INTERVAL", 2.0),
+            help="Seconds to sleep when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit instead of polling.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Run the delivery loop."""
+        connection = get_connection(fail_silently=False)
+        sent = failed = 0
+        try:
+            while True:
+                batch_sent, batch_failed, claimed = self.process_batch(
+                    connection, options["batch_size"]
+                )
+                sent += batch_sent
+                failed += batch_failed
+                if claimed:
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+        self.stdout.write(f"Sent {sent} email(s), {failed} failed attempt(s).")
+
+    def process_batch(self, connection, batch_size: int) -> tuple[int, int, int]:
+        """Claim and deliver one batch; return (sent, failed, claimed)."""
+        config = settings.EMAIL_OUTBOX
+        max_attempts = config.get("MAX_ATTEMPTS", 5)
+        backoff = config.get("RETRY_BACKOFF", 30)
+        max_backoff = config.get("MAX_BACKOFF", 3600)
+        sent = failed = 0
+
+        with transaction.atomic():
+            now = timezone.now()
+            batch = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboxEmail.Status.PENDING, next_attempt_at__lte=now)
+                .order_by("next_attempt_at")[:batch_size]
+            )
+            for email in batch:
+                email.attempts += 1
+                try:
+                    connection.open()
+                    connection.send_messages([from_outbox(email, connection)])
+                except Exception as exc:  # any delivery failure is retried
+                    failed += 1
+                    email.last_error = f"{type(exc).__name__}: {exc}"
+                    if email.attempts >= max_attempts:
+                        email.status = OutboxEmail.Status.FAILED
+                    else:
+                        delay = min(backoff * 2 ** (email.attempts - 1), max_backoff)
+                        email.next_attempt_at = now + timedelta(seconds=delay)
+                    # Drop a possibly broken connection; open() reconnects.
+                    connection.close()
+                else:
+                    sent += 1
+                    email.status = OutboxEmail.Status.SENT
+                    email.sent_at = timezone.now()
+                    email.last_error = ""
+            OutboxEmail.objects.bulk_update(
+                batch,
+                ["status", "attempts", "next_attempt_at", "last_error", "sent_at"],
+            )
+        if batch:
+            metrics.inc("auth_emails_total", sent, state="sent")
+            metrics.inc("auth_emails_total", failed, state="failed")
+            metrics.flush()
+        return sent, failed, len(batch)
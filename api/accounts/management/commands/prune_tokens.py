@@ -0,0 +1,135 @@
+"""Delete expired outstanding, blacklisted and revoked tokens in small batches."""
+
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from accounts.revocation import get_revocation_store
+
+CHECKPOINT_KEY = "accounts:prune-tokens:checkpoint"
+
+
+class Command(BaseCommand):
+    """
+    Walk OutstandingToken in primary-key windows and delete expired rows.
+
+    Each window is deleted in its own short transaction, so locks are held
+    only briefly. Tokens share one lifetime and expire in id order, so the
+    walk stops at the first window with no expired rows unless
+    ``--full-scan`` is given. A run interrupted by ``--max-runtime`` or a
+    signal resumes from its checkpoint with the same cutoff.
+
+    The compact revocation store is pruned afterwards by dropping its expired
+    buckets whole.
+    """
+
+    help = "Delete expired JWT outstanding and blacklisted tokens in batches."
+
+    def add_arguments(self, parser) -> None:
+        """Register command options."""
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches.",
+        )
+        parser.add_argument(
+            "--max-runtime",
+            type=float,
+            default=None,
+            help="Stop after this many seconds and keep a checkpoint.",
+        )
+        parser.add_argument(
+            "--full-scan",
+            action="store_true",
+            help="Scan to the highest id instead of stopping at unexpired tokens.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore any saved checkpoint.",
+        )
+
+    @property
+    def cache(self):
+        return caches["shared"]
+
+    def handle(self, *args, **options) -> None:
+        """Run the pruning loop."""
+        started = time.monotonic()
+        checkpoint = None if options["restart"] else self.cache.get(CHECKPOINT_KEY)
+        if checkpoint:
+            cutoff = parse_datetime(checkpoint["cutoff"])
+            next_id = checkpoint["next_id"]
+            self.stdout.write(f"Resuming from id {next_id} (cutoff {cutoff}).")
+        else:
+            cutoff = timezone.now()
+            next_id = OutstandingToken.objects.aggregate(first=Min("id"))["first"]
+
+        last_id = OutstandingToken.objects.aggregate(last=Max("id"))["last"]
+        outstanding = blacklisted = 0
+        complete = next_id is None or last_id is None
+
+        while not complete:
+            window_end = next_id + options["batch_size"]
+            rows = list(
+                OutstandingToken.objects.filter(
+                    id__gte=next_id, id__lt=window_end
+                ).values_list("id", "expires_at")
+            )
+            expired = [pk for pk, expires_at in rows if expires_at < cutoff]
+            if expired:
+                with transaction.atomic():
+                    _, deleted = OutstandingToken.objects.filter(
+                        id__in=expired
+                    ).delete()
+                outstanding += deleted.get(OutstandingToken._meta.label, 0)
+                blacklisted += deleted.get(BlacklistedToken._meta.label, 0)
+
+            next_id = window_end
+            complete = next_id > last_id or (
+                bool(rows) and not expired and not options["full_scan"]
+            )
+            if complete:
+                break
+
+            self.cache.set(
+                CHECKPOINT_KEY,
+                {"cutoff": cutoff.isoformat(), "next_id": next_id},
+                None,
+            )
+            if (
+                options["max_runtime"] is not None
+                and time.monotonic() - started >= options["max_runtime"]
+            ):
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        if complete:
+            self.cache.delete(CHECKPOINT_KEY)
+        elapsed = time.monotonic() - started
+        status = "Done" if complete else f"Paused at id {next_id}"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{status}: removed {outstanding} outstanding and {blacklisted} "
+                f"blacklisted token(s) in {elapsed:.1f}s."
+            )
+        )
+        buckets = get_revocation_store().prune()
+        if buckets:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Dropped {len(buckets)} expired revocation bucket(s)."
+                )
+            )
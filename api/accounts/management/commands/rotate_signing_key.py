@@ -0,0 +1,54 @@
+"""Add a JWT signing key to the ring and prune keys nobody needs."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.keys import signing_keys
+
+
+class Command(BaseCommand):
+    """
+    Rotate the asymmetric JWT signing keys.
+
+    The new key is published in the JWKS right away and takes over signing
+    once cached JWKS documents have had time to pick it up. Keys whose
+    tokens have all expired are deleted, unless ``--no-prune`` is given. Run
+    it from cron on the host (or volume) that holds the key directory.
+    """
+
+    help = "Add a JWT signing key and delete keys whose tokens have expired."
+    # An empty ring fails accounts.E002, which this command is there to fix.
+    requires_system_checks: list[str] = []
+
+    def add_arguments(self, parser) -> None:
+        """Register command options."""
+        parser.add_argument(
+            "--list", action="store_true", help="Only list the keys in the ring."
+        )
+        parser.add_argument(
+            "--no-prune", action="store_true", help="Keep keys whose tokens expired."
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Rotate, prune and list the keys."""
+        if not signing_keys.enabled:
+            raise CommandError(
+                f"SIMPLE_JWT signs with {signing_keys.algorithm} and SECRET_KEY; "
+                "set JWT_ALGORITHM to RS256, ES256 or EdDSA to use a key ring."
+            )
+        if not options["list"]:
+            key = signing_keys.rotate()
+            self.stdout.write(f"Added {key.kid}")
+            if not options["no_prune"]:
+                for kid in signing_keys.prune():
+                    self.stdout.write(f"Deleted {kid}")
+
+        keys = signing_keys.keys()
+        signing = signing_keys.signing_key() if keys else None
+        for key in keys:
+            if key.kid == signing.kid:
+                state = "signing"
+            elif (key.created, key.kid) > (signing.created, signing.kid):
+                state = "published"
+            else:
+                state = "retired"
+            self.stdout.write(f"{key.kid}  {state}")
@@ -0,0 +1,166 @@
+"""Break down worker boot time and memory by phase, app and import."""
+
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+STDLIB = "(stdlib)"
+
+
+def run_probe(settings_module: str, memory: bool = False) -> dict:
+    """Boot Django in a fresh interpreter and return the probe's report."""
+    result = subprocess.run(
+        [sys.executable, "-m", "accounts.startup", *(["--memory"] if memory else [])],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": settings_module},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        raise CommandError(f"Startup probe failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout)
+
+
+def group_of(module: str, apps: list[str]) -> str:
+    """Return the installed app a module belongs to, or its top-level package."""
+    owners = [app for app in apps if module == app or module.startswith(f"{app}.")]
+    if owners:
+        return max(owners, key=len)
+    top = module.split(".", 1)[0]
+    if top in sys.stdlib_module_names or top.startswith("_"):
+        return STDLIB
+    return top
+
+
+def build_report(settings_module: str, repeat: int = 3, top: int = 15) -> dict:
+    """
+    Profile a cold start of settings_module.
+
+    Times come from the fastest of ``repeat`` boots. Heap sizes come from a
+    separate boot under tracemalloc, which is too slow to time.
+    """
+    timing = min(
+        (run_probe(settings_module) for _ in range(repeat)),
+        key=lambda run: sum(phase["seconds"] for phase in run["phases"]),
+    )
+    heap = run_probe(settings_module, memory=True)["modules"]
+
+    groups: dict[str, dict] = {}
+    for module, (self_seconds, _) in timing["modules"].items():
+        group = groups.setdefault(
+            group_of(module, timing["apps"]),
+            {"import_ms": 0.0, "heap_kib": 0.0, "modules": 0},
+        )
+        group["import_ms"] += self_seconds * 1000
+        group["heap_kib"] += heap.get(module, (0, 0))[0] / 1024
+        group["modules"] += 1
+
+    previous = timing["phases"][0]["rss_kib"]
+    phases = []
+    for phase in timing["phases"]:
+        phases.append(
+            {
+                "name": phase["name"],
+                "ms": round(phase["seconds"] * 1000, 1),
+                "rss_mib": round(phase["rss_kib"] / 1024, 1),
+                "delta_mib": round((phase["rss_kib"] - previous) / 1024, 1),
+            }
+        )
+        previous = phase["rss_kib"]
+
+    slowest = sorted(timing["modules"].items(), key=lambda item: -item[1][1])[:top]
+    return {
+        "settings": settings_module,
+        "phases": phases,
+        "apps": [
+            {
+                "name": name,
+                "import_ms": round(group["import_ms"], 1),
+                "heap_kib": round(group["heap_kib"], 1),
+                "modules": group["modules"],
+            }
+            for name, group in sorted(
+                groups.items(), key=lambda item: -item[1]["import_ms"]
+            )
+        ],
+        "imports": [
+            {
+                "module": module,
+                "cumulative_ms": round(cumulative * 1000, 1),
+                "self_ms": round(self_seconds * 1000, 1),
+            }
+            for module, (self_seconds, cumulative) in slowest
+        ],
+    }
+
+
+class Command(BaseCommand):
+    """
+    Report where a worker's boot time and memory go.
+
+    The probe runs in fresh interpreters, so the numbers describe a cold
+    start with the selected settings (``--settings`` or
+    ``DJANGO_SETTINGS_MODULE``), not the already warm process running this
+    command.
+    """
+
+    help = "Break down cold start time and memory by phase, app and import."
+
+    def add_arguments(self, parser) -> None:
+        """Register command options."""
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Boots to time; the fastest one is reported.",
+        )
+        parser.add_argument(
+            "--top", type=int, default=15, help="Number of slowest imports to list."
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON."
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Run the probes and print the report."""
+        report = build_report(
+            os.environ["DJANGO_SETTINGS_MODULE"],
+            repeat=max(1, options["repeat"]),
+            top=options["top"],
+        )
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"Cold start with {report['settings']}\n")
+        self.stdout.write(f"{'phase':<14}{'ms':>9}{'RSS MiB':>10}{'+MiB':>8}")
+        for phase in report["phases"]:
+            self.stdout.write(
+                f"{phase['name']:<14}{phase['ms']:>9.1f}"
+                f"{phase['rss_mib']:>10.1f}{phase['delta_mib']:>8.1f}"
+            )
+        total_ms = sum(phase["ms"] for phase in report["phases"])
+        self.stdout.write(f"{'total':<14}{total_ms:>9.1f}\n")
+
+        self.stdout.write(
+            f"{'app or package':<42}{'import ms':>10}{'heap KiB':>10}{'modules':>9}"
+        )
+        for app in report["apps"]:
+            self.stdout.write(
+                f"{app['name']:<42}{app['import_ms']:>10.1f}"
+                f"{app['heap_kib']:>10.1f}{app['modules']:>9}"
+            )
+
+        self.stdout.write(
+            f"\n{'slowest imports':<52}{'cumulative ms':>14}{'self ms':>9}"
+        )
+        for entry in report["imports"]:
+            self.stdout.write(
+                f"{entry['module']:<52}{entry['cumulative_ms']:>14.1f}"
+                f"{entry['self_ms']:>9.1f}"
+            )
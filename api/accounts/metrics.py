@@ -0,0 +1,290 @@
+"""Prometheus metrics aggregated across worker processes."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# name -> (type, help)
+METRICS = {
+    "auth_http_requests_total": (
+        "counter",
+        "HTTP requests by URL name, method and status.",
+    ),
+    "auth_http_request_duration_seconds": (
+        "histogram",
+        "HTTP request latency by URL name.",
+    ),
+    "auth_logins_total": ("counter", "Login attempts by outcome."),
+    "auth_blacklist_hits_total": (
+        "counter",
+        "Refresh tokens rejected because they are blacklisted.",
+    ),
+    "auth_token_cache_lookups_total": (
+        "counter",
+        "Verified access token cache lookups by result (hit or miss).",
+    ),
+    "auth_throttled_total": ("counter", "Requests rejected by throttles, by scope."),
+    "auth_emails_total": ("counter", "Authentication emails by state."),
+    "auth_db_pool_requests_total": (
+        "counter",
+        "Connections requested from the database pool.",
+    ),
+    "auth_db_pool_queued_total": (
+        "counter",
+        "Pool requests that had to wait for a free connection.",
+    ),
+    "auth_db_pool_errors_total": (
+        "counter",
+        "Pool requests that timed out or failed.",
+    ),
+    "auth_db_pool_wait_seconds_total": (
+        "counter",
+        "Time spent waiting for a pooled connection.",
+    ),
+    "auth_db_pool_connections_total": (
+        "counter",
+        "Server connections opened by the pool.",
+    ),
+    "auth_db_pool_size": ("gauge", "Pooled connections, in use or idle."),
+    "auth_db_pool_available": ("gauge", "Idle connections ready in the pool."),
+    "auth_db_pool_max": ("gauge", "Maximum size of the pool."),
+    "auth_db_pool_waiting": ("gauge", "Requests waiting for a pooled connection."),
+}
+
+# psycopg_pool statistic -> (metric, scale)
+POOL_COUNTERS = {
+    "requests_num": ("auth_db_pool_requests_total", 1),
+    "requests_queued": ("auth_db_pool_queued_total", 1),
+    "requests_errors": ("auth_db_pool_errors_total", 1),
+    "requests_wait_ms": ("auth_db_pool_wait_seconds_total", 0.001),
+    "connections_num": ("auth_db_pool_connections_total", 1),
+}
+POOL_GAUGES = {
+    "pool_size": "auth_db_pool_size",
+    "pool_available": "auth_db_pool_available",
+    "pool_max": "auth_db_pool_max",
+    "requests_waiting": "auth_db_pool_waiting",
+}
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms for the auth API.
+
+    Each thread updates its own shard, so recording takes no lock. Every
+    ``FLUSH_INTERVAL`` seconds a worker writes the sum of its shards to
+    ``<DIRECTORY>/<pid>.json``; the metrics endpoint adds up the files of
+    all workers on the host. Files outlive their workers so counters stay
+    monotonic, and a worker that reuses a pid continues from its file.
+    Gauges are the exception: they are summed over live workers only.
+    """
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_METRICS
+        self.enabled: bool = config.get("ENABLED", True)
+        self.directory = Path(config["DIRECTORY"])
+        self.flush_interval: float = config.get("FLUSH_INTERVAL", 5.0)
+        self.buckets: tuple[float, ...] = tuple(config.get("BUCKETS", DEFAULT_BUCKETS))
+        self._flush_lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget this process's values (and start over after a fork)."""
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._shards_lock = threading.Lock()
+        self._gauges: dict = {}
+        self._base: dict = {}
+        self._base_loaded = False
+        self._last_flush = time.monotonic()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is not None and self._local.pid == os.getpid():
+            return shard
+        if self._pid != os.getpid():
+            self.reset()
+        shard = {}
+        with self._shards_lock:
+            self._shards.append(shard)
+        self._local.shard, self._local.pid = shard, self._pid
+        return shard
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        """Add amount to a counter."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        shard = self._shard()
+        shard[key] = shard.get(key, 0) + amount
+        self._maybe_flush()
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record one histogram observation."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        shard = self._shard()
+        counts = shard.get(key)
+        if counts is None:
+            # One count per bucket, then +Inf, then the sum.
+            counts = shard[key] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-2] += 1
+        counts[-1] += value
+        self._maybe_flush()
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """Set a gauge to its current value in this process."""
+        if not self.enabled:
+            return
+        self._shard()  # resets state in a freshly forked worker
+        self._gauges[(name, tuple(sorted(labels.items())))] = value
+        self._maybe_flush()
+
+    def record_pool(self, alias: str, stats: dict) -> None:
+        """Record the statistics popped from a psycopg connection pool."""
+        for stat, (name, scale) in POOL_COUNTERS.items():
+            if stats.get(stat):
+                self.inc(name, stats[stat] * scale, database=alias)
+        for stat, name in POOL_GAUGES.items():
+            if stat in stats:
+                self.set(name, stats[stat], database=alias)
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def snapshot(self) -> dict:
+        """Return this process's values, including any inherited from its pid."""
+        if not self._base_loaded:
+            base = self._read(self.directory / f"{self._pid}.json")
+            self._base = {key: v for key, v in base.items() if not _is_gauge(key)}
+            self._base_loaded = True
+        merged: dict = {}
+        _merge(merged, self._base)
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            _merge(merged, dict(shard))
+        merged.update(self._gauges)
+        return merged
+
+    def flush(self) -> None:
+        """Write this process's values to its file in the shared directory."""
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_flush = time.monotonic()
+            self._shard()  # resets state in a freshly forked worker
+            data = self.snapshot()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{self._pid}.json"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps(
+                    [[name, labels, value] for (name, labels), value in data.items()]
+                )
+            )
+            os.replace(tmp, path)
+        finally:
+            self._flush_lock.release()
+
+    def collect(self) -> dict:
+        """Flush this process, then return the sum over all worker files."""
+        self.flush()
+        merged: dict = {}
+        for path in self.directory.glob("*.json"):
+            values = self._read(path)
+            if not _is_alive(path.stem):
+                values = {key: v for key, v in values.items() if not _is_gauge(key)}
+            _merge(merged, values)
+        return merged
+
+    def _read(self, path: Path) -> dict:
+        try:
+            entries = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return {
+            (name, tuple(tuple(pair) for pair in labels)): value
+            for name, labels, value in entries
+        }
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        series: dict[str, list] = {}
+        for (name, labels), value in sorted(self.collect().items()):
+            series.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series.get(name, []):
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                bounds = [*map(_number, self.buckets), "+Inf"]
+                for bound, count in zip(bounds, value[:-1], strict=True):
+                    cumulative += count
+                    le = _labels((*labels, ("le", bound)))
+                    lines.append(f"{name}_bucket{le} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _merge(into: dict, values: dict) -> None:
+    for key, value in values.items():
+        if isinstance(value, list):
+            current = into.get(key)
+            if current is None or len(current) != len(value):
+                into[key] = list(value)
+            else:
+                into[key] = [a + b for a, b in zip(current, value, strict=True)]
+        else:
+            into[key] = into.get(key, 0) + value
+
+
+def _is_gauge(key: tuple) -> bool:
+    return METRICS.get(key[0], ("counter",))[0] == "gauge"
+
+
+def _is_alive(pid: str) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+metrics = MetricsRegistry()
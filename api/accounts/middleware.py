@@ -0,0 +1,411 @@
+"""Account middleware."""
+
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+
+from . import instrumentation
+from .authentication import CachedJWTAuthentication
+from .instrumentation import RequestMetrics
+from .metrics import metrics
+from .profiling import profiler
+from .routers import RequestRouting, routing
+
+logger = logging.getLogger("accounts.metrics")
+
+# Server-Timing metric names in output order.
+TIMINGS = ("db", "hash", "serializer", "email")
+
+
+class RequestMetricsMiddleware:
+    """
+    Report what each sampled request cost.
+
+    Writes one JSON log line with the query count and the time spent in
+    SQL, password hashing, serializers and email, and warns about statements
+    repeated within a request. The same figures go out in a
+    ``Server-Timing`` header, but only to staff users and to clients in
+    ``SERVER_TIMING_IPS``: hashing time and query counts would tell anyone
+    else which accounts exist. When ``ACCOUNTS_REQUEST_METRICS["ENABLED"]``
+    is off the middleware removes itself from the stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        config = settings.ACCOUNTS_REQUEST_METRICS
+        if not config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config["SAMPLE_RATE"]
+        self.server_timing = config["SERVER_TIMING"]
+        self.server_timing_ips = frozenset(config.get("SERVER_TIMING_IPS", ()))
+        self.log = config["LOG"]
+        self.duplicate_threshold = config["DUPLICATE_THRESHOLD"]
+        instrumentation.install()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handle the request, measuring it if sampled."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        with instrumentation.collect(RequestMetrics()) as metrics:
+            response = self.get_response(request)
+        self.report(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        """Async version of __call__."""
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        with instrumentation.collect(RequestMetrics()) as metrics:
+            response = await self.get_response(request)
+        self.report(request, response, metrics)
+        return response
+
+    def is_internal(self, request) -> bool:
+        """Return whether request may see its Server-Timing header."""
+        if request.META.get("REMOTE_ADDR") in self.server_timing_ips:
+            return True
+        # Set by DRF once the view has authenticated the request.
+        user = getattr(request, "user", None)
+        return bool(user and user.is_staff)
+
+    def report(self, request, response, metrics: RequestMetrics) -> None:
+        """Attach the header and write the log lines."""
+        total = metrics.total * 1000
+        durations = {name: metrics.durations[name] * 1000 for name in TIMINGS}
+
+        if self.server_timing and self.is_internal(request):
+            entries = [f"total;dur={total:.1f}"]
+            entries.append(
+                f'db;dur={durations["db"]:.1f};desc="{metrics.queries} queries"'
+            )
+            entries.extend(
+                f"{name};dur={durations[name]:.1f}"
+                for name in TIMINGS[1:]
+                if durations[name]
+            )
+            response["Server-Timing"] = ", ".join(entries)
+
+        if not self.log:
+            return
+        path = request.path
+        logger.info(
+            json.dumps(
+                {
+                    "event": "request",
+                    "method": request.method,
+                    "path": path,
+                    "status": response.status_code,
+                    "queries": metrics.queries,
+                    "total_ms": round(total, 2),
+                    **{f"{name}_ms": round(d, 2) for name, d in durations.items()},
+                }
+            )
+        )
+        for sql, count in metrics.duplicates(self.duplicate_threshold):
+            logger.warning(
+                json.dumps(
+                    {
+                        "event": "duplicate_query",
+                        "method": request.method,
+                        "path": path,
+                        "count": count,
+                        "sql": sql,
+                    }
+                )
+            )
+
+
+class PrometheusMetricsMiddleware:
+    """Count requests and observe their latency per URL name."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        if not metrics.enabled:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handle and record the request."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        """Async version of __call__."""
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, duration: float) -> None:
+        """Add the request to the registry."""
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        metrics.inc(
+            "auth_http_requests_total",
+            view=view,
+            method=request.method,
+            status=response.status_code,
+        )
+        metrics.observe("auth_http_request_duration_seconds", duration, view=view)
+
+
+class ProfilingMiddleware:
+    """
+    Sample requests chosen through the admin switch or the profile header.
+
+    ``ProfilerConfig`` selects requests by URL name and percentage. The
+    ``HEADER`` header is honoured only on requests that authenticate as
+    staff, checked before sampling starts; from anyone else it is ignored.
+
+    Sampling follows the thread that runs ``process_view``. Under ASGI that
+    is the sync thread, so async views (``CurrentUserView``, ``LogoutView``)
+    show only the work they hand to it, not what runs on the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        if not profiler.enabled:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = settings.ACCOUNTS_PROFILER.get("HEADER", "X-Profile")
+        self.authentication = CachedJWTAuthentication()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handle the request, then stop sampling it."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.finish(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        """Async version of __call__."""
+        return self.finish(request, await self.get_response(request))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Start sampling once the URL name is known."""
+        # Under ASGI this runs in the thread-sensitive sync thread, which also
+        # runs sync views and the ORM calls of async views.
+        label = request.resolver_match.view_name
+        if profiler.selects(label) or (
+            self.header in request.headers and self.is_staff(request)
+        ):
+            request._profile = profiler.begin(label)
+        return None
+
+    def is_staff(self, request) -> bool:
+        """Return whether request comes from staff, by session or access token."""
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            return True
+        try:
+            result = self.authentication.authenticate(request)
+        except APIException:
+            return False
+        return result is not None and result[0].is_staff
+
+    def finish(self, request, response):
+        """Stop sampling and report how many stacks were kept."""
+        token = getattr(request, "_profile", None)
+        if token is not None:
+            response["X-Profile-Samples"] = str(profiler.end(token))
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe requests read from replicas without losing read-your-writes.
+
+    GET, HEAD and OPTIONS requests start on the replicas and move to the
+    primary on their first write, or once their user turns out to be pinned
+    (see ``ReplicaRouting``). A request that wrote pins its user. Without
+    replicas the middleware removes itself from the stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        if not routing.enabled:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handle the request with its own routing state."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = routing.begin(primary=request.method not in SAFE_METHODS)
+        try:
+            response = self.get_response(request)
+        finally:
+            state = routing.end(token)
+        self.finish(request, state)
+        return response
+
+    async def __acall__(self, request):
+        """Async version of __call__."""
+        token = routing.begin(primary=request.method not in SAFE_METHODS)
+        try:
+            response = await self.get_response(request)
+        finally:
+            state = routing.end(token)
+        if state.wrote:
+            # Resolving a lazy session user may query the database.
+            await sync_to_async(self.finish)(request, state)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Check the pin of a session user (JWT users are checked on auth)."""
+        session = getattr(request, "session", None)
+        if session is not None:
+            routing.stick_if_pinned(session.get(SESSION_KEY))
+        return None
+
+    def finish(self, request, state: RequestRouting) -> None:
+        """Pin the user of a request that wrote."""
+        if not state.wrote:
+            return
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            routing.pin(user.pk)
+
+
+@dataclass
+class MiddlewareStack:
+    """A loaded middleware chain and its hooks, as BaseHandler keeps them."""
+
+    handler: object
+    view: list = field(default_factory=list)
+    template_response: list = field(default_factory=list)
+    exception: list = field(default_factory=list)
+
+
+def load_stack(paths: list[str], get_response, is_async: bool) -> MiddlewareStack:
+    """Load middleware paths around get_response like BaseHandler does."""
+    adapt = BaseHandler().adapt_method_mode
+    stack = MiddlewareStack(get_response)
+    handler, handler_is_async = get_response, is_async
+    for path in reversed(paths):
+        middleware = import_string(path)
+        can_sync = getattr(middleware, "sync_capable", True)
+        can_async = getattr(middleware, "async_capable", False)
+        middleware_is_async = can_async if handler_is_async or not can_sync else False
+        adapted = adapt(middleware_is_async, handler, handler_is_async)
+        try:
+            instance = middleware(adapted)
+        except MiddlewareNotUsed:
+            continue
+        # Hooks run synchronously from RouteMiddleware's own hooks.
+        if hasattr(instance, "process_view"):
+            stack.view.insert(0, instance.process_view)
+        if hasattr(instance, "process_template_response"):
+            stack.template_response.append(instance.process_template_response)
+        if hasattr(instance, "process_exception"):
+            stack.exception.append(instance.process_exception)
+        handler = convert_exception_to_response(instance)
+        handler_is_async = middleware_is_async
+    stack.handler = adapt(is_async, handler, handler_is_async)
+    return stack
+
+
+def route_middleware(path: str) -> list[str]:
+    """Return the middleware RouteMiddleware runs for path."""
+    routes = settings.ACCOUNTS_ROUTE_MIDDLEWARE
+    matches = [prefix for prefix in routes if path.startswith(prefix)]
+    return list(routes[max(matches, key=len)]) if matches else []
+
+
+class RouteMiddleware:
+    """
+    Run middleware only on the routes that need it.
+
+    ``ACCOUNTS_ROUTE_MIDDLEWARE`` maps path prefixes to middleware that run
+    at this position in ``MIDDLEWARE``; the longest matching prefix wins.
+    The JSON API authenticates with JWT, so it skips the session, CSRF,
+    authentication and message middleware that only the admin uses.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        is_async = iscoroutinefunction(get_response)
+        routes = settings.ACCOUNTS_ROUTE_MIDDLEWARE
+        self.routes = [
+            (prefix, load_stack(routes[prefix], get_response, is_async))
+            for prefix in sorted(routes, key=len, reverse=True)
+        ]
+        self.default = MiddlewareStack(get_response)
+        if is_async:
+            markcoroutinefunction(self)
+
+    def stack(self, request) -> MiddlewareStack:
+        """Return the middleware stack for the request's path."""
+        path = request.path_info
+        for prefix, stack in self.routes:
+            if path.startswith(prefix):
+                return stack
+        return self.default
+
+    def __call__(self, request):
+        """Pass the request through its route's middleware."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.stack(request).handler(request)
+
+    async def __acall__(self, request):
+        """Async version of __call__."""
+        return await self.stack(request).handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Run the route's view hooks until one returns a response."""
+        for hook in self.stack(request).view:
+            response = hook(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        """Run the route's template response hooks."""
+        for hook in self.stack(request).template_response:
+            response = hook(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        """Run the route's exception hooks until one returns a response."""
+        for hook in self.stack(request).exception:
+            response = hook(request, exception)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:12
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+JOINED_INDEXES = [
+    models.Index(fields=["-date_joined", "-id"], name="accounts_user_joined_idx"),
+    models.Index(
+        condition=models.Q(("is_staff", True)),
+        fields=["-date_joined", "-id"],
+        name="accounts_user_staff_joined_idx",
+    ),
+    models.Index(
+        condition=models.Q(("is_active", False)),
+        fields=["-date_joined", "-id"],
+        name="accounts_user_inactive_idx",
+    ),
+    models.Index(
+        condition=models.Q(("agreed_to_terms", False)),
+        fields=["-date_joined", "-id"],
+        name="accounts_user_unagreed_idx",
+    ),
+]
+
+# icontains compiles to UPPER(col::text) LIKE UPPER(%s) on PostgreSQL. These
+# are kept out of the model state: SQLite recreates every state index when it
+# rebuilds the table, and it cannot build GIN indexes.
+TRIGRAM_INDEXES = [
+    GinIndex(
+        OpClass(Upper("email"), name="gin_trgm_ops"),
+        name="accounts_user_email_trgm_idx",
+    ),
+    GinIndex(
+        OpClass(Upper("full_name"), name="gin_trgm_ops"),
+        name="accounts_user_name_trgm_idx",
+    ),
+]
+
+
+def _indexes(schema_editor):
+    """Return the indexes to build and the options for building them."""
+    if schema_editor.connection.vendor == "postgresql":
+        return JOINED_INDEXES + TRIGRAM_INDEXES, {"concurrently": True}
+    return JOINED_INDEXES, {}
+
+
+def add_indexes(apps, schema_editor):
+    """Build the indexes without blocking writes on PostgreSQL."""
+    User = apps.get_model("accounts", "User")
+    indexes, options = _indexes(schema_editor)
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index in indexes:
+        schema_editor.add_index(User, index, **options)
+
+
+def remove_indexes(apps, schema_editor):
+    """Drop the indexes created by add_indexes."""
+    User = apps.get_model("accounts", "User")
+    indexes, options = _indexes(schema_editor)
+    for index in indexes:
+        schema_editor.remove_index(User, index, **options)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0003_outboxemail"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="user", index=index)
+                for index in JOINED_INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(add_indexes, remove_indexes),
+            ],
+        ),
+    ]
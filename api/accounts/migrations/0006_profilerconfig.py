@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:23
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_user_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfilerConfig",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("enabled", models.BooleanField(default=False)),
+                (
+                    "url_names",
+                    models.CharField(
+                        blank=True,
+                        help_text="Comma-separated URL names, e.g. jwt-create, user-me. Blank profiles every route.",
+                        max_length=1000,
+                    ),
+                ),
+                (
+                    "sample_percent",
+                    models.FloatField(
+                        default=100.0,
+                        help_text="Percentage of matching requests to profile.",
+                        validators=[
+                            django.core.validators.MinValueValidator(0.0),
+                            django.core.validators.MaxValueValidator(100.0),
+                        ],
+                    ),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Stop profiling after this time.",
+                        null=True,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "profiler configuration",
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:55
+
+from django.db import migrations, models
+
+
+def create_table(apps, schema_editor):
+    """Create the table, range-partitioned by expiry bucket on PostgreSQL."""
+    RevokedToken = apps.get_model("accounts", "RevokedToken")
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.create_model(RevokedToken)
+        return
+    quote = schema_editor.quote_name
+    table = RevokedToken._meta.db_table
+    sql, params = schema_editor.table_sql(RevokedToken)
+    schema_editor.execute(f"{sql} PARTITION BY RANGE (expiry_bucket)", params)
+    # Catches buckets prune_tokens has not created a partition for yet.
+    schema_editor.execute(
+        f"CREATE TABLE {quote(table + '_default')} PARTITION OF {quote(table)} DEFAULT"
+    )
+
+
+def drop_table(apps, schema_editor):
+    """Drop the table and its partitions."""
+    schema_editor.delete_model(apps.get_model("accounts", "RevokedToken"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_user_token_epoch"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="RevokedToken",
+                    fields=[
+                        (
+                            "pk",
+                            models.CompositePrimaryKey(
+                                "expiry_bucket",
+                                "jti_hash",
+                                blank=True,
+                                editable=False,
+                                primary_key=True,
+                                serialize=False,
+                            ),
+                        ),
+                        ("expiry_bucket", models.PositiveIntegerField()),
+                        ("jti_hash", models.UUIDField()),
+                        ("user_id", models.UUIDField()),
+                    ],
+                ),
+            ],
+        ),
+        migrations.RunPython(create_table, drop_table),
+    ]
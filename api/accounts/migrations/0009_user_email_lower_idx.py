@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:40
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+INDEX = models.Index(Lower("email"), name="accounts_user_email_lower_idx")
+
+
+def _options(schema_editor):
+    """Return the options for building the index."""
+    if schema_editor.connection.vendor == "postgresql":
+        return {"concurrently": True}
+    return {}
+
+
+def add_index(apps, schema_editor):
+    """Build the index without blocking writes on PostgreSQL."""
+    User = apps.get_model("accounts", "User")
+    schema_editor.add_index(User, INDEX, **_options(schema_editor))
+
+
+def remove_index(apps, schema_editor):
+    """Drop the index created by add_index."""
+    User = apps.get_model("accounts", "User")
+    schema_editor.remove_index(User, INDEX, **_options(schema_editor))
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0008_revokedtoken"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="user", index=INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(add_index, remove_index),
+            ],
+        ),
+    ]
@@ -3,9 +3,88 @@
 import uuid
 
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.auth.models import UserManager as BaseUserManager
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+from .cache import token_epochs, user_cache
+from .routers import routing
+
+
+class UserQuerySet(models.QuerySet):
+    """User queryset that keeps versions and the user cache coherent."""
+
+    def update(self, **kwargs) -> int:
+        """
+        Update rows, bump their version and evict them from the cache.
+
+        Password changes and deactivations also bump the token epoch, which
+        revokes every token issued to the users before the update. Updates
+        that touch no cached field, such as ``last_login``, are passed
+        through without loading the rows' primary keys.
+        """
+        revoke = (
+            "token_epoch" in kwargs
+            or "password" in kwargs
+            or kwargs.get("is_active") is False
+        )
+        if not revoke and set(kwargs).isdisjoint(user_cache.fields):
+            return super().update(**kwargs)
+        kwargs.setdefault("version", uuid.uuid4())
+        if revoke:
+            kwargs.setdefault("token_epoch", F("token_epoch") + 1)
+        pks = list(self.values_list("pk", flat=True))
+        rows = super().update(**kwargs)
+        _invalidate_users(pks)
+        if revoke and pks:
+            transaction.on_commit(lambda: _publish_token_epochs(pks))
+        return rows
+
+    def delete(self) -> tuple[int, dict[str, int]]:
+        """Delete the users and evict them from the user cache."""
+        pks = list(self.values_list("pk", flat=True))
+        result = super().delete()
+        _invalidate_users(pks)
+        return result
+
+    def revoke_tokens(self) -> int:
+        """Revoke every access and refresh token issued to these users."""
+        return self.update(token_epoch=F("token_epoch") + 1)
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):  # type: ignore[misc]
+    """User manager backed by UserQuerySet."""
+
+
+def _invalidate_users(pks: list) -> None:
+    """
+    Evict users from this worker now, and from every worker on commit.
+
+    Other workers cannot read the new rows before the commit, so only the
+    commit is broadcast.
+    """
+    if not pks:
+        return
+    user_cache.invalidate_many(pks, broadcast=False)
+    transaction.on_commit(lambda: _users_written(pks))
+
+
+def _users_written(pks: list) -> None:
+    """Evict committed users and keep their reads on the primary for a while."""
+    user_cache.invalidate_many(pks)
+    for pk in pks:
+        routing.pin(pk)
+
+
+def _publish_token_epochs(pks) -> None:
+    """Share the committed token epochs of pks with every worker."""
+    rows = User.objects.using("default").filter(pk__in=pks)
+    for pk, epoch in rows.values_list("pk", "token_epoch"):
+        token_epochs.set(pk, epoch)
+
 
 class User(AbstractUser):
     """Custom user model with email as the primary identifier."""
@@ -15,6 +94,12 @@ class User(AbstractUser):
     full_name = models.CharField(max_length=255, blank=True)
     agreed_to_terms = models.BooleanField(default=False)
     agreed_at = models.DateTimeField(null=True, blank=True)
+    # Replaced on every write; clients revalidate against it via ETag.
+    version = models.UUIDField(default=uuid.uuid4, editable=False)
+    # Embedded in tokens at issue time; bumping it revokes all of them.
+    token_epoch = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = UserManager()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
@@ -24,14 +109,192 @@ class User(AbstractUser):
 
         indexes = [
             models.Index(fields=["email"]),
+            # Case-insensitive lookups by email, e.g. logout/users/.
+            models.Index(Lower("email"), name="accounts_user_email_lower_idx"),
+            # Admin changelist order; -id is Django's deterministic tie-break.
+            models.Index(
+                fields=["-date_joined", "-id"], name="accounts_user_joined_idx"
+            ),
+            # Rare filter values get partial indexes in the same order; common
+            # ones are served by walking accounts_user_joined_idx.
+            models.Index(
+                fields=["-date_joined", "-id"],
+                condition=models.Q(is_staff=True),
+                name="accounts_user_staff_joined_idx",
+            ),
+            models.Index(
+                fields=["-date_joined", "-id"],
+                condition=models.Q(is_active=False),
+                name="accounts_user_inactive_idx",
+            ),
+            models.Index(
+                fields=["-date_joined", "-id"],
+                condition=models.Q(agreed_to_terms=False),
+                name="accounts_user_unagreed_idx",
+            ),
+            # Admin search also uses pg_trgm indexes on UPPER(email) and
+            # UPPER(full_name), created by migration 0004 on PostgreSQL only.
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember is_active as loaded, so save() can spot deactivations."""
+        user = super().from_db(db, field_names, values)
+        user._loaded_active = user.__dict__.get("is_active")
+        return user
+
     def save(self, *args, **kwargs) -> None:  # type: ignore[override]
-        """Set agreed_at timestamp when user agrees to terms."""
+        """
+        Stamp agreed_at and a new version, then save.
+
+        Changing the password or deactivating the user bumps the token epoch.
+        """
+        self.stamp_agreed_at()
+        adding = self._state.adding
+        self.version = uuid.uuid4()
+        update_fields = {"version"}
+        revoke = not self._state.adding and (
+            self._password is not None
+            or (getattr(self, "_loaded_active", False) and not self.is_active)
+        )
+        if revoke:
+            self.token_epoch += 1
+            update_fields.add("token_epoch")
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], *update_fields}
+        super().save(*args, **kwargs)
+        self._loaded_active = self.is_active
+        pk = self.pk
+        if adding:
+            # Nothing can have cached a row that did not exist yet.
+            transaction.on_commit(lambda: routing.pin(pk))
+        else:
+            _invalidate_users([pk])
+        if revoke:
+            epoch = self.token_epoch
+            transaction.on_commit(lambda: token_epochs.set(pk, epoch))
+
+    def stamp_agreed_at(self) -> None:
+        """Set agreed_at the first time the user agrees to terms."""
         if self.agreed_to_terms and not self.agreed_at:
             self.agreed_at = timezone.now()
-        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):  # type: ignore[override]
+        """Delete the user and evict it from the user cache."""
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        _invalidate_users([pk])
+        return result
 
     def __str__(self) -> str:
         """Return string representation."""
         return self.email
+
+
+class OutboxEmail(models.Model):
+    """A rendered email waiting to be delivered by the outbox worker."""
+
+    class Status(models.TextChoices):
+        """Delivery states."""
+
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    subject = models.CharField(max_length=998)
+    body = models.TextField(blank=True)
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        """Meta options."""
+
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="accounts_outbox_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"{self.subject} -> {', '.join(self.to)}"
+
+
+class RevokedToken(models.Model):
+    """
+    A revoked refresh token in the compact revocation store.
+
+    Rows are keyed by expiry bucket first, so a bucket whose tokens have all
+    expired is removed in one step; on PostgreSQL it is a partition.
+    """
+
+    pk = models.CompositePrimaryKey("expiry_bucket", "jti_hash")
+    expiry_bucket = models.PositiveIntegerField()
+    # BLAKE2b-128 of the jti; PostgreSQL's uuid type holds it in 16 bytes.
+    jti_hash = models.UUIDField()
+    # No foreign key: the row needs no index or check on the users table.
+    user_id = models.UUIDField()
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"{self.jti_hash} (bucket {self.expiry_bucket})"
+
+
+class ProfilerConfig(models.Model):
+    """Admin switch for the sampling profiler; there is at most one row."""
+
+    enabled = models.BooleanField(default=False)
+    url_names = models.CharField(
+        max_length=1000,
+        blank=True,
+        help_text="Comma-separated URL names, e.g. jwt-create, user-me. "
+        "Blank profiles every route.",
+    )
+    sample_percent = models.FloatField(
+        default=100.0,
+        validators=[MinValueValidator(0.0), MaxValueValidator(100.0)],
+        help_text="Percentage of matching requests to profile.",
+    )
+    expires_at = models.DateTimeField(
+        null=True, blank=True, help_text="Stop profiling after this time."
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Meta options."""
+
+        verbose_name = "profiler configuration"
+
+    def save(self, *args, **kwargs) -> None:  # type: ignore[override]
+        """Always store the single row."""
+        self.pk = 1
+        super().save(*args, **kwargs)
+
+    @property
+    def url_name_list(self) -> list[str]:
+        """Return the selected URL names."""
+        return [name.strip() for name in self.url_names.split(",") if name.strip()]
+
+    def is_active(self) -> bool:
+        """Return whether profiling is switched on and not expired."""
+        return self.enabled and (
+            self.expires_at is None or self.expires_at > timezone.now()
+        )
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return "Profiler " + ("on" if self.is_active() else "off")
@@ -0,0 +1,55 @@
+"""Pagination helpers for large tables."""
+
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the PostgreSQL planner for large result sets.
+
+    An exact ``COUNT(*)`` scans every matching row. The planner's estimate
+    (``pg_class.reltuples`` for the whole table, ``EXPLAIN`` otherwise) is
+    used instead once it exceeds ``exact_count_threshold``; smaller results
+    and other databases are counted exactly.
+    """
+
+    exact_count_threshold = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        """Return the exact count for small results, else the estimate."""
+        estimate = self.estimate_count()
+        if estimate is None or estimate < self.exact_count_threshold:
+            return super().count
+        return estimate
+
+    def estimate_count(self) -> int | None:
+        """Return the planner's row estimate, or None if unavailable."""
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                # reltuples is -1 until the table is first analyzed.
+                return row[0] if row and row[0] >= 0 else None
+
+            sql, params = queryset.order_by().values("pk").query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,152 @@
+"""In-process sampling profiler for live workers."""
+
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+
+
+class SamplingProfiler:
+    """
+    Periodically sample the stacks of threads serving profiled requests.
+
+    A daemon thread reads ``sys._current_frames()`` for the registered
+    threads and counts each stack, root first, under the request's URL name.
+    After each sample it sleeps at least ``cost / MAX_OVERHEAD``, so sampling
+    never uses more than that fraction of a core. Kept stacks are written
+    to ``<DIRECTORY>/profile-<pid>.folded`` in collapsed-stack format, ready
+    for ``flamegraph.pl`` or speedscope.
+    """
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_PROFILER
+        self.enabled: bool = config.get("ENABLED", True)
+        self.directory = Path(config["DIRECTORY"])
+        self.interval: float = config.get("INTERVAL", 0.005)
+        self.max_overhead: float = config.get("MAX_OVERHEAD", 0.02)
+        self.max_active: int = config.get("MAX_ACTIVE", 8)
+        self.max_stacks: int = config.get("MAX_STACKS", 10_000)
+        self.max_depth: int = config.get("MAX_DEPTH", 100)
+        self.flush_interval: float = config.get("FLUSH_INTERVAL", 10.0)
+        self.config_ttl: float = config.get("CONFIG_TTL", 5.0)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._ids = itertools.count(1)
+        self._config = None
+        self._config_at = float("-inf")
+        self._thread_pid: int | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop collected stacks, active requests and the cached switch."""
+        with self._lock:
+            self._config_at = float("-inf")
+            # token -> (thread id, label, stacks sampled for that request)
+            self._active: dict[int, tuple[int, str, Counter]] = {}
+            self.stacks: Counter[str] = Counter()
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+    def selects(self, label: str) -> bool:
+        """Return whether the admin switch selects a request to label."""
+        now = time.monotonic()
+        if now - self._config_at >= self.config_ttl:
+            from .models import ProfilerConfig
+
+            self._config = ProfilerConfig.objects.filter(pk=1).first()
+            self._config_at = now
+        config = self._config
+        return (
+            config is not None
+            and config.is_active()
+            and (not config.url_name_list or label in config.url_name_list)
+            and random.random() * 100 < config.sample_percent
+        )
+
+    def begin(self, label: str) -> int | None:
+        """Start sampling the current thread; return a token for end()."""
+        with self._lock:
+            if len(self._active) >= self.max_active:
+                return None
+            if self._thread_pid != os.getpid():
+                # First use in this (possibly freshly forked) worker.
+                self._active.clear()
+                self.stacks.clear()
+                self._start_thread()
+            token = next(self._ids)
+            self._active[token] = (threading.get_ident(), label, Counter())
+        self._wake.set()
+        return token
+
+    def end(self, token: int, keep: bool = True) -> int:
+        """Stop sampling a request; return how many samples it produced."""
+        with self._lock:
+            _, _, stacks = self._active.pop(token)
+            if keep:
+                for stack, count in stacks.items():
+                    if stack in self.stacks or len(self.stacks) < self.max_stacks:
+                        self.stacks[stack] += count
+                    else:
+                        self.stacks[f"{stack.split(';', 1)[0]};[truncated]"] += count
+                self._dirty = self._dirty or bool(stacks)
+        return sum(stacks.values())
+
+    def _start_thread(self) -> None:
+        self._thread_pid = os.getpid()
+        threading.Thread(
+            target=self._run, name="accounts-profiler", daemon=True
+        ).start()
+
+    def _run(self) -> None:
+        while True:
+            if not self._active:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._maybe_flush()
+                continue
+            started = time.perf_counter()
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, label, stacks in self._active.values():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stacks[self._collapse(label, frame)] += 1
+            del frames
+            self._maybe_flush()
+            cost = time.perf_counter() - started
+            time.sleep(max(self.interval, cost / self.max_overhead))
+
+    def _collapse(self, label: str, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}")
+            frame = frame.f_back
+        names.append(label)
+        return ";".join(reversed(names))
+
+    def _maybe_flush(self) -> None:
+        if self._dirty and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> Path:
+        """Write the kept stacks of this worker and return the file path."""
+        with self._lock:
+            lines = [f"{stack} {count}\n" for stack, count in self.stacks.items()]
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"profile-{os.getpid()}.folded"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("".join(lines))
+        os.replace(tmp, path)
+        return path
+
+
+profiler = SamplingProfiler()
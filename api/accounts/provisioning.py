@@ -0,0 +1,127 @@
+"""Bulk user registration for partner systems."""
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from djoser import signals
+from djoser.compat import get_user_email
+from djoser.conf import settings as djoser_settings
+from rest_framework.exceptions import ValidationError
+
+from .concurrency import cpu_executor
+from .models import User
+from .serializers import BulkUserCreateSerializer
+
+
+def _unique_message(name: str) -> str:
+    """Return the message the registration endpoint uses for a taken value."""
+    field = User._meta.get_field(name)
+    return field.error_messages["unique"] % {
+        "model_name": User._meta.verbose_name,
+        "field_label": field.verbose_name,
+    }
+
+
+def provision_users(rows: list, request, sender) -> list[dict]:
+    """
+    Register the valid rows and return one result per row, in input order.
+
+    Each row is validated like a registration, except that uniqueness is
+    checked for the whole batch with two queries. Passwords are hashed in the
+    CPU pool. Valid users are then inserted with one multi-row statement, and
+    their activation emails are queued in a single write. The insert and the
+    queued emails commit together, and a conflicting concurrent registration
+    rolls both back.
+    """
+    results: list[dict] = [{} for _ in rows]
+    candidates: list[tuple[int, dict]] = []
+    seen: dict[str, set] = {"email": set(), "username": set()}
+    for index, row in enumerate(rows):
+        serializer = BulkUserCreateSerializer(data=row, context={"request": request})
+        if not serializer.is_valid():
+            results[index] = _invalid(index, serializer.errors)
+            continue
+        data = dict(serializer.validated_data)
+        data["email"] = User.objects.normalize_email(data["email"])
+        data["username"] = User.normalize_username(data["username"])
+        duplicates = {
+            name: ["Duplicate in this batch."]
+            for name, values in seen.items()
+            if data[name] in values
+        }
+        if duplicates:
+            results[index] = _invalid(index, duplicates)
+            continue
+        for name, values in seen.items():
+            values.add(data[name])
+        candidates.append((index, data))
+
+    taken = {
+        name: set(
+            User.objects.filter(**{f"{name}__in": values}).values_list(name, flat=True)
+        )
+        for name, values in seen.items()
+        if values
+    }
+    valid = []
+    for index, data in candidates:
+        errors = {
+            name: [_unique_message(name)]
+            for name in seen
+            if data[name] in taken.get(name, ())
+        }
+        if errors:
+            results[index] = _invalid(index, errors)
+        else:
+            valid.append((index, data))
+
+    hashes = cpu_executor.map(make_password, [data["password"] for _, data in valid])
+    users = []
+    for (_, data), password in zip(valid, hashes, strict=True):
+        user = User(**{**data, "password": password})
+        user.is_active = not djoser_settings.SEND_ACTIVATION_EMAIL
+        user.stamp_agreed_at()
+        users.append(user)
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            queue_registration_emails(users, request)
+    except IntegrityError as e:
+        raise ValidationError(
+            {"users": ["Some users were registered concurrently; retry the batch."]}
+        ) from e
+
+    for (index, _), user in zip(valid, users, strict=True):
+        signals.user_registered.send(sender=sender, user=user, request=request)
+        results[index] = {
+            "index": index,
+            "status": "created",
+            "id": str(user.pk),
+            "email": user.email,
+        }
+    return results
+
+
+def queue_registration_emails(users: list[User], request) -> None:
+    """Send the registration email of each user in one backend call."""
+    if djoser_settings.SEND_ACTIVATION_EMAIL:
+        email_class = djoser_settings.EMAIL.activation
+    elif djoser_settings.SEND_CONFIRMATION_EMAIL:
+        email_class = djoser_settings.EMAIL.confirmation
+    else:
+        return
+    messages = []
+    for user in users:
+        # What djoser's BaseEmailMessage.send() does before sending.
+        message = email_class(request, {"user": user})
+        message.render()
+        message.to = [get_user_email(user)]
+        message.from_email = settings.DEFAULT_FROM_EMAIL
+        messages.append(message)
+    if messages:
+        messages[0].get_connection().send_messages(messages)
+
+
+def _invalid(index: int, errors) -> dict:
+    return {"index": index, "status": "invalid", "errors": errors}
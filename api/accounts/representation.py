@@ -0,0 +1,134 @@
+"""Precompiled output path for model serializers."""
+
+import datetime
+from collections.abc import Callable
+from operator import attrgetter
+from typing import Any
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from rest_framework import fields, serializers
+from rest_framework.settings import api_settings
+
+# (output name, attribute getter, value formatter)
+Plan = tuple[tuple[str, Callable[[Any], Any], Callable[[Any], Any]], ...]
+
+
+def _as_str(value) -> str:
+    return value if type(value) is str else str(value)
+
+
+def _bool_formatter(field: fields.BooleanField) -> Callable[[Any], Any]:
+    def format_bool(value):
+        return value if type(value) is bool else field.to_representation(value)
+
+    return format_bool
+
+
+def _uuid_formatter(field: fields.UUIDField) -> Callable[[Any], Any]:
+    if field.uuid_format == "hex_verbose":
+        return str
+    return attrgetter(field.uuid_format)
+
+
+def _datetime_formatter(field: fields.DateTimeField) -> Callable[[Any], Any] | None:
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if hasattr(field, "timezone") or output_format is None:
+        return None
+    if output_format.lower() != fields.ISO_8601:
+        return None
+
+    def format_datetime(value):
+        # Aware datetimes in the current zone are formatted inline; anything
+        # else goes through DRF so the output stays identical.
+        if type(value) is not datetime.datetime or value.tzinfo is None:
+            return field.to_representation(value)
+        if not settings.USE_TZ:
+            return field.to_representation(value)
+        text = value.astimezone(timezone.get_current_timezone()).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return format_datetime
+
+
+# Keyed by the unoverridden to_representation so subclasses that change
+# the output (but not ones that only change validation) are excluded.
+FORMATTERS: dict[Callable, Callable[[Any], Callable[[Any], Any] | None]] = {
+    fields.CharField.to_representation: lambda field: _as_str,
+    fields.BooleanField.to_representation: _bool_formatter,
+    fields.UUIDField.to_representation: _uuid_formatter,
+    fields.DateTimeField.to_representation: _datetime_formatter,
+}
+
+
+def compile_plan(serializer: serializers.ModelSerializer) -> Plan | None:
+    """
+    Resolve the getter and formatter of every readable field once.
+
+    Returns None when a field is not a plain model column with a known
+    formatter, in which case DRF's generic path must be used.
+    """
+    columns = {f.name for f in serializer.Meta.model._meta.concrete_fields}
+    plan = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source not in columns:
+            return None
+        factory = FORMATTERS.get(type(field).to_representation)
+        formatter = factory(field) if factory else None
+        if formatter is None:
+            return None
+        plan.append((field.field_name, attrgetter(field.source), formatter))
+    return tuple(plan)
+
+
+def represent(plan: Plan, instance) -> dict[str, Any]:
+    """Return the representation of instance following plan."""
+    ret = {}
+    for name, get, formatter in plan:
+        value = get(instance)
+        ret[name] = None if value is None else formatter(value)
+    return ret
+
+
+class CompiledListSerializer(serializers.ListSerializer):
+    """List serializer that applies the child's compiled plan to each item."""
+
+    def to_representation(self, data):
+        """Represent every item without per-item serializer dispatch."""
+        plan = self.child.compiled_plan()
+        if plan is None:
+            return super().to_representation(data)
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return [represent(plan, item) for item in iterable]
+
+
+class CompiledRepresentationMixin:
+    """
+    Serve ``to_representation`` from a plan compiled once per class.
+
+    DRF deep-copies and binds every field for each serializer instance and
+    dispatches per field on output. The compiled path reads columns and
+    formats values directly, producing the same data. Pair with
+    ``list_serializer_class = CompiledListSerializer`` for ``many=True``.
+    """
+
+    _compiled: dict[type, Plan | None] = {}
+
+    @classmethod
+    def compiled_plan(cls) -> Plan | None:
+        """Return the class's plan, compiling it on first use."""
+        try:
+            return cls._compiled[cls]
+        except KeyError:
+            plan = cls._compiled[cls] = compile_plan(cls())
+            return plan
+
+    def to_representation(self, instance):
+        """Represent instance with the compiled plan when one exists."""
+        plan = self.compiled_plan()
+        if plan is None:
+            return super().to_representation(instance)  # type: ignore[misc]
+        return represent(plan, instance)
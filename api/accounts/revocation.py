@@ -0,0 +1,278 @@
+"""Stores of revoked refresh tokens, selected by ACCOUNTS_REVOCATION_STORE."""
+
+import hashlib
+import time
+import uuid
+from functools import cache
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import DateTimeField, Value
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import BlacklistMixin, Token
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .blacklist import blacklist_filter
+from .metrics import metrics
+from .models import RevokedToken, User
+
+
+class OutstandingTokenStore:
+    """
+    simplejwt's token blacklist app.
+
+    Every issued refresh token is recorded in ``OutstandingToken``, and a
+    revoked one gets a ``BlacklistedToken`` row pointing at it. Lookups go
+    through the Bloom filter first, so most checks cost no query.
+    """
+
+    def issue(self, token: Token, user: User) -> None:
+        """Record a newly issued refresh token for user."""
+        OutstandingToken.objects.create(
+            user=user,
+            jti=token[api_settings.JTI_CLAIM],
+            token=str(token),
+            created_at=token.current_time,
+            expires_at=datetime_from_epoch(token["exp"]),
+        )
+
+    def outstand(self, token: Token) -> None:
+        """Record a rotated refresh token."""
+        BlacklistMixin.outstand(token)  # type: ignore[arg-type]
+
+    def is_revoked(self, payload: dict[str, Any]) -> bool:
+        """Return whether the token with payload is blacklisted."""
+        jti = payload.get(api_settings.JTI_CLAIM)
+        if jti is None or not blacklist_filter.might_contain(jti):
+            return False
+        if BlacklistedToken.objects.filter(token__jti=jti).exists():
+            metrics.inc("auth_blacklist_hits_total")
+            return True
+        return False
+
+    def revoke(self, token: Token) -> bool:
+        """
+        Blacklist token, recording it as outstanding first if needed.
+
+        Return False if it was already blacklisted.
+        """
+        _, created = BlacklistMixin.blacklist(token)  # type: ignore[arg-type]
+        return created
+
+    async def arevoke(self, token: Token) -> None:
+        """Async version of revoke() using the async ORM."""
+        user_id = token.payload.get(api_settings.USER_ID_CLAIM)
+        user = await User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).afirst()
+        outstanding, _ = await OutstandingToken.objects.aget_or_create(
+            jti=token.payload[api_settings.JTI_CLAIM],
+            defaults={
+                "user": user,
+                "created_at": token.current_time,
+                "token": str(token),
+                "expires_at": datetime_from_epoch(token.payload["exp"]),
+            },
+        )
+        await BlacklistedToken.objects.aget_or_create(token=outstanding)
+
+    def revoke_users(self, user_ids: list) -> int:
+        """
+        Blacklist every live refresh token of user_ids and return how many.
+
+        This costs one ``INSERT ... SELECT``, however many tokens the users
+        hold. Call it inside a transaction.
+        """
+        now = timezone.now()
+        using = router.db_for_write(BlacklistedToken)
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        opts = BlacklistedToken._meta
+        columns = ", ".join(
+            quote(opts.get_field(name).column) for name in ("token", "blacklisted_at")
+        )
+        insert = connection.ops.insert_statement(on_conflict=OnConflict.IGNORE)
+        ignore = connection.ops.on_conflict_suffix_sql([], OnConflict.IGNORE, [], [])
+        live = (
+            OutstandingToken.objects.using(using)
+            .filter(
+                user_id__in=user_ids,
+                expires_at__gt=now,
+                blacklistedtoken__isnull=True,
+            )
+            .order_by()
+            .annotate(at=Value(now, output_field=DateTimeField()))
+            .values_list("pk", "at")
+        )
+        select, params = live.query.get_compiler(using=using).as_sql()
+        with connection.cursor() as cursor:
+            # Tokens blacklisted concurrently, e.g. by a logout, are skipped.
+            cursor.execute(
+                f"{insert} {quote(opts.db_table)} ({columns}) {select} {ignore}",
+                params,
+            )
+            blacklisted = cursor.rowcount
+        if blacklisted:
+            blacklist_filter.rows_added()
+        return blacklisted
+
+    def prune(self) -> list[int]:
+        """Return no buckets; ``prune_tokens`` walks these tables by id."""
+        return []
+
+
+class CompactTokenStore:
+    """
+    ``RevokedToken`` rows holding a JTI hash, a user id and an expiry bucket.
+
+    Only revoked tokens are stored, and nothing about the tokens that are
+    issued. Revoking all of a user's tokens needs no rows at all, since the
+    token epoch bump already rejects them. A token's bucket is its expiry
+    time divided by ``BUCKET_SECONDS``. Once a bucket has passed, every token
+    in it has expired, so ``prune()`` discards the whole bucket at once. On
+    PostgreSQL each bucket is a partition that is dropped.
+    """
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_REVOCATION_STORE
+        self.bucket_seconds: int = config.get("BUCKET_SECONDS", 86400)
+        self.table = RevokedToken._meta.db_table
+        self.default_partition = f"{self.table}_default"
+
+    def bucket(self, exp: int) -> int:
+        """Return the expiry bucket of a token expiring at exp."""
+        return int(exp) // self.bucket_seconds
+
+    @staticmethod
+    def jti_hash(jti: str) -> uuid.UUID:
+        """Return the 16-byte digest of jti, stored in a fixed-width column."""
+        return uuid.UUID(bytes=hashlib.blake2b(jti.encode(), digest_size=16).digest())
+
+    def _row(self, token: Token) -> RevokedToken:
+        return RevokedToken(
+            expiry_bucket=self.bucket(token.payload["exp"]),
+            jti_hash=self.jti_hash(token.payload[api_settings.JTI_CLAIM]),
+            user_id=token.payload[api_settings.USER_ID_CLAIM],
+        )
+
+    def issue(self, token: Token, user: User) -> None:
+        """Issued tokens are not recorded."""
+
+    def outstand(self, token: Token) -> None:
+        """Rotated tokens are not recorded."""
+
+    def is_revoked(self, payload: dict[str, Any]) -> bool:
+        """Return whether the token with payload is revoked; one primary key probe."""
+        jti, exp = payload.get(api_settings.JTI_CLAIM), payload.get("exp")
+        if jti is None or exp is None:
+            return False
+        if RevokedToken.objects.filter(
+            expiry_bucket=self.bucket(exp), jti_hash=self.jti_hash(jti)
+        ).exists():
+            metrics.inc("auth_blacklist_hits_total")
+            return True
+        return False
+
+    def revoke(self, token: Token) -> bool:
+        """Store token as revoked; return False if it already was."""
+        try:
+            with transaction.atomic(using=router.db_for_write(RevokedToken)):
+                self._row(token).save(force_insert=True)
+        except IntegrityError:
+            return False
+        return True
+
+    async def arevoke(self, token: Token) -> None:
+        """Async version of revoke() using the async ORM."""
+        await RevokedToken.objects.abulk_create(
+            [self._row(token)], ignore_conflicts=True
+        )
+
+    def revoke_users(self, user_ids: list) -> int:
+        """Write nothing; the users' token epoch bump revokes their tokens."""
+        return 0
+
+    def prune(self, now: float | None = None) -> list[int]:
+        """Drop the buckets whose tokens have all expired and return them."""
+        current = self.bucket(time.time() if now is None else now)
+        using = router.db_for_write(RevokedToken)
+        connection = connections[using]
+        if connection.vendor != "postgresql":
+            expired = RevokedToken.objects.using(using).filter(
+                expiry_bucket__lt=current
+            )
+            buckets = list(
+                expired.order_by("expiry_bucket")
+                .values_list("expiry_bucket", flat=True)
+                .distinct()
+            )
+            expired.delete()
+            return buckets
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            return self._rotate_partitions(cursor, connection.ops.quote_name, current)
+
+    def _rotate_partitions(self, cursor, quote, current: int) -> list[int]:
+        """Drop expired partitions and create those of upcoming buckets."""
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class parent ON parent.oid = pg_inherits.inhparent"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " WHERE parent.relname = %s",
+            [self.table],
+        )
+        prefix = f"{self.table}_"
+        partitions = {
+            int(name.removeprefix(prefix))
+            for (name,) in cursor.fetchall()
+            if name.removeprefix(prefix).isdigit()
+        }
+        dropped = sorted(bucket for bucket in partitions if bucket < current)
+        for bucket in dropped:
+            cursor.execute(f"DROP TABLE {quote(prefix + str(bucket))}")
+        # Rows whose bucket had no partition yet landed in the default one.
+        cursor.execute(
+            f"DELETE FROM {quote(self.default_partition)} WHERE expiry_bucket < %s",
+            [current],
+        )
+        lifetime = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+        last = current + int(lifetime // self.bucket_seconds) + 1
+        for bucket in range(current, last + 1):
+            if bucket in partitions:
+                continue
+            cursor.execute(
+                f"SELECT 1 FROM {quote(self.default_partition)}"
+                " WHERE expiry_bucket = %s LIMIT 1",
+                [bucket],
+            )
+            if cursor.fetchone():
+                # The bucket's rows stay in the default partition until it passes.
+                continue
+            cursor.execute(
+                f"CREATE TABLE {quote(prefix + str(bucket))}"
+                f" PARTITION OF {quote(self.table)}"
+                f" FOR VALUES FROM ({bucket}) TO ({bucket + 1})"
+            )
+        return dropped
+
+
+STORES = {"outstanding": OutstandingTokenStore, "compact": CompactTokenStore}
+
+
+@cache
+def get_revocation_store() -> OutstandingTokenStore | CompactTokenStore:
+    """Return the store named by ``ACCOUNTS_REVOCATION_STORE["BACKEND"]``."""
+    backend = settings.ACCOUNTS_REVOCATION_STORE.get("BACKEND", "outstanding")
+    if backend not in STORES:
+        raise ImproperlyConfigured(
+            f"ACCOUNTS_REVOCATION_STORE BACKEND must be one of "
+            f"{', '.join(STORES)}, not {backend!r}."
+        )
+    return STORES[backend]()
@@ -0,0 +1,122 @@
+"""Database routing between the primary and read replicas."""
+
+import random
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+
+@dataclass
+class RequestRouting:
+    """Routing state of one request."""
+
+    primary: bool = False
+    wrote: bool = False
+
+
+_request: ContextVar[RequestRouting | None] = ContextVar(
+    "accounts_request_routing", default=None
+)
+
+
+class ReplicaRouting:
+    """
+    Decide which database serves each read.
+
+    Only requests marked by ``ReplicaRoutingMiddleware`` read from replicas,
+    and only until they write. Everything else (commands, workers, the
+    shell) uses the primary. Users whose rows were written, or who made a
+    write request, are pinned to the primary for ``STICKY_SECONDS`` by a
+    marker in the ``CACHE_ALIAS`` cache, so they read their own writes.
+    Models of ``PRIMARY_APPS`` (sessions by default) are never read from
+    replicas.
+    """
+
+    key_prefix = "accounts:primary:"
+
+    def __init__(self) -> None:
+        config = settings.ACCOUNTS_DATABASE_ROUTING
+        self.replicas: list[str] = list(config.get("REPLICAS", []))
+        self.sticky_seconds: int = config.get("STICKY_SECONDS", 10)
+        self.alias: str = config.get("CACHE_ALIAS", "shared")
+        self.primary_apps = frozenset(config.get("PRIMARY_APPS", ("sessions",)))
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether any replica is configured."""
+        return bool(self.replicas)
+
+    def _key(self, user_id: Any) -> str:
+        return f"{self.key_prefix}{user_id}"
+
+    def begin(self, primary: bool = False) -> Token:
+        """Start routing a request; reads use replicas unless primary."""
+        return _request.set(RequestRouting(primary=primary))
+
+    def end(self, token: Token) -> RequestRouting:
+        """Stop routing a request and return its final state."""
+        state = _request.get()
+        _request.reset(token)
+        return state or RequestRouting()
+
+    def pin(self, user_id: Any) -> None:
+        """Keep user_id's requests on the primary for STICKY_SECONDS."""
+        if self.enabled and user_id is not None:
+            caches[self.alias].set(self._key(user_id), True, self.sticky_seconds)
+
+    def stick_if_pinned(self, user_id: Any) -> None:
+        """Move the current request to the primary if user_id is pinned."""
+        state = _request.get()
+        if state is None or state.primary or user_id is None:
+            return
+        if caches[self.alias].get(self._key(user_id)):
+            state.primary = True
+
+    def db_for_read(self, model) -> str:
+        """Return a replica if the current request may read from one."""
+        state = _request.get()
+        if (
+            state is None
+            or state.primary
+            or not self.replicas
+            or model._meta.app_label in self.primary_apps
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(self.replicas)
+
+    def db_for_write(self) -> str:
+        """Return the primary and keep the rest of the request on it."""
+        state = _request.get()
+        if state is not None:
+            state.primary = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+
+class ReplicaRouter:
+    """Django database router backed by ``routing``."""
+
+    def db_for_read(self, model, **hints) -> str:
+        """Route reads to a replica when the request allows it."""
+        return routing.db_for_read(model)
+
+    def db_for_write(self, model, **hints) -> str:
+        """Route every write, including to replica-loaded rows, to the primary."""
+        return routing.db_for_write()
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+        """Allow relations between rows of the primary and its replicas."""
+        databases = {DEFAULT_DB_ALIAS, *routing.replicas}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints) -> bool | None:
+        """Migrate the primary only; replicas follow it."""
+        return False if db in routing.replicas else None
+
+
+routing = ReplicaRouting()
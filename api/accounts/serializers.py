@@ -2,13 +2,32 @@
 
 from typing import Any
 
+from django.utils.translation import gettext_lazy as _
 from djoser.serializers import (
     UserCreatePasswordRetypeSerializer as BaseUserCreateSerializer,
 )
 from djoser.serializers import UserSerializer as BaseUserSerializer
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
+from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer as BaseTokenObtainPairSerializer,
+)
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer as BaseTokenRefreshSerializer,
+)
+from rest_framework_simplejwt.serializers import (
+    TokenVerifySerializer as BaseTokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 
+from .guard import login_guard
+from .metrics import metrics
 from .models import User
+from .representation import CompiledListSerializer, CompiledRepresentationMixin
+from .revocation import get_revocation_store
+from .tokens import RefreshToken, is_revoked
 
 
 class UserCreateSerializer(BaseUserCreateSerializer):
@@ -57,13 +76,45 @@ class UserCreateSerializer(BaseUserCreateSerializer):
         return user
 
 
-class UserSerializer(BaseUserSerializer):
-    """Serializer for user data."""
+class BulkUserCreateSerializer(UserCreateSerializer):
+    """
+    Registration rules for one row of a bulk registration.
+
+    Uniqueness is checked once for the whole batch by ``provision_users``
+    instead of with two queries per row.
+    """
+
+    def get_fields(self) -> dict[str, serializers.Field]:
+        """Return the registration fields without their unique validators."""
+        fields = super().get_fields()
+        for field in fields.values():
+            field.validators = [
+                v for v in field.validators if not isinstance(v, UniqueValidator)
+            ]
+        return fields
+
+
+class RevokeSessionsSerializer(serializers.Serializer):
+    """Users whose sessions staff are ending, by id and/or email."""
+
+    ids = serializers.ListField(child=serializers.UUIDField(), default=list)
+    emails = serializers.ListField(child=serializers.EmailField(), default=list)
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        """Require at least one user."""
+        if not attrs["ids"] and not attrs["emails"]:
+            raise serializers.ValidationError(_("Give user ids or emails."))
+        return attrs
+
+
+class UserSerializer(CompiledRepresentationMixin, BaseUserSerializer):
+    """Serializer for user data, with a precompiled output path."""
 
     class Meta(BaseUserSerializer.Meta):
         """Meta options."""
 
         model = User
+        list_serializer_class = CompiledListSerializer
         fields = (
             "id",
             "email",
@@ -79,3 +130,80 @@ class UserSerializer(BaseUserSerializer):
             "agreed_at",
             "date_joined",
         )
+
+
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    """Obtain a token pair, rejecting guarded attempts before hashing."""
+
+    token_class = RefreshToken
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, str]:
+        """Check the login guard, then authenticate and record the outcome."""
+        request = self.context.get("request")
+        username = attrs[self.username_field]
+
+        wait = login_guard.retry_after(request, username)
+        if wait is not None:
+            metrics.inc("auth_logins_total", outcome="blocked")
+            raise exceptions.Throttled(wait=wait)
+
+        try:
+            data = super().validate(attrs)
+        except exceptions.AuthenticationFailed:
+            login_guard.record_failure(request, username)
+            metrics.inc("auth_logins_total", outcome="failure")
+            raise
+        login_guard.record_success(request, username)
+        metrics.inc("auth_logins_total", outcome="success")
+        return data
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Refresh a token pair using the project's refresh token class."""
+
+    token_class = RefreshToken  # type: ignore[assignment]
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, str]:
+        """Rotate the token, checking its epoch against the user row loaded."""
+        refresh = self.token_class(attrs["refresh"], check_epoch=False)
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM, None)
+        if user_id:
+            user = User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            if not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise exceptions.AuthenticationFailed(
+                    self.error_messages["no_active_account"],
+                    "no_active_account",
+                )
+            if is_revoked(refresh, user.token_epoch):
+                raise TokenError(_("Token has been revoked"))
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class TokenVerifySerializer(BaseTokenVerifySerializer):
+    """Verify a token, checking the configured revocation store."""
+
+    def validate(self, attrs: dict[str, Any]) -> dict[Any, Any]:
+        """Validate the token and reject blacklisted ones."""
+        token = UntypedToken(attrs["token"])
+
+        if api_settings.BLACKLIST_AFTER_ROTATION and (
+            get_revocation_store().is_revoked(token.payload)
+        ):
+            raise serializers.ValidationError(_("Token is blacklisted"))
+        if is_revoked(token):
+            raise serializers.ValidationError(_("Token has been revoked"))
+
+        return {}
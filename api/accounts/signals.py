@@ -0,0 +1,35 @@
+"""Signal handlers for the accounts app."""
+
+from django.core.signals import setting_changed
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .blacklist import blacklist_filter
+from .metrics import metrics
+from .revocation import get_revocation_store
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def add_to_blacklist_filter(
+    sender, instance: BlacklistedToken, created: bool, **kwargs
+):
+    """Add newly blacklisted tokens to the in-memory blacklist filter."""
+    if created:
+        blacklist_filter.add(instance.token.jti)
+
+
+@receiver(setting_changed)
+def reload_revocation_store(sender, setting: str, **kwargs):
+    """Pick the revocation store again when its settings are overridden."""
+    if setting == "ACCOUNTS_REVOCATION_STORE":
+        get_revocation_store.cache_clear()
+
+
+@receiver(connection_created)
+def record_pool_stats(sender, connection, **kwargs):
+    """Export the pool's statistics each time a connection is checked out."""
+    pool = getattr(connection, "pool", None)
+    if pool is not None and metrics.enabled:
+        metrics.record_pool(connection.alias, pool.pop_stats())
@@ -0,0 +1,146 @@
+"""
+Cold-start probe run by the ``startup_report`` command.
+
+Run as ``python -m accounts.startup [--memory]`` in a fresh interpreter, it
+boots Django the way a worker does and prints a JSON report on stdout: the
+duration and resident memory of each boot phase, and the self and cumulative
+import time (or, with ``--memory``, retained Python heap) of every module.
+Only the standard library is imported before measuring starts.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from importlib.machinery import FileFinder
+
+
+def rss_kib() -> int:
+    """Return the resident set size of this process in KiB."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class ImportRecorder:
+    """
+    Measure every module loaded from a file, including ``import_module()``.
+
+    A wrapper on each file loader's ``exec_module`` records the elapsed time
+    or, while tracemalloc is tracing, the Python memory the module kept.
+    Self values exclude nested imports, as with ``python -X importtime``.
+    """
+
+    def __init__(self, memory: bool) -> None:
+        self.memory = memory
+        # name -> [self, cumulative]
+        self.modules: dict[str, list[float]] = {}
+        self._stack: list[list[float]] = []
+
+    def _now(self) -> float:
+        return (
+            tracemalloc.get_traced_memory()[0] if self.memory else time.perf_counter()
+        )
+
+    def install(self) -> None:
+        """Wrap the loaders created by the path finders from now on."""
+        recorder = self
+        find_spec = FileFinder.find_spec
+
+        def measured_find_spec(finder, fullname, target=None):
+            spec = find_spec(finder, fullname, target)
+            if spec is not None and spec.loader is not None:
+                recorder._wrap(spec.loader, fullname)
+            return spec
+
+        FileFinder.find_spec = measured_find_spec
+
+    def _wrap(self, loader, name: str) -> None:
+        exec_module = loader.exec_module
+
+        def measured_exec_module(module):
+            frame = [self._now(), 0.0]
+            self._stack.append(frame)
+            try:
+                exec_module(module)
+            finally:
+                self._stack.pop()
+                cumulative = self._now() - frame[0]
+                self.modules[name] = [cumulative - frame[1], cumulative]
+                if self._stack:
+                    self._stack[-1][1] += cumulative
+
+        loader.exec_module = measured_exec_module
+
+
+def boot() -> list[dict]:
+    """Boot Django phase by phase and return each phase's cost."""
+    phases = []
+    started = time.perf_counter()
+    phases.append({"name": "python", "seconds": 0.0, "rss_kib": rss_kib()})
+
+    def phase(name: str, step) -> None:
+        nonlocal started
+        step()
+        now = time.perf_counter()
+        phases.append({"name": name, "seconds": now - started, "rss_kib": rss_kib()})
+        started = now
+
+    def load_settings():
+        from django.conf import settings
+
+        settings.INSTALLED_APPS  # noqa: B018
+
+    def populate_apps():
+        import django
+
+        django.setup(set_prefix=False)
+
+    def load_middleware():
+        from django.core.handlers.wsgi import WSGIHandler
+
+        WSGIHandler()
+
+    def load_urls():
+        from django.urls import get_resolver
+
+        get_resolver().url_patterns  # noqa: B018
+
+    phase("settings", load_settings)
+    phase("apps", populate_apps)
+    phase("middleware", load_middleware)
+    phase("urls", load_urls)
+    return phases
+
+
+def main() -> None:
+    """Boot Django under the recorder and print the report."""
+    memory = "--memory" in sys.argv[1:]
+    if memory:
+        tracemalloc.start()
+    recorder = ImportRecorder(memory)
+    recorder.install()
+    phases = boot()
+
+    from django.apps import apps
+
+    json.dump(
+        {
+            "settings": os.environ.get("DJANGO_SETTINGS_MODULE", ""),
+            "phases": phases,
+            "modules": recorder.modules,
+            "apps": [config.name for config in apps.get_app_configs()],
+        },
+        sys.stdout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Tests for the user admin."""
+
+import pytest
+from django.test import Client
+from pytest_mock import MockerFixture
+
+from accounts.models import User
+from accounts.pagination import EstimatedCountPaginator
+
+
+@pytest.mark.django_db
+class TestUserChangelist:
+    """Tests for the admin user changelist."""
+
+    url = "/admin/accounts/user/"
+
+    @pytest.fixture
+    def admin_client(self, user: User) -> Client:
+        """Return a client logged in as a superuser."""
+        user.is_staff = user.is_superuser = True
+        user.save()
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def test_changelist_with_search_and_filters(self, admin_client: Client):
+        """Test the changelist renders with search and filters applied."""
+        User.objects.create_user(
+            email="staff@example.com", username="staff", password="x", is_staff=True
+        )
+        response = admin_client.get(self.url, {"q": "staff", "is_staff__exact": "1"})
+        assert response.status_code == 200
+        assert list(
+            response.context["cl"].result_list.values_list("email", flat=True)
+        ) == ["staff@example.com"]
+
+
+@pytest.mark.django_db
+class TestEstimatedCountPaginator:
+    """Tests for EstimatedCountPaginator."""
+
+    def test_exact_count_without_estimate(self, user: User):
+        """Test the exact count is used when no estimate is available."""
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 10)
+        assert paginator.estimate_count() is None
+        assert paginator.count == 1
+
+    def test_large_estimate_skips_count(self, mocker: MockerFixture, user: User):
+        """Test a large estimate is returned without counting rows."""
+        mocker.patch.object(
+            EstimatedCountPaginator, "estimate_count", return_value=2_000_000
+        )
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 100)
+        assert paginator.count == 2_000_000
+        assert paginator.num_pages == 20_000
+
+    def test_small_estimate_counts_exactly(self, mocker: MockerFixture, user: User):
+        """Test small estimates fall back to an exact count."""
+        mocker.patch.object(EstimatedCountPaginator, "estimate_count", return_value=5)
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 100)
+        assert paginator.count == 1
@@ -0,0 +1,274 @@
+"""Tests for cached JWT authentication."""
+
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.cache import (
+    LRUCache,
+    TokenEpochCache,
+    UserCache,
+    token_cache,
+    token_epochs,
+    user_cache,
+)
+from accounts.metrics import metrics
+from accounts.models import User
+from accounts.tokens import RefreshToken
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Tests for accounts.authentication.CachedJWTAuthentication."""
+
+    url = "/api/v1/auth/users/me/"
+
+    def _client(self, api_client: APIClient, user: User) -> APIClient:
+        token = AccessToken.for_user(user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return api_client
+
+    def test_second_request_skips_user_query(self, api_client: APIClient, user: User):
+        """Test the user row is only fetched once for repeated requests."""
+        client = self._client(api_client, user)
+        assert client.get(self.url).status_code == status.HTTP_200_OK
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["email"] == user.email
+        assert not any('"accounts_user"' in q["sql"] for q in queries)
+
+    def test_save_invalidates_cache(self, api_client: APIClient, user: User):
+        """Test saving the user evicts the cached row."""
+        client = self._client(api_client, user)
+        client.get(self.url)
+
+        user.full_name = "Renamed User"
+        user.save()
+
+        response = client.get(self.url)
+        assert response.data["full_name"] == "Renamed User"
+
+    def test_queryset_deactivation_invalidates_cache(
+        self, api_client: APIClient, user: User
+    ):
+        """Test deactivating through a queryset update rejects the next request."""
+        client = self._client(api_client, user)
+        client.get(self.url)
+
+        User.objects.filter(pk=user.pk).update(is_active=False)
+
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_invalidation_reaches_other_workers(self, user: User, monkeypatch):
+        """Test a worker drops its copy once another worker invalidates a user."""
+        other = UserCache()
+        monkeypatch.setattr(other, "sync_interval", 0)
+        assert other.get(user.pk) is None
+        other.set(user.pk, ("cached",))
+        assert other.get(user.pk) == ("cached",)
+
+        user_cache.invalidate(user.pk)
+        assert other.get(user.pk) is None
+
+    def test_queryset_delete_invalidates_cache(self, api_client: APIClient, user: User):
+        """Test deleting through a queryset rejects the next request."""
+        client = self._client(api_client, user)
+        client.get(self.url)
+
+        User.objects.filter(pk=user.pk).delete()
+
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_new_users_are_not_broadcast(self, django_capture_on_commit_callbacks):
+        """Test registering a user leaves no invalidation marker."""
+        with django_capture_on_commit_callbacks(execute=True):
+            user = User.objects.create_user(
+                email="new@example.com", username="new", password="x"
+            )
+        assert user_cache.broadcast.get(user_cache._marker_key(user.pk)) is None
+
+    def test_large_batches_bump_one_generation(
+        self, user: User, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        """Test a batch over MAX_MARKERS bumps the generation once."""
+        User.objects.create_user(email="b@example.com", username="b", password="x")
+        monkeypatch.setattr(user_cache, "max_markers", 1)
+        with django_capture_on_commit_callbacks(execute=True):
+            User.objects.update(full_name="Batch")
+
+        assert user_cache.broadcast.get(user_cache.generation_key) == 1
+        assert user_cache.broadcast.get(user_cache._marker_key(user.pk)) is None
+
+    def test_unknown_user_rejected(self, api_client: APIClient, user: User):
+        """Test a token for a deleted user is rejected."""
+        client = self._client(api_client, user)
+        user.delete()
+
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert user_cache.get(user.pk) is None
+
+
+@pytest.mark.django_db
+class TestTokenCache:
+    """Tests for accounts.cache.TokenCache."""
+
+    url = "/api/v1/auth/users/me/"
+
+    @pytest.fixture
+    def client(self, api_client: APIClient, user: User) -> APIClient:
+        """Return a client sending a fresh access token."""
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        return api_client
+
+    def test_repeated_token_is_validated_once(self, client: APIClient, mocker):
+        """Test only the first request with a token decodes and verifies it."""
+        validate = mocker.spy(JWTAuthentication, "get_validated_token")
+        assert client.get(self.url).status_code == status.HTTP_200_OK
+        assert client.get(self.url).status_code == status.HTTP_200_OK
+
+        assert validate.call_count == 1
+        key = ("auth_token_cache_lookups_total", (("result", "hit"),))
+        assert metrics.collect()[key] == 1
+        assert token_cache.local.hit_rate == 0.5
+
+    def test_cached_token_still_checks_user(self, client: APIClient, user: User):
+        """Test a cached token of a deactivated user is rejected."""
+        client.get(self.url)
+        User.objects.filter(pk=user.pk).update(is_active=False)
+
+        assert client.get(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoke_all_forces_validation(self, client: APIClient, mocker):
+        """Test bumping the epoch makes cached tokens validate again."""
+        validate = mocker.spy(JWTAuthentication, "get_validated_token")
+        client.get(self.url)
+        token_cache.revoke_all()
+        client.get(self.url)
+
+        assert validate.call_count == 2
+
+    def test_expired_tokens_are_not_cached(self, user: User):
+        """Test a token is never kept past its exp claim."""
+        token = AccessToken.for_user(user)
+        token["exp"] = 0
+        token_cache.set(b"raw", token, token_cache.epoch)
+        assert token_cache.get(b"raw") is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTokenEpoch:
+    """Tests for per-user token epochs."""
+
+    url = "/api/v1/auth/users/me/"
+
+    @pytest.fixture
+    def tokens(self, api_client: APIClient, user: User) -> RefreshToken:
+        """Authenticate api_client with a fresh token pair for user."""
+        refresh = RefreshToken.for_user(user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        return refresh
+
+    def test_password_change_revokes_tokens(
+        self, api_client: APIClient, user: User, tokens: RefreshToken
+    ):
+        """Test changing the password rejects earlier access and refresh tokens."""
+        assert api_client.get(self.url).status_code == status.HTTP_200_OK
+
+        user.set_password("NewPass456!")
+        user.save()
+
+        response = api_client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data["code"] == "token_revoked"
+        response = api_client.post(
+            "/api/v1/auth/jwt/refresh/", {"refresh": str(tokens)}, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoke_tokens_spares_new_tokens(
+        self, api_client: APIClient, user: User, tokens: RefreshToken
+    ):
+        """Test revoking rejects old tokens and accepts ones issued after it."""
+        User.objects.filter(pk=user.pk).revoke_tokens()
+        assert api_client.get(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+
+        user.refresh_from_db()
+        access = RefreshToken.for_user(user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        assert api_client.get(self.url).status_code == status.HTTP_200_OK
+
+    def test_only_revoking_writes_bump_the_epoch(self, user: User):
+        """Test deactivation bumps the epoch and an ordinary edit does not."""
+        user.full_name = "Renamed"
+        user.save()
+        assert user.token_epoch == 0
+
+        user = User.objects.get(pk=user.pk)
+        user.is_active = False
+        user.save()
+        assert User.objects.get(pk=user.pk).token_epoch == 1
+
+    def test_workers_see_bumps_without_queries(
+        self, api_client: APIClient, user: User, tokens: RefreshToken
+    ):
+        """Test another worker checks the published epoch from the cache."""
+        User.objects.filter(pk=user.pk).revoke_tokens()
+        # Caches the user row again, leaving only the epoch to check.
+        api_client.get(self.url)
+        token_epochs.local.clear()
+        # A stale row must not replace the published epoch.
+        token_epochs.fill(user.pk, 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert not queries.captured_queries
+
+    def test_hosts_with_separate_caches_reread_the_row(self, user: User, monkeypatch):
+        """Test a host whose cache missed a bump falls back to the row in time."""
+        here, there = TokenEpochCache(), TokenEpochCache()
+        monkeypatch.setattr(there, "alias", "default")
+        for host in (here, there):
+            monkeypatch.setattr(host, "shared_ttl", 0.05)
+            monkeypatch.setattr(host, "local", LRUCache(maxsize=8, ttl=0))
+        there.fill(user.pk, 0)
+
+        here.set(user.pk, 1)
+        assert there.get(user.pk) == 0
+        time.sleep(0.1)
+        assert there.get(user.pk) is None
+
+
+class TestLRUCache:
+    """Tests for accounts.cache.LRUCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted first."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expired_entries_are_misses(self):
+        """Test entries past their TTL are not returned."""
+        cache = LRUCache(maxsize=2, ttl=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert cache.misses == 1
@@ -0,0 +1,34 @@
+"""Tests for the benchmark command."""
+
+import pytest
+
+from accounts.management.commands.benchmark import compare, run_benchmarks
+
+
+@pytest.mark.django_db
+class TestBenchmark:
+    """Tests for accounts.management.commands.benchmark."""
+
+    def test_runs_every_scenario(self):
+        """Test a small run measures every endpoint."""
+        results = run_benchmarks(users=3, iterations=3, warmup=1, profile_iterations=2)
+        assert set(results) == {
+            "login",
+            "refresh",
+            "me",
+            "profile_update",
+            "logout",
+            "registration",
+        }
+        for metrics in results.values():
+            assert metrics["p50_ms"] <= metrics["p95_ms"] <= metrics["p99_ms"]
+        assert results["registration"]["queries"] >= 1
+
+    def test_compare_flags_regressions(self):
+        """Test query, latency and allocation regressions are reported."""
+        baseline = {"me": {"p95_ms": 10.0, "queries": 1, "alloc_kib": 40.0}}
+        ok = {"me": {"p95_ms": 14.0, "queries": 1, "alloc_kib": 45.0}}
+        worse = {"me": {"p95_ms": 16.0, "queries": 2, "alloc_kib": 60.0}}
+
+        assert compare(ok, baseline, 0.5, 0.25) == []
+        assert len(compare(worse, baseline, 0.5, 0.25)) == 3
@@ -0,0 +1,125 @@
+"""Tests for the Bloom-filter blacklist front."""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from accounts.blacklist import BloomFilter, blacklist_filter
+from accounts.models import User
+from accounts.tokens import RefreshToken
+from conftest import USER_PASSWORD
+
+
+class TestBloomFilter:
+    """Tests for accounts.blacklist.BloomFilter."""
+
+    def test_no_false_negatives(self):
+        """Test every added item is reported as present."""
+        bloom = BloomFilter(capacity=1000)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate_is_bounded(self):
+        """Test the observed false positive rate stays near the target."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+    def test_duplicates_are_not_counted(self):
+        """Test re-adding an item does not grow the count."""
+        bloom = BloomFilter(capacity=10)
+        bloom.add("jti")
+        bloom.add("jti")
+        assert bloom.count == 1
+
+
+@pytest.mark.django_db
+class TestBlacklistFilter:
+    """Tests for blacklist checks routed through the filter."""
+
+    refresh_url = "/api/v1/auth/jwt/refresh/"
+
+    def _refresh_token(self, api_client: APIClient, user: User) -> str:
+        response = api_client.post(
+            "/api/v1/auth/jwt/create/",
+            {"email": user.email, "password": USER_PASSWORD},
+            format="json",
+        )
+        return response.data["refresh"]
+
+    def test_negative_lookup_skips_blacklist_query(
+        self, api_client: APIClient, user: User
+    ):
+        """Test a token that was never blacklisted does not query the blacklist."""
+        token = RefreshToken(self._refresh_token(api_client, user))
+        blacklist_filter.might_contain("warm-up")
+
+        with CaptureQueriesContext(connection) as queries:
+            token.check_blacklist()
+        assert not any("token_blacklist_blacklistedtoken" in q["sql"] for q in queries)
+
+    def test_rotated_token_is_rejected(self, api_client: APIClient, user: User):
+        """Test a refresh token cannot be reused after rotation."""
+        refresh = self._refresh_token(api_client, user)
+        first = api_client.post(self.refresh_url, {"refresh": refresh}, format="json")
+        assert first.status_code == status.HTTP_200_OK
+
+        second = api_client.post(self.refresh_url, {"refresh": refresh}, format="json")
+        assert second.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_picks_up_writes_from_other_workers(
+        self, api_client: APIClient, user: User
+    ):
+        """Test rows written without this worker's signal are found after sync."""
+        refresh = self._refresh_token(api_client, user)
+        blacklist_filter.might_contain("warm-up")
+
+        outstanding = OutstandingToken.objects.get(jti=RefreshToken(refresh)["jti"])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=outstanding)])
+        blacklist_filter._bump_generation()
+
+        response = api_client.post(
+            self.refresh_url, {"refresh": refresh}, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_replay_rejected_while_filter_is_stale(
+        self, api_client: APIClient, user: User, mocker
+    ):
+        """Test a rotated token is rejected even if the filter missed its row."""
+        refresh = self._refresh_token(api_client, user)
+        mocker.patch.object(blacklist_filter, "might_contain", return_value=False)
+        first = api_client.post(self.refresh_url, {"refresh": refresh}, format="json")
+        assert first.status_code == status.HTTP_200_OK
+
+        second = api_client.post(self.refresh_url, {"refresh": refresh}, format="json")
+        assert second.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_rows_committed_out_of_order_are_caught_up(self, user: User):
+        """Test a row with an id below ones already seen is still picked up."""
+        tokens = [RefreshToken.for_user(user) for _ in range(3)]
+        outstanding = OutstandingToken.objects.filter(
+            jti__in=[token["jti"] for token in tokens]
+        )
+        first, late, last = sorted(outstanding, key=lambda row: row.pk)
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(id=1, token=first)])
+        blacklist_filter.might_contain("warm-up")
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(id=3, token=last)])
+        blacklist_filter._bump_generation()
+        assert blacklist_filter.might_contain(last.jti)
+
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(id=2, token=late)])
+        blacklist_filter._bump_generation()
+        with CaptureQueriesContext(connection) as queries:
+            assert blacklist_filter.might_contain(late.jti)
+        assert len(queries) == 1
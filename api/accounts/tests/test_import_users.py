@@ -0,0 +1,125 @@
+"""Tests for the import_users management command."""
+
+import json
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+
+from accounts.management.commands.import_users import Command
+from accounts.models import User
+
+
+@pytest.mark.django_db
+class TestImportUsers:
+    """Tests for manage.py import_users."""
+
+    def test_import_csv(self, tmp_path):
+        """Test users are created from CSV with hashed passwords."""
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,username,full_name,password,agreed_to_terms\n"
+            "a@example.com,alice,Alice A,SecretPass1!,true\n"
+            "b@example.com,bob,Bob B,SecretPass2!,false\n"
+        )
+        call_command("import_users", str(path), "--workers", "0")
+
+        alice = User.objects.get(email="a@example.com")
+        assert alice.full_name == "Alice A"
+        assert alice.check_password("SecretPass1!")
+        assert alice.agreed_at is not None
+        assert User.objects.get(email="b@example.com").agreed_at is None
+
+    def test_import_jsonl_with_prehashed_password(self, tmp_path):
+        """Test pre-hashed passwords are stored as given."""
+        path = tmp_path / "users.jsonl"
+        password_hash = make_password("Prehashed1!")
+        path.write_text(
+            json.dumps({"email": "c@example.com", "password_hash": password_hash})
+            + "\n"
+            + json.dumps({"email": "d@example.com", "password_hash": "plaintext"})
+            + "\n"
+        )
+        call_command("import_users", str(path), "--workers", "0")
+
+        user = User.objects.get(email="c@example.com")
+        assert user.password == password_hash
+        assert user.username == "c@example.com"
+        assert not User.objects.filter(email="d@example.com").exists()
+
+    def test_skips_existing_and_duplicate_rows(self, tmp_path, user: User):
+        """Test rows that clash with existing users or earlier rows are skipped."""
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,username,password\n"
+            f"{user.email},other,SecretPass1!\n"
+            "e@example.com,erin,SecretPass1!\n"
+            "e@example.com,erin2,SecretPass1!\n"
+        )
+        call_command("import_users", str(path), "--workers", "0")
+
+        assert User.objects.count() == 2
+        assert User.objects.get(email="e@example.com").username == "erin"
+
+    def test_skips_malformed_rows(self, tmp_path):
+        """Test unreadable lines and non-text fields skip their row only."""
+        path = tmp_path / "users.jsonl"
+        path.write_text(
+            '{"email": "broken@example.com"\n'
+            "[1, 2]\n"
+            + json.dumps({"email": 42})
+            + "\n"
+            + json.dumps({"email": "f@example.com", "agreed_at": "yesterday"})
+            + "\n"
+            + json.dumps({"email": "g@example.com", "password": "SecretPass1!"})
+            + "\n"
+        )
+        call_command("import_users", str(path), "--workers", "0")
+
+        assert list(User.objects.values_list("email", flat=True)) == ["g@example.com"]
+
+    def test_skips_invalid_fields(self, tmp_path):
+        """Test rows failing model validation are skipped, not the import."""
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,username,full_name,password\n"
+            "not-an-email,bad,Bad,SecretPass1!\n"
+            f"h@example.com,{'x' * 151},Long,SecretPass1!\n"
+            "i@example.com,ivy,Ivy,SecretPass1!\n"
+        )
+        call_command("import_users", str(path), "--workers", "0")
+
+        assert list(User.objects.values_list("email", flat=True)) == ["i@example.com"]
+
+    def test_chunk_racing_a_registration(self, tmp_path, mocker):
+        """Test a chunk hitting a new duplicate still imports its other rows."""
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,password\nj@example.com,SecretPass1!\nk@example.com,SecretPass1!\n"
+        )
+        build_users = Command.build_users
+
+        def register_meanwhile(self, rows, unsaved):
+            users = build_users(self, rows, unsaved)
+            User.objects.create_user(email="j@example.com", username="j", password="x")
+            return users
+
+        mocker.patch.object(Command, "build_users", register_meanwhile)
+        call_command("import_users", str(path), "--workers", "0")
+
+        assert User.objects.get(email="j@example.com").username == "j"
+        assert User.objects.filter(email="k@example.com").exists()
+
+    def test_hashes_in_process_pool_across_chunks(self, tmp_path):
+        """Test hashing in worker processes with several chunks."""
+        path = tmp_path / "users.csv"
+        lines = ["email,password"] + [
+            f"user{i}@example.com,Password{i}!" for i in range(25)
+        ]
+        # Duplicate of a row in the previous, not yet inserted chunk.
+        lines.insert(12, "user3@example.com,Other3!")
+        path.write_text("\n".join(lines) + "\n")
+        call_command("import_users", str(path), "--workers", "2", "--chunk-size", "10")
+
+        assert User.objects.count() == 25
+        assert User.objects.get(email="user7@example.com").check_password("Password7!")
@@ -0,0 +1,113 @@
+"""Tests for per-request instrumentation."""
+
+import json
+import logging
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.middleware import RequestMetricsMiddleware
+from accounts.models import User
+from conftest import USER_PASSWORD
+
+METRICS = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 1.0,
+    "SERVER_TIMING": True,
+    "SERVER_TIMING_IPS": ["127.0.0.1"],
+    "LOG": True,
+    "DUPLICATE_THRESHOLD": 3,
+}
+
+
+def server_timing(response) -> dict[str, str]:
+    """Parse a Server-Timing header into {name: params}."""
+    return {
+        entry.split(";", 1)[0].strip(): entry
+        for entry in response["Server-Timing"].split(",")
+    }
+
+
+@pytest.mark.django_db
+class TestRequestMetricsMiddleware:
+    """Tests for accounts.middleware.RequestMetricsMiddleware."""
+
+    @pytest.fixture(autouse=True)
+    def enable_metrics(self, settings):
+        """Turn request metrics on."""
+        settings.ACCOUNTS_REQUEST_METRICS = METRICS
+
+    def test_login_reports_db_and_hashing(self, user: User, caplog):
+        """Test login timings include queries and password hashing."""
+        with caplog.at_level(logging.INFO, logger="accounts.metrics"):
+            response = APIClient().post(
+                "/api/v1/auth/jwt/create/",
+                {"email": user.email, "password": USER_PASSWORD},
+                format="json",
+            )
+        assert response.status_code == status.HTTP_200_OK
+        timings = server_timing(response)
+        assert {"total", "db", "hash", "serializer"} <= set(timings)
+        assert "queries" in timings["db"]
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["path"] == "/api/v1/auth/jwt/create/"
+        assert record["queries"] >= 1
+        assert record["hash_ms"] > 0
+
+    def test_async_view_reports_serializer(self, user: User):
+        """Test async views are measured too."""
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.patch(
+            "/api/v1/auth/users/me/", {"full_name": "New"}, format="json"
+        )
+        assert "serializer" in server_timing(response)
+
+    def test_duplicate_queries_are_logged(self, user: User, caplog):
+        """Test repeated statements are reported as N+1 suspects."""
+
+        def view(request):
+            for _ in range(3):
+                User.objects.filter(pk=user.pk).exists()
+            return HttpResponse()
+
+        middleware = RequestMetricsMiddleware(view)
+        with caplog.at_level(logging.INFO, logger="accounts.metrics"):
+            response = middleware(RequestFactory().get("/"))
+        assert 'desc="3 queries"' in response["Server-Timing"]
+        warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+        assert json.loads(warnings[0].getMessage())["count"] == 3
+
+    def test_server_timing_only_for_staff_outside(self, user: User):
+        """Test outside clients get the header only when authenticated as staff."""
+        client = APIClient(REMOTE_ADDR="203.0.113.7")
+        client.force_authenticate(user=user)
+        assert "Server-Timing" not in client.get("/api/v1/auth/users/me/")
+        response = client.post(
+            "/api/v1/auth/jwt/create/",
+            {"email": user.email, "password": USER_PASSWORD},
+            format="json",
+        )
+        assert "Server-Timing" not in response
+
+        user.is_staff = True
+        user.save()
+        assert "Server-Timing" in client.get("/api/v1/auth/users/me/")
+
+    def test_unsampled_requests_are_untouched(self, settings):
+        """Test requests outside the sample get no header."""
+        settings.ACCOUNTS_REQUEST_METRICS = {**METRICS, "SAMPLE_RATE": 0}
+        middleware = RequestMetricsMiddleware(lambda request: HttpResponse())
+        response = middleware(RequestFactory().get("/"))
+        assert "Server-Timing" not in response
+
+    def test_disabled(self, settings):
+        """Test the middleware drops out of the stack when disabled."""
+        settings.ACCOUNTS_REQUEST_METRICS = {**METRICS, "ENABLED": False}
+        with pytest.raises(MiddlewareNotUsed):
+            RequestMetricsMiddleware(lambda request: HttpResponse())
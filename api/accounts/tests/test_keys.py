@@ -0,0 +1,155 @@
+"""Tests for asymmetric JWT signing keys and the JWKS endpoint."""
+
+import json
+
+import jwt
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APIClient
+from rest_framework_simplejwt import state
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.checks import check_signing_keys
+from accounts.keys import KeyRingTokenBackend, SigningKey, signing_keys
+from accounts.models import User
+
+WEEK = 7 * 24 * 3600
+
+
+@pytest.fixture
+def key_ring(monkeypatch, tmp_path):
+    """Sign tokens with EdDSA keys from an empty ring in tmp_path."""
+    monkeypatch.setattr(signing_keys, "algorithm", "EdDSA")
+    monkeypatch.setattr(signing_keys, "directory", tmp_path)
+    monkeypatch.setattr(signing_keys, "reload_interval", 0)
+    monkeypatch.setattr(state, "token_backend", KeyRingTokenBackend(signing_keys))
+    signing_keys.reset()
+    yield signing_keys
+    signing_keys.reset()
+
+
+def backdate(key: SigningKey, seconds: int) -> str:
+    """Move key's creation time seconds into the past and return its new kid."""
+    created, _, suffix = key.kid.partition("-")
+    kid = f"{int(created) - seconds}-{suffix}"
+    (signing_keys.directory / f"{key.kid}.pem").rename(
+        signing_keys.directory / f"{kid}.pem"
+    )
+    return kid
+
+
+@pytest.mark.django_db
+class TestSigningKeys:
+    """Tests for accounts.keys.SigningKeys."""
+
+    def test_tokens_verify_against_the_jwks(self, key_ring, user: User):
+        """Test a verifier holding only the JWKS accepts our access tokens."""
+        kid = key_ring.rotate().kid
+        token = str(AccessToken.for_user(user))
+
+        assert jwt.get_unverified_header(token)["kid"] == kid
+        jwks = jwt.PyJWKSet.from_json(key_ring.jwks()[0].decode())
+        payload = jwt.decode(token, jwks[kid].key, algorithms=["EdDSA"])
+        assert payload["user_id"] == str(user.pk)
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert client.get("/api/v1/auth/users/me/").status_code == 200
+
+    def test_new_key_is_published_before_it_signs(self, key_ring, user: User):
+        """Test rotation keeps signing with the old key until the new one is known."""
+        old = backdate(key_ring.rotate(), 2 * key_ring.publish_delay)
+        token = str(AccessToken.for_user(user))
+        new = key_ring.rotate().kid
+
+        published = json.loads(key_ring.jwks()[0])["keys"]
+        assert [key["kid"] for key in published] == [old, new]
+        assert key_ring.signing_key().kid == old
+        AccessToken(token)
+
+        new = backdate(key_ring.get(new), key_ring.publish_delay)
+        assert key_ring.signing_key().kid == new
+        AccessToken(token)
+
+    def test_prune_keeps_keys_with_live_tokens(self, key_ring):
+        """Test only keys retired longer than a token lifetime are deleted."""
+        expired = backdate(key_ring.rotate(), 3 * WEEK)
+        retired = backdate(key_ring.rotate(), 2 * WEEK)
+        signing = backdate(key_ring.rotate(), WEEK // 2)
+
+        assert key_ring.prune() == [expired]
+        assert [key.kid for key in key_ring.keys()] == [retired, signing]
+
+    def test_unknown_kid_is_rejected(self, key_ring, user: User):
+        """Test tokens signed by a key outside the ring are invalid."""
+        key_ring.rotate()
+        forged = jwt.encode(
+            {"token_type": "access", "user_id": str(user.pk)},
+            key_ring.rotate().private_key,
+            algorithm="EdDSA",
+            headers={"kid": "0-unknown"},
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {forged}")
+        assert client.get("/api/v1/auth/users/me/").status_code == 401
+
+    def test_removed_key_revokes_cached_tokens(self, key_ring, user: User):
+        """Test deleting a key rejects its tokens even after they were cached."""
+        key_ring.rotate()
+        key_ring.rotate()
+        token = str(AccessToken.for_user(user))
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert client.get("/api/v1/auth/users/me/").status_code == 200
+
+        kid = jwt.get_unverified_header(token)["kid"]
+        (key_ring.directory / f"{kid}.pem").unlink()
+        assert client.get("/api/v1/auth/users/me/").status_code == 401
+
+    def test_check_requires_a_key(self, key_ring):
+        """Test the system check flags an empty ring."""
+        assert [error.id for error in check_signing_keys(None)] == ["accounts.E002"]
+        key_ring.rotate()
+        assert check_signing_keys(None) == []
+
+    def test_rotate_command(self, key_ring, capsys):
+        """Test the command adds a key and lists the ring."""
+        call_command("rotate_signing_key")
+        kid = key_ring.keys()[0].kid
+        assert f"{kid}  signing" in capsys.readouterr().out
+
+        call_command("rotate_signing_key", "--list")
+        assert len(key_ring.keys()) == 1
+
+    def test_rotate_command_needs_asymmetric_algorithm(self):
+        """Test the command refuses to run with HMAC signing."""
+        with pytest.raises(CommandError):
+            call_command("rotate_signing_key")
+
+
+@pytest.mark.django_db
+class TestJWKSView:
+    """Tests for GET /.well-known/jwks.json."""
+
+    url = "/.well-known/jwks.json"
+
+    def test_serves_cacheable_public_keys(self, key_ring, api_client: APIClient):
+        """Test the JWKS is public, long-lived and revalidates with its ETag."""
+        kid = key_ring.rotate().kid
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        assert [key["kid"] for key in response.json()["keys"]] == [kid]
+        assert "d" not in response.json()["keys"][0]
+        assert "public" in response["Cache-Control"]
+        assert f"max-age={key_ring.max_age}" in response["Cache-Control"]
+        assert "Set-Cookie" not in response.headers
+
+        response = api_client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == 304
+        assert api_client.get(self.url, HTTP_IF_NONE_MATCH="*").status_code == 304
+
+    def test_not_found_with_hmac_signing(self, api_client: APIClient):
+        """Test there is no JWKS while tokens are signed with SECRET_KEY."""
+        assert api_client.get(self.url).status_code == 404
@@ -0,0 +1,93 @@
+"""Tests for the pre-hash login guard."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.test import RequestFactory
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.guard import login_guard
+from accounts.models import User
+from conftest import USER_PASSWORD
+
+
+@pytest.mark.django_db
+class TestLoginGuard:
+    """Tests for guarded POST /api/v1/auth/jwt/create/."""
+
+    url = "/api/v1/auth/jwt/create/"
+
+    def _fail(self, api_client: APIClient, email: str, times: int) -> None:
+        for _ in range(times):
+            response = api_client.post(
+                self.url, {"email": email, "password": "wrong"}, format="json"
+            )
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_account_locked_before_hashing(
+        self, api_client: APIClient, user: User, mocker
+    ):
+        """Test an account over the threshold is rejected without checking the hash."""
+        self._fail(api_client, user.email, login_guard.account_threshold)
+        check_password = mocker.patch("accounts.models.User.check_password")
+
+        response = api_client.post(
+            self.url, {"email": user.email, "password": USER_PASSWORD}, format="json"
+        )
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response["Retry-After"]) >= 1
+        check_password.assert_not_called()
+
+    def test_account_key_ignores_case(self, api_client: APIClient, user: User):
+        """Test failures count against the account regardless of email case."""
+        self._fail(api_client, user.email.upper(), login_guard.account_threshold)
+        response = api_client.post(
+            self.url, {"email": user.email, "password": USER_PASSWORD}, format="json"
+        )
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_success_resets_account_score(self, api_client: APIClient, user: User):
+        """Test a successful login clears earlier failures for the account."""
+        self._fail(api_client, user.email, login_guard.account_threshold - 1)
+        response = api_client.post(
+            self.url, {"email": user.email, "password": USER_PASSWORD}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        self._fail(api_client, user.email, login_guard.account_threshold - 1)
+
+    def test_failures_decay(self, api_client: APIClient, user: User, mocker):
+        """Test the lockout lifts once the score has decayed."""
+        self._fail(api_client, user.email, login_guard.account_threshold)
+        later = mocker.patch("accounts.guard.time.time")
+        later.return_value = 10**10
+
+        response = api_client.post(
+            self.url, {"email": user.email, "password": USER_PASSWORD}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_ip_threshold_spans_accounts(self, api_client: APIClient, user: User):
+        """Test one IP spraying many accounts is blocked for every account."""
+        for i in range(login_guard.ip_threshold):
+            self._fail(api_client, f"victim{i}@example.com", 1)
+
+        response = api_client.post(
+            self.url, {"email": user.email, "password": USER_PASSWORD}, format="json"
+        )
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_concurrent_failures_are_all_counted(self, rf: RequestFactory):
+        """Test failures recorded in parallel threads are not lost."""
+        request = rf.post(self.url)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for _ in range(200):
+                pool.submit(login_guard.record_failure, request, "victim@example.com")
+
+        (account_key, _), _ = login_guard.keys(request, "victim@example.com")
+        counters = login_guard.cache.get_many(
+            [key for key, _ in login_guard.slot_keys(account_key, time.time())]
+        )
+        assert sum(counters.values()) == 200
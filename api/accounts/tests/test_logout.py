@@ -1,10 +1,14 @@
-"""Tests for logout endpoint."""
+"""Tests for logout endpoints."""
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 
 from accounts.models import User
+from accounts.tokens import RefreshToken
 from conftest import USER_PASSWORD
 
 
@@ -75,3 +79,113 @@ class TestLogoutView:
             format="json",
         )
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLogoutAllView:
+    """Tests for POST /api/v1/auth/logout/all/ endpoint."""
+
+    url = "/api/v1/auth/logout/all/"
+    login_url = "/api/v1/auth/jwt/create/"
+    refresh_url = "/api/v1/auth/jwt/refresh/"
+
+    def login(self, api_client: APIClient, user: User) -> dict:
+        """Log user in and return the token pair."""
+        response = api_client.post(
+            self.login_url,
+            {"email": user.email, "password": USER_PASSWORD},
+            format="json",
+        )
+        return response.data
+
+    def test_ends_every_session(self, api_client: APIClient, user: User):
+        """Test all refresh tokens are blacklisted with one INSERT."""
+        sessions = [self.login(api_client, user) for _ in range(3)]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {sessions[0]['access']}")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["blacklisted"] == 3
+        inserts = [
+            q
+            for q in queries
+            if q["sql"].startswith("INSERT") and "blacklist" in q["sql"]
+        ]
+        assert len(inserts) == 1
+
+        for session in sessions:
+            response = api_client.post(
+                self.refresh_url, {"refresh": session["refresh"]}, format="json"
+            )
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert api_client.post(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_requires_authentication(self, api_client: APIClient):
+        """Test anonymous requests are rejected."""
+        assert api_client.post(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRevokeSessionsView:
+    """Tests for POST /api/v1/auth/logout/users/ endpoint."""
+
+    url = "/api/v1/auth/logout/users/"
+
+    def test_revokes_many_users(self, staff_client: APIClient, user: User):
+        """Test staff end the sessions of users given by id and email."""
+        users = [
+            User.objects.create_user(
+                email=f"leaked{n}@example.com", username=f"leaked{n}", password="x"
+            )
+            for n in range(3)
+        ]
+        for target in [*users, user]:
+            RefreshToken.for_user(target)
+
+        response = staff_client.post(
+            self.url,
+            {
+                "ids": [str(users[0].pk)],
+                "emails": [users[1].email, users[2].email, "nobody@example.com"],
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "users": 3,
+            "blacklisted": 3,
+            "not_found": ["nobody@example.com"],
+        }
+        revoked = BlacklistedToken.objects.values_list("token__user", flat=True)
+        assert set(revoked) == {target.pk for target in users}
+        assert User.objects.get(pk=user.pk).token_epoch == 0
+
+    def test_user_matched_by_id_and_email(self, staff_client: APIClient):
+        """Test a user named twice, with the email in another case, is found once."""
+        target = User.objects.create_user(
+            email="leaked@example.com", username="leaked", password="x"
+        )
+        response = staff_client.post(
+            self.url,
+            {
+                "ids": [str(target.pk), "00000000-0000-0000-0000-000000000000"],
+                "emails": ["Leaked@Example.com"],
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["users"] == 1
+        assert response.data["not_found"] == ["00000000-0000-0000-0000-000000000000"]
+
+    def test_requires_users(self, staff_client: APIClient):
+        """Test an empty request is rejected."""
+        response = staff_client.post(self.url, {}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_staff_only(self, authenticated_client: APIClient, user: User):
+        """Test regular users cannot end other users' sessions."""
+        response = authenticated_client.post(
+            self.url, {"ids": [str(user.pk)]}, format="json"
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
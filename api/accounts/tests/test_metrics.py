@@ -0,0 +1,125 @@
+"""Tests for Prometheus metrics."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.metrics import metrics
+from accounts.models import User
+from accounts.signals import record_pool_stats
+from conftest import USER_PASSWORD
+
+TOKEN = "scrape-token"
+
+
+@pytest.fixture
+def scraper(settings) -> APIClient:
+    """Return a client presenting the metrics token."""
+    settings.ACCOUNTS_METRICS = {**settings.ACCOUNTS_METRICS, "TOKEN": TOKEN}
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {TOKEN}")
+    return client
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    url = "/metrics"
+
+    def test_requires_token(self, scraper: APIClient):
+        """Test scrapes without the token are rejected."""
+        response = APIClient().get(self.url, HTTP_AUTHORIZATION="Bearer wrong")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_disabled_without_token(self, api_client: APIClient):
+        """Test the endpoint does not exist until a token is configured."""
+        assert api_client.get(self.url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_login_metrics(self, scraper: APIClient, user: User):
+        """Test logins are counted per outcome and per URL name."""
+        client = APIClient()
+        url = "/api/v1/auth/jwt/create/"
+        client.post(url, {"email": user.email, "password": USER_PASSWORD})
+        client.post(url, {"email": user.email, "password": "wrong"})
+
+        body = scraper.get(self.url).content.decode()
+        assert 'auth_logins_total{outcome="success"} 1' in body
+        assert 'auth_logins_total{outcome="failure"} 1' in body
+        assert (
+            'auth_http_requests_total{method="POST",status="200",view="jwt-create"} 1'
+            in body
+        )
+        assert 'auth_http_request_duration_seconds_count{view="jwt-create"} 2' in body
+        assert (
+            'auth_http_request_duration_seconds_bucket{view="jwt-create",le="+Inf"} 2'
+            in body
+        )
+
+
+class TestMetricsRegistry:
+    """Tests for accounts.metrics.MetricsRegistry."""
+
+    def test_sums_worker_files(self):
+        """Test values flushed by other workers are added to this one's."""
+        metrics.inc("auth_blacklist_hits_total")
+        metrics.directory.mkdir(parents=True, exist_ok=True)
+        other = [["auth_blacklist_hits_total", [], 2]]
+        (metrics.directory / "999999.json").write_text(json.dumps(other))
+
+        assert metrics.collect()[("auth_blacklist_hits_total", ())] == 3
+
+    def test_reused_pid_continues_counting(self):
+        """Test a worker reusing a pid starts from that pid's file."""
+        metrics.inc("auth_throttled_total", scope="auth")
+        metrics.flush()
+        metrics.reset()
+        metrics.inc("auth_throttled_total", scope="auth")
+
+        key = ("auth_throttled_total", (("scope", "auth"),))
+        assert metrics.collect()[key] == 2
+
+    def test_pool_stats(self):
+        """Test pool counters accumulate and gauges keep the latest value."""
+        stats = [
+            {"pool_size": 4, "pool_available": 1, "pool_max": 10, "requests_num": 3},
+            {
+                "pool_size": 5,
+                "pool_available": 0,
+                "pool_max": 10,
+                "requests_waiting": 2,
+                "requests_num": 2,
+                "requests_queued": 1,
+                "requests_wait_ms": 250,
+            },
+        ]
+        pool = SimpleNamespace(pop_stats=lambda: stats.pop(0))
+        connection = SimpleNamespace(alias="default", pool=pool)
+        record_pool_stats(sender=None, connection=connection)
+        record_pool_stats(sender=None, connection=connection)
+
+        body = metrics.render()
+        assert 'auth_db_pool_requests_total{database="default"} 5' in body
+        assert 'auth_db_pool_queued_total{database="default"} 1' in body
+        assert 'auth_db_pool_wait_seconds_total{database="default"} 0.25' in body
+        assert 'auth_db_pool_size{database="default"} 5' in body
+        assert 'auth_db_pool_available{database="default"} 0' in body
+        assert 'auth_db_pool_waiting{database="default"} 2' in body
+        assert "# TYPE auth_db_pool_size gauge" in body
+
+    def test_gauges_of_dead_workers_are_dropped(self):
+        """Test only live workers contribute gauges, while counters persist."""
+        metrics.set("auth_db_pool_size", 3, database="default")
+        metrics.directory.mkdir(parents=True, exist_ok=True)
+        dead = [
+            ["auth_db_pool_size", [["database", "default"]], 7],
+            ["auth_blacklist_hits_total", [], 2],
+        ]
+        (metrics.directory / "999999999.json").write_text(json.dumps(dead))
+
+        collected = metrics.collect()
+        assert collected[("auth_db_pool_size", (("database", "default"),))] == 3
+        assert collected[("auth_blacklist_hits_total", ())] == 2
@@ -0,0 +1,100 @@
+"""Tests for the email outbox."""
+
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import OutboxEmail, User
+
+
+@pytest.mark.django_db
+class TestOutboxQueueing:
+    """Tests for queueing authentication emails."""
+
+    def test_registration_queues_email(self, api_client: APIClient, user_data: dict):
+        """Test registration stores the confirmation email instead of sending it."""
+        response = api_client.post("/api/v1/auth/users/", user_data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(mail.outbox) == 0
+
+        email = OutboxEmail.objects.get()
+        assert email.to == [user_data["email"]]
+        assert email.status == OutboxEmail.Status.PENDING
+        assert email.html_body
+
+    def test_password_reset_queues_email(self, api_client: APIClient, user: User):
+        """Test password reset requests are queued."""
+        response = api_client.post(
+            "/api/v1/auth/users/reset_password/",
+            {"email": user.email},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert OutboxEmail.objects.filter(to=[user.email]).exists()
+
+    @override_settings(
+        EMAIL_OUTBOX={"ENABLED": False},
+    )
+    def test_disabled_outbox_sends_inline(self, api_client: APIClient, user: User):
+        """Test emails are sent directly when the outbox is disabled."""
+        api_client.post(
+            "/api/v1/auth/users/reset_password/",
+            {"email": user.email},
+            format="json",
+        )
+        assert len(mail.outbox) == 1
+        assert not OutboxEmail.objects.exists()
+
+
+@pytest.mark.django_db
+class TestProcessEmailOutbox:
+    """Tests for the process_email_outbox command."""
+
+    def _queue(self, **kwargs) -> OutboxEmail:
+        defaults = {
+            "subject": "Hello",
+            "body": "Text body",
+            "html_body": "<p>HTML body</p>",
+            "from_email": "noreply@example.com",
+            "to": ["someone@example.com"],
+        }
+        return OutboxEmail.objects.create(**{**defaults, **kwargs})
+
+    def test_delivers_pending_emails(self):
+        """Test pending emails are sent and marked as sent."""
+        email = self._queue()
+        call_command("process_email_outbox", "--once")
+
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.SENT
+        assert email.sent_at is not None
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].alternatives[0].content == "<p>HTML body</p>"
+
+    def test_failed_delivery_is_retried_with_backoff(self, mocker):
+        """Test a failed send is rescheduled, then marked failed."""
+        mocker.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=SMTPException("relay down"),
+        )
+        email = self._queue()
+        original_next_attempt = email.next_attempt_at
+
+        call_command("process_email_outbox", "--once")
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt_at > original_next_attempt
+        assert "relay down" in email.last_error
+
+        OutboxEmail.objects.filter(pk=email.pk).update(
+            attempts=4, next_attempt_at=original_next_attempt
+        )
+        call_command("process_email_outbox", "--once")
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.FAILED
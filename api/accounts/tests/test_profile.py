@@ -1,10 +1,13 @@
 """Tests for user profile endpoints."""
 
 import pytest
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
 from accounts.models import User
+from conftest import USER_PASSWORD
 
 
 @pytest.mark.django_db
@@ -183,3 +186,90 @@ class TestSetPassword:
             format="json",
         )
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestDeleteCurrentUser:
+    """Tests for DELETE /api/v1/auth/users/me/ endpoint."""
+
+    url = "/api/v1/auth/users/me/"
+
+    def test_delete_with_current_password(
+        self, authenticated_client: APIClient, user: User
+    ):
+        """Test deleting the current user with the right password."""
+        response = authenticated_client.delete(
+            self.url, {"current_password": USER_PASSWORD}, format="json"
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not User.objects.filter(pk=user.pk).exists()
+
+    def test_delete_with_wrong_password(
+        self, authenticated_client: APIClient, user: User
+    ):
+        """Test deleting the current user fails with a wrong password."""
+        response = authenticated_client.delete(
+            self.url, {"current_password": "wrong"}, format="json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "current_password" in response.data
+        assert User.objects.filter(pk=user.pk).exists()
+
+
+@pytest.mark.django_db
+class TestCurrentUserETag:
+    """Tests for conditional GET on /api/v1/auth/users/me/."""
+
+    url = "/api/v1/auth/users/me/"
+
+    @pytest.fixture
+    def jwt_client(self, api_client: APIClient, user: User) -> APIClient:
+        """Return a client authenticated through the cached JWT path."""
+        token = AccessToken.for_user(user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return api_client
+
+    def test_not_modified_without_queries(
+        self, jwt_client: APIClient, django_assert_num_queries
+    ):
+        """Test a matching If-None-Match returns 304 without queries."""
+        etag = jwt_client.get(self.url)["ETag"]
+
+        with django_assert_num_queries(0):
+            response = jwt_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_not_modified_for_any_or_weak_etag(self, jwt_client: APIClient):
+        """Test If-None-Match "*" and a weak form of the ETag both match."""
+        etag = jwt_client.get(self.url)["ETag"]
+
+        for header in ("*", f"W/{etag}", f'"other", {etag}'):
+            response = jwt_client.get(self.url, HTTP_IF_NONE_MATCH=header)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_etag_changes_after_update(self, jwt_client: APIClient):
+        """Test updating the user invalidates the previous ETag."""
+        etag = jwt_client.get(self.url)["ETag"]
+        patched = jwt_client.patch(self.url, {"full_name": "New Name"}, format="json")
+        assert patched["ETag"] != etag
+
+        response = jwt_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] == patched["ETag"]
+
+    def test_etag_changes_after_bulk_update(self, jwt_client: APIClient, user: User):
+        """Test queryset updates also bump the version."""
+        etag = jwt_client.get(self.url)["ETag"]
+        User.objects.filter(pk=user.pk).update(full_name="Bulk")
+
+        response = jwt_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["full_name"] == "Bulk"
+
+    def test_uncached_update_keeps_version(self, user: User, django_assert_num_queries):
+        """Test updating only uncached fields is a single UPDATE."""
+        with django_assert_num_queries(1):
+            User.objects.filter(pk=user.pk).update(last_login=timezone.now())
+        assert User.objects.get(pk=user.pk).version == user.version
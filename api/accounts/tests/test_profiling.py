@@ -0,0 +1,83 @@
+"""Tests for the sampling profiler."""
+
+import time
+
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import ProfilerConfig, User
+from accounts.profiling import profiler
+from accounts.tokens import AccessToken
+
+
+def busy_loop(seconds: float) -> None:
+    """Spin on the CPU for seconds."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestSamplingProfiler:
+    """Tests for accounts.profiling.SamplingProfiler."""
+
+    def test_kept_samples_are_written_as_folded_stacks(self):
+        """Test samples are rooted at the label and flushed to a file."""
+        token = profiler.begin("user-me")
+        busy_loop(0.1)
+        assert profiler.end(token) > 0
+
+        lines = profiler.flush().read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert stack.startswith("user-me;")
+        assert int(count) >= 1
+        assert any("busy_loop" in line for line in lines)
+
+    def test_discarded_samples_are_dropped(self):
+        """Test samples of requests that are not kept are discarded."""
+        token = profiler.begin("user-me")
+        busy_loop(0.05)
+        profiler.end(token, keep=False)
+        assert not profiler.stacks
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    """Tests for accounts.middleware.ProfilingMiddleware."""
+
+    url = "/api/v1/auth/users/me/"
+
+    def test_admin_switch_selects_url_name(self, authenticated_client: APIClient):
+        """Test the admin switch profiles only the chosen routes."""
+        ProfilerConfig.objects.create(enabled=True, url_names="user-me")
+
+        assert "X-Profile-Samples" in authenticated_client.get(self.url)
+        response = authenticated_client.post("/api/v1/auth/jwt/verify/", {})
+        assert "X-Profile-Samples" not in response
+
+    def test_switch_off(self, authenticated_client: APIClient):
+        """Test nothing is profiled while the switch is off."""
+        ProfilerConfig.objects.create(enabled=False)
+        assert "X-Profile-Samples" not in authenticated_client.get(self.url)
+
+    def test_header_requires_staff(self, api_client: APIClient, user: User):
+        """Test the header profiles requests with a staff access token only."""
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        response = api_client.get(self.url, HTTP_X_PROFILE="1")
+        assert "X-Profile-Samples" not in response
+
+        user.is_staff = True
+        user.save()
+        response = api_client.get(self.url, HTTP_X_PROFILE="1")
+        assert "X-Profile-Samples" in response
+
+    def test_header_ignored_before_authentication(self, api_client: APIClient, mocker):
+        """Test anonymous and invalid-token requests never start sampling."""
+        begin = mocker.spy(profiler, "begin")
+        api_client.get(self.url, HTTP_X_PROFILE="1")
+        api_client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        api_client.get(self.url, HTTP_X_PROFILE="1")
+
+        assert begin.call_count == 0
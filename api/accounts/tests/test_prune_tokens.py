@@ -0,0 +1,76 @@
+"""Tests for the prune_tokens management command."""
+
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from accounts.management.commands.prune_tokens import CHECKPOINT_KEY
+from accounts.models import User
+
+
+def make_tokens(
+    user: User, count: int, expires_in: timedelta
+) -> list[OutstandingToken]:
+    """Create outstanding tokens expiring relative to now."""
+    now = timezone.now()
+    return OutstandingToken.objects.bulk_create(
+        OutstandingToken(
+            user=user,
+            jti=uuid4().hex,
+            token="token",
+            created_at=now,
+            expires_at=now + expires_in,
+        )
+        for _ in range(count)
+    )
+
+
+@pytest.mark.django_db
+class TestPruneTokens:
+    """Tests for manage.py prune_tokens."""
+
+    def test_removes_expired_tokens_and_blacklist_rows(self, user: User):
+        """Test expired tokens and their blacklist entries are deleted."""
+        expired = make_tokens(user, 12, timedelta(days=-1))
+        make_tokens(user, 3, timedelta(days=1))
+        BlacklistedToken.objects.bulk_create(
+            BlacklistedToken(token=token) for token in expired[:5]
+        )
+
+        call_command("prune_tokens", "--batch-size", "5")
+
+        assert OutstandingToken.objects.count() == 3
+        assert not BlacklistedToken.objects.exists()
+        assert caches["shared"].get(CHECKPOINT_KEY) is None
+
+    def test_stops_at_unexpired_window(self, user: User):
+        """Test the walk stops at the first window without expired rows."""
+        make_tokens(user, 5, timedelta(days=-1))
+        make_tokens(user, 5, timedelta(days=1))
+        make_tokens(user, 5, timedelta(days=-1))
+
+        call_command("prune_tokens", "--batch-size", "5")
+        assert OutstandingToken.objects.count() == 10
+
+        call_command("prune_tokens", "--batch-size", "5", "--full-scan")
+        assert OutstandingToken.objects.count() == 5
+
+    def test_resumes_from_checkpoint(self, user: User):
+        """Test a run that exhausts its budget resumes where it stopped."""
+        make_tokens(user, 10, timedelta(days=-1))
+
+        call_command("prune_tokens", "--batch-size", "4", "--max-runtime", "0")
+        assert OutstandingToken.objects.count() == 6
+        assert caches["shared"].get(CHECKPOINT_KEY) is not None
+
+        call_command("prune_tokens", "--batch-size", "4")
+        assert not OutstandingToken.objects.exists()
+        assert caches["shared"].get(CHECKPOINT_KEY) is None
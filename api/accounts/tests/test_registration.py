@@ -1,10 +1,11 @@
 """Tests for user registration endpoint."""
 
 import pytest
+from djoser.conf import settings as djoser_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from accounts.models import User
+from accounts.models import OutboxEmail, User
 
 
 @pytest.mark.django_db
@@ -105,3 +106,77 @@ class TestUserRegistration:
 
         user = User.objects.get(email=user_data["email"])
         assert user.full_name == "John Doe"
+
+
+@pytest.mark.django_db
+class TestBulkRegistration:
+    """Tests for POST /api/v1/auth/users/bulk/ endpoint."""
+
+    url = "/api/v1/auth/users/bulk/"
+
+    def row(self, n: int, **overrides) -> dict:
+        """Return registration data for the n-th partner user."""
+        return {
+            "email": f"partner{n}@example.com",
+            "username": f"partner{n}",
+            "password": "SecurePass123!",
+            "re_password": "SecurePass123!",
+            "full_name": f" Partner {n} ",
+            "agreed_to_terms": True,
+            **overrides,
+        }
+
+    def test_requires_staff(self, authenticated_client: APIClient):
+        """Test non-staff users cannot provision accounts."""
+        response = authenticated_client.post(
+            self.url, {"users": [self.row(1)]}, format="json"
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_creates_users_and_queues_emails(
+        self, staff_client: APIClient, django_assert_max_num_queries
+    ):
+        """Test a batch is inserted in one statement with one outbox write."""
+        rows = [self.row(n) for n in range(5)]
+        # Uniqueness, user insert and outbox insert, whatever the batch size.
+        with django_assert_max_num_queries(9):
+            response = staff_client.post(self.url, {"users": rows}, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["created"] == 5
+        users = User.objects.filter(email__startswith="partner")
+        assert users.count() == 5
+        active = not djoser_settings.SEND_ACTIVATION_EMAIL
+        assert all(
+            u.is_active is active and u.full_name == u.full_name.strip() for u in users
+        )
+        assert all(u.agreed_at is not None and u.has_usable_password() for u in users)
+        assert OutboxEmail.objects.count() == 5
+        assert OutboxEmail.objects.first().to[0].startswith("partner")
+
+    def test_reports_invalid_rows(self, staff_client: APIClient, user: User):
+        """Test rows failing registration rules are reported per row."""
+        rows = [
+            self.row(1),
+            self.row(2, re_password="Mismatch123!"),
+            self.row(3, email=user.email),
+            self.row(4, username="partner1"),
+            self.row(5, agreed_to_terms=False),
+        ]
+        response = staff_client.post(self.url, {"users": rows}, format="json")
+
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        results = response.data["results"]
+        assert [r["status"] for r in results] == ["created"] + ["invalid"] * 4
+        assert "non_field_errors" in results[1]["errors"]
+        assert "email" in results[2]["errors"]
+        assert "username" in results[3]["errors"]
+        assert "agreed_to_terms" in results[4]["errors"]
+        assert User.objects.filter(email__startswith="partner").count() == 1
+
+    def test_rejects_oversized_batches(self, staff_client: APIClient, settings):
+        """Test batches above the configured maximum are rejected."""
+        settings.ACCOUNTS_PROVISIONING = {"MAX_BATCH_SIZE": 2}
+        rows = [self.row(n) for n in range(3)]
+        response = staff_client.post(self.url, {"users": rows}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
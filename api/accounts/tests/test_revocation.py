@@ -0,0 +1,122 @@
+"""Tests for the refresh token revocation stores."""
+
+import time
+from uuid import uuid4
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from accounts.models import RevokedToken, User
+from accounts.revocation import CompactTokenStore, get_revocation_store
+from accounts.tokens import RefreshToken
+from conftest import USER_PASSWORD
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def compact_store(settings) -> CompactTokenStore:
+    """Keep revoked tokens in the compact store."""
+    settings.ACCOUNTS_REVOCATION_STORE = {"BACKEND": "compact", "BUCKET_SECONDS": DAY}
+    return get_revocation_store()
+
+
+@pytest.mark.django_db
+class TestCompactTokenStore:
+    """Tests for accounts.revocation.CompactTokenStore."""
+
+    login_url = "/api/v1/auth/jwt/create/"
+    refresh_url = "/api/v1/auth/jwt/refresh/"
+    logout_url = "/api/v1/auth/logout/"
+
+    def login(self, api_client: APIClient, user: User) -> dict:
+        """Log user in and return the token pair."""
+        response = api_client.post(
+            self.login_url,
+            {"email": user.email, "password": USER_PASSWORD},
+            format="json",
+        )
+        return response.data
+
+    def test_logout_stores_only_the_revoked_token(
+        self, compact_store, api_client: APIClient, user: User
+    ):
+        """Test issuing writes nothing and logout writes one hashed row."""
+        tokens = self.login(api_client, user)
+        assert not OutstandingToken.objects.exists()
+
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = api_client.post(
+            self.logout_url, {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        refresh = RefreshToken(tokens["refresh"], verify=False)
+        row = RevokedToken.objects.get()
+        assert row.jti_hash == compact_store.jti_hash(refresh["jti"])
+        assert row.expiry_bucket == refresh["exp"] // DAY
+        assert row.user_id == user.pk
+        response = api_client.post(
+            self.refresh_url, {"refresh": tokens["refresh"]}, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_rotation_revokes_the_old_token(
+        self, compact_store, api_client: APIClient, user: User
+    ):
+        """Test a rotated refresh token cannot be used again."""
+        refresh = self.login(api_client, user)["refresh"]
+        response = api_client.post(
+            self.refresh_url, {"refresh": refresh}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert RevokedToken.objects.count() == 1
+
+        response = api_client.post(
+            self.refresh_url, {"refresh": refresh}, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_prune_drops_expired_buckets(self, compact_store, user: User):
+        """Test buckets are dropped once every token in them has expired."""
+        current = compact_store.bucket(time.time())
+        RevokedToken.objects.bulk_create(
+            RevokedToken(expiry_bucket=bucket, jti_hash=uuid4(), user_id=user.pk)
+            for bucket in (current - 2, current - 2, current - 1, current)
+        )
+
+        call_command("prune_tokens")
+        assert list(RevokedToken.objects.values_list("expiry_bucket", flat=True)) == [
+            current
+        ]
+        assert compact_store.prune(now=(current + 1) * DAY) == [current]
+
+    def test_unknown_backend(self, settings):
+        """Test a misspelt store name is rejected."""
+        settings.ACCOUNTS_REVOCATION_STORE = {"BACKEND": "redis"}
+        with pytest.raises(ImproperlyConfigured):
+            get_revocation_store()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCompactLogoutAll:
+    """Tests for logging out everywhere with the compact store."""
+
+    def test_relies_on_token_epoch(
+        self, compact_store, api_client: APIClient, user: User
+    ):
+        """Test logout everywhere writes no rows and still rejects old tokens."""
+        refresh = RefreshToken.for_user(user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        response = api_client.post("/api/v1/auth/logout/all/")
+        assert response.data["blacklisted"] == 0
+        assert not RevokedToken.objects.exists()
+        response = api_client.post(
+            "/api/v1/auth/jwt/refresh/", {"refresh": str(refresh)}, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
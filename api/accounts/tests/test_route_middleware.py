@@ -0,0 +1,56 @@
+"""Tests for route-scoped middleware."""
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from accounts.checks import check_admin_middleware
+from accounts.middleware import RouteMiddleware
+
+SESSION = "django.contrib.sessions.middleware.SessionMiddleware"
+
+
+def seen_by_view(request) -> HttpResponse:
+    """Return a response listing what the middleware attached to request."""
+    attributes = [name for name in ("session", "user") if hasattr(request, name)]
+    return HttpResponse(",".join(attributes))
+
+
+@pytest.mark.django_db
+class TestRouteMiddleware:
+    """Tests for accounts.middleware.RouteMiddleware."""
+
+    def test_api_skips_session_stack(self, rf: RequestFactory):
+        """Test API requests run without session or authentication middleware."""
+        middleware = RouteMiddleware(seen_by_view)
+        assert middleware(rf.get("/api/v1/auth/users/me/")).content == b""
+        assert middleware(rf.get("/admin/")).content == b"session,user"
+
+    def test_async_chain(self, rf: RequestFactory):
+        """Test the route stacks run in an async middleware chain."""
+
+        async def view(request):
+            return seen_by_view(request)
+
+        middleware = RouteMiddleware(view)
+        call = async_to_sync(middleware)
+        assert call(rf.get("/metrics")).content == b""
+        assert call(rf.get("/admin/")).content == b"session,user"
+
+    def test_runs_route_view_hooks(self, rf: RequestFactory):
+        """Test CSRF protection still applies to the admin's views."""
+        middleware = RouteMiddleware(seen_by_view)
+        request = rf.post("/admin/login/")
+        middleware(request)
+        response = middleware.process_view(request, seen_by_view, (), {})
+        assert response is not None and response.status_code == 403
+
+        request = rf.post("/api/v1/auth/users/")
+        assert middleware.process_view(request, seen_by_view, (), {}) is None
+
+    def test_check_requires_admin_middleware(self, settings):
+        """Test the system check flags an admin route without sessions."""
+        assert check_admin_middleware(None) == []
+        settings.ACCOUNTS_ROUTE_MIDDLEWARE = {"": [SESSION]}
+        assert [error.id for error in check_admin_middleware(None)] == ["accounts.E001"]
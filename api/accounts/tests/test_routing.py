@@ -0,0 +1,112 @@
+"""Tests for read-replica routing."""
+
+import pytest
+from django.contrib.sessions.models import Session
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.checks import check_routing_cache
+from accounts.models import User
+from accounts.routers import routing
+
+
+@pytest.fixture
+def replicas(monkeypatch) -> None:
+    """Configure one replica."""
+    monkeypatch.setattr(routing, "replicas", ["replica"])
+
+
+@pytest.fixture
+def request_routing(replicas):
+    """Route as inside a safe request for the duration of the test."""
+    token = routing.begin()
+    yield
+    routing.end(token)
+
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+    """Tests for accounts.routers.ReplicaRouting."""
+
+    def test_reads_outside_requests_use_primary(self, replicas):
+        """Test commands and workers never read from replicas."""
+        assert routing.db_for_read(User) == "default"
+
+    def test_safe_request_reads_replica_until_it_writes(self, request_routing):
+        """Test the first write moves the rest of the request to the primary."""
+        assert routing.db_for_read(User) == "replica"
+        assert routing.db_for_read(Session) == "default"
+
+        assert routing.db_for_write() == "default"
+        assert routing.db_for_read(User) == "default"
+
+    def test_pinned_user_reads_primary(self, user: User, request_routing):
+        """Test a pinned user's request sticks to the primary."""
+        routing.stick_if_pinned(str(user.pk))
+        assert routing.db_for_read(User) == "replica"
+
+        routing.pin(user.pk)
+        routing.stick_if_pinned(str(user.pk))
+        assert routing.db_for_read(User) == "default"
+
+    def test_committed_user_write_pins_user(
+        self, replicas, user: User, django_capture_on_commit_callbacks
+    ):
+        """Test saving a user pins it once the transaction commits."""
+        token = routing.begin()
+        try:
+            with django_capture_on_commit_callbacks(execute=True):
+                user.full_name = "Renamed"
+                user.save()
+        finally:
+            routing.end(token)
+
+        token = routing.begin()
+        try:
+            routing.stick_if_pinned(str(user.pk))
+            assert routing.db_for_read(User) == "default"
+        finally:
+            routing.end(token)
+
+    def test_check_flags_host_local_cache(self, replicas, monkeypatch, settings):
+        """Test the system check wants sticky markers in a cluster-wide cache."""
+        settings.CACHES = {
+            **settings.CACHES,
+            "cluster": {"BACKEND": "django.core.cache.backends.redis.RedisCache"},
+        }
+        assert [w.id for w in check_routing_cache(None)] == ["accounts.W001"]
+        monkeypatch.setattr(routing, "alias", "cluster")
+        assert check_routing_cache(None) == []
+        monkeypatch.setattr(routing, "alias", "missing")
+        assert [e.id for e in check_routing_cache(None)] == ["accounts.E003"]
+
+
+@pytest.mark.django_db
+class TestReplicaRoutingMiddleware:
+    """Tests for accounts.middleware.ReplicaRoutingMiddleware."""
+
+    url = "/api/v1/auth/users/me/"
+
+    @pytest.fixture
+    def client(self, monkeypatch, user: User) -> APIClient:
+        """Return a JWT client, with the primary standing in as the replica."""
+        monkeypatch.setattr(routing, "replicas", ["default"])
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client
+
+    def test_get_stays_on_replicas(self, client: APIClient, mocker):
+        """Test a read-only request never moves to the primary."""
+        end = mocker.spy(routing, "end")
+        assert client.get(self.url).status_code == 200
+        assert end.spy_return.primary is False
+
+    def test_write_pins_user_for_following_reads(self, client: APIClient, mocker):
+        """Test a profile update sends the user's next GET to the primary."""
+        end = mocker.spy(routing, "end")
+        client.patch(self.url, {"full_name": "Renamed"}, format="json")
+        assert end.spy_return.wrote is True
+
+        client.get(self.url)
+        assert end.spy_return.primary is True
+        assert end.spy_return.wrote is False
@@ -0,0 +1,68 @@
+"""Tests for the compiled serializer output path."""
+
+import datetime
+
+import pytest
+from django.utils import timezone
+from rest_framework import serializers
+
+from accounts.models import User
+from accounts.representation import compile_plan
+from accounts.serializers import UserSerializer
+
+
+class ReferenceUserSerializer(serializers.ModelSerializer):
+    """UserSerializer's fields through DRF's generic output path."""
+
+    class Meta:
+        """Meta options."""
+
+        model = User
+        fields = UserSerializer.Meta.fields
+
+
+@pytest.mark.django_db
+class TestCompiledUserSerializer:
+    """Tests for accounts.representation with UserSerializer."""
+
+    def test_plan_is_compiled(self):
+        """Test every UserSerializer field has a compiled formatter."""
+        plan = UserSerializer.compiled_plan()
+        assert plan is not None
+        assert [name for name, _, _ in plan] == list(UserSerializer.Meta.fields)
+
+    def test_matches_drf_output(self, user: User):
+        """Test the compiled output equals DRF's, including null values."""
+        user.agreed_at = None
+        assert UserSerializer(user).data == ReferenceUserSerializer(user).data
+
+        user.agreed_at = timezone.now()
+        assert UserSerializer(user).data == ReferenceUserSerializer(user).data
+
+    def test_non_utc_timezone(self, user: User):
+        """Test datetimes follow the active timezone like DRF."""
+        user.agreed_at = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.UTC)
+        with timezone.override("Asia/Kathmandu"):
+            data = UserSerializer(user).data
+            assert data == ReferenceUserSerializer(user).data
+        assert data["agreed_at"] == "2024-01-01T17:45:00+05:45"
+
+    def test_many(self, user: User):
+        """Test many=True accepts querysets and matches DRF."""
+        User.objects.create_user(email="b@example.com", username="b", password="x")
+        users = User.objects.order_by("email")
+        assert UserSerializer(users, many=True).data == (
+            ReferenceUserSerializer(users, many=True).data
+        )
+
+    def test_unsupported_field_falls_back(self):
+        """Test serializers with computed fields are not compiled."""
+
+        class ComputedSerializer(serializers.ModelSerializer):
+            display = serializers.SerializerMethodField()
+
+            class Meta:
+                model = User
+                fields = ("id", "display")
+
+        assert compile_plan(ComputedSerializer()) is None
@@ -0,0 +1,88 @@
+"""Tests for the startup report and the production settings."""
+
+import importlib
+
+import pytest
+
+from accounts.management.commands.startup_report import STDLIB, build_report, group_of
+
+APPS = ["django.contrib.auth", "rest_framework", "rest_framework_simplejwt"]
+
+
+class TestStartupReport:
+    """Tests for accounts.management.commands.startup_report."""
+
+    def test_groups_modules_by_app(self):
+        """Test modules are attributed to the most specific installed app."""
+        assert group_of("django.contrib.auth.models", APPS) == "django.contrib.auth"
+        assert group_of("rest_framework_simplejwt.tokens", APPS) == (
+            "rest_framework_simplejwt"
+        )
+        assert group_of("django.db.models", APPS) == "django"
+        assert group_of("json.decoder", APPS) == STDLIB
+
+    def test_reports_a_cold_start(self):
+        """Test a probe boot reports phases, apps and imports."""
+        report = build_report("config.settings.testing", repeat=1, top=5)
+
+        assert [phase["name"] for phase in report["phases"]] == [
+            "python",
+            "settings",
+            "apps",
+            "middleware",
+            "urls",
+        ]
+        apps = {app["name"]: app for app in report["apps"]}
+        assert apps["accounts"]["modules"] > 0
+        assert apps["accounts"]["heap_kib"] > 0
+        assert len(report["imports"]) == 5
+
+
+class TestProductionSettings:
+    """Tests for config.settings.production."""
+
+    def load(self, monkeypatch, admin_enabled: str = "True", **env: str):
+        """Import the production settings with ADMIN_ENABLED and env set."""
+        monkeypatch.setenv("ADMIN_ENABLED", admin_enabled)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        from config.settings import production
+
+        return importlib.reload(production)
+
+    @pytest.mark.parametrize("admin_enabled", ["True", "False"])
+    def test_schema_generator_is_left_out(self, monkeypatch, admin_enabled):
+        """Test drf-spectacular is neither installed nor the schema class."""
+        production = self.load(monkeypatch, admin_enabled)
+        assert "drf_spectacular" not in production.INSTALLED_APPS
+        assert "DEFAULT_SCHEMA_CLASS" not in production.REST_FRAMEWORK
+
+    def test_admin_can_be_left_out(self, monkeypatch):
+        """Test ADMIN_ENABLED=False drops the admin, sessions and messages."""
+        production = self.load(monkeypatch, "False")
+        for app in ("admin", "sessions", "messages"):
+            assert f"django.contrib.{app}" not in production.INSTALLED_APPS
+        assert not [
+            path
+            for paths in production.ACCOUNTS_ROUTE_MIDDLEWARE.values()
+            for path in paths
+            if "sessions" in path
+        ]
+
+        production = self.load(monkeypatch, "True")
+        assert "django.contrib.admin" in production.INSTALLED_APPS
+        assert production.ACCOUNTS_ROUTE_MIDDLEWARE[""]
+
+    def test_database_pool_from_environment(self, monkeypatch):
+        """Test the connection pool is sized and aged from the environment."""
+        production = self.load(
+            monkeypatch, DB_POOL_MAX_SIZE="4", DB_POOL_MAX_LIFETIME="600"
+        )
+        database = production.DATABASES["default"]
+        assert database["OPTIONS"]["pool"]["max_size"] == 4
+        assert database["OPTIONS"]["pool"]["max_lifetime"] == 600
+        assert database["CONN_HEALTH_CHECKS"] is True
+        assert not database.get("CONN_MAX_AGE")
+
+        production = self.load(monkeypatch, DB_POOL_ENABLED="False")
+        assert "pool" not in production.DATABASES["default"].get("OPTIONS", {})
@@ -0,0 +1,112 @@
+"""Tests for sliding-window throttles and the shared SQLite cache."""
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.cache_backends import SQLiteCache
+from accounts.throttling import AuthRateThrottle
+
+
+@pytest.fixture
+def auth_rate(mocker):
+    """Enable a 2/minute "auth" rate."""
+    mocker.patch.object(AuthRateThrottle, "THROTTLE_RATES", {"auth": "2/minute"})
+
+
+@pytest.mark.django_db
+class TestAuthRateThrottle:
+    """Tests for the "auth" scope on credential endpoints."""
+
+    def test_jwt_create_is_throttled(self, api_client: APIClient, auth_rate):
+        """Test the third login attempt within a minute is rejected."""
+        url = "/api/v1/auth/jwt/create/"
+        data = {"email": "nobody@example.com", "password": "wrong"}
+        for _ in range(2):
+            response = api_client.post(url, data, format="json")
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = api_client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response["Retry-After"]) > 0
+
+    def test_registration_is_throttled(
+        self, api_client: APIClient, user_data: dict, auth_rate
+    ):
+        """Test registration shares the "auth" scope."""
+        for _ in range(2):
+            api_client.post("/api/v1/auth/users/", {}, format="json")
+        response = api_client.post("/api/v1/auth/users/", user_data, format="json")
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_me_is_not_auth_throttled(self, authenticated_client: APIClient, auth_rate):
+        """Test ordinary endpoints do not use the "auth" scope."""
+        for _ in range(3):
+            response = authenticated_client.get("/api/v1/auth/users/me/")
+            assert response.status_code == status.HTTP_200_OK
+
+
+class TestSlidingWindow:
+    """Tests for the sliding-window counter arithmetic."""
+
+    def _throttle(self, mocker, now: float) -> AuthRateThrottle:
+        mocker.patch.object(AuthRateThrottle, "THROTTLE_RATES", {"auth": "10/minute"})
+        throttle = AuthRateThrottle()
+        throttle.timer = lambda: now
+        return throttle
+
+    def test_previous_window_is_weighted(self, mocker, rf):
+        """Test requests from the previous window count in proportion to overlap."""
+        request = rf.get("/")
+        # Fill the window [0, 60) with 10 requests.
+        for _ in range(10):
+            assert self._throttle(mocker, 30.0).allow_request(request, None)
+        assert not self._throttle(mocker, 30.0).allow_request(request, None)
+
+        # A quarter into the next window 7.5 of them still count.
+        allowed = sum(
+            self._throttle(mocker, 75.0).allow_request(request, None) for _ in range(5)
+        )
+        assert allowed == 2
+
+
+class TestSQLiteCache:
+    """Tests for accounts.cache_backends.SQLiteCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path) -> SQLiteCache:
+        return SQLiteCache(str(tmp_path / "cache.sqlite3"), {})
+
+    def test_set_get_delete(self, cache: SQLiteCache):
+        """Test basic round trips for pickled and integer values."""
+        cache.set("obj", {"a": [1, 2]})
+        cache.set("flag", True)
+        assert cache.get("obj") == {"a": [1, 2]}
+        assert cache.get("flag") is True
+        assert cache.delete("obj")
+        assert cache.get("obj") is None
+
+    def test_add_and_incr(self, cache: SQLiteCache):
+        """Test add only sets missing keys and incr is cumulative."""
+        assert cache.add("n", 1)
+        assert not cache.add("n", 5)
+        assert cache.incr("n") == 2
+        assert cache.decr("n", 2) == 0
+        with pytest.raises(ValueError):
+            cache.incr("missing")
+
+    def test_expired_entries_are_missing(self, cache: SQLiteCache):
+        """Test expired keys read as absent and can be re-added."""
+        cache.set("k", "v", timeout=-1)
+        assert cache.get("k") is None
+        assert not cache.has_key("k")
+        assert cache.add("k", "new")
+        assert cache.get("k") == "new"
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test two backend instances on one file see each other's writes."""
+        path = str(tmp_path / "cache.sqlite3")
+        first, second = SQLiteCache(path, {}), SQLiteCache(path, {})
+        first.set("k", 1)
+        second.incr("k")
+        assert first.get("k") == 2
@@ -0,0 +1,100 @@
+"""Sliding-window rate throttles backed by a shared cache."""
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+from .metrics import metrics
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Replace DRF's timestamp history with a sliding-window counter.
+
+    Each key keeps two integers: the request count of the current fixed window
+    and of the previous one. The previous count is weighted by how much of it
+    still overlaps the sliding window, so memory per key is constant and each
+    check is a couple of atomic cache operations.
+    """
+
+    rate: str | None
+    num_requests: int
+    duration: int
+    timer = SimpleRateThrottle.timer
+
+    @property
+    def cache(self):  # type: ignore[override]
+        """Return the cache shared by all workers."""
+        return caches[settings.ACCOUNTS_THROTTLE_CACHE]
+
+    def allow_request(self, request, view) -> bool:
+        """Count the request and reject it if the sliding window is full."""
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)  # type: ignore[attr-defined]
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, offset = divmod(self.now, self.duration)
+        current_key = f"{self.key}:{int(window)}"
+        previous_key = f"{self.key}:{int(window) - 1}"
+
+        current = self._incr(current_key)
+        previous = self.cache.get(previous_key, 0)
+        self.weight = 1 - offset / self.duration
+        self.current, self.previous = current, previous
+
+        if previous * self.weight + current > self.num_requests:
+            # Only accepted requests count towards the limit.
+            self.cache.decr(current_key)
+            metrics.inc("auth_throttled_total", scope=self.scope)
+            self.current -= 1
+            return False
+        return True
+
+    def _incr(self, key: str) -> int:
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, self.duration * 2):
+                return 1
+            return self.cache.incr(key)
+
+    def wait(self) -> float | None:
+        """Return the seconds until the next request would be accepted."""
+        # A request is accepted once previous * weight + current + 1 <= limit.
+        headroom = self.num_requests - self.current - 1
+        if headroom >= 0 and self.previous:
+            weight_needed = headroom / self.previous
+            return max(0.0, (self.weight - weight_needed) * self.duration)
+        # Wait for this window to end, then for its count to decay.
+        until_next = self.weight * self.duration
+        weight_needed = (self.num_requests - 1) / self.current if self.current else 1
+        return until_next + max(0.0, 1 - weight_needed) * self.duration
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    """Anonymous rate throttle using a shared sliding-window counter."""
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    """Per-user rate throttle using a shared sliding-window counter."""
+
+
+class AuthRateThrottle(SlidingWindowThrottleMixin, SimpleRateThrottle):
+    """Per-IP throttle for credential and account-recovery endpoints."""
+
+    scope = "auth"
+
+    def get_cache_key(self, request, view) -> str:
+        """Key the throttle by client IP, authenticated or not."""
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
@@ -0,0 +1,126 @@
+"""JWT token classes."""
+
+from collections.abc import Iterable
+
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken as BaseAccessToken
+from rest_framework_simplejwt.tokens import BlacklistMixin, Token
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .cache import token_epochs
+from .models import User
+from .revocation import get_revocation_store
+
+
+def revoke_user_tokens(user_ids: Iterable, batch_size: int = 500) -> int:
+    """
+    End every session of user_ids and return the refresh tokens blacklisted.
+
+    Each batch of users costs one store write, however many tokens they
+    hold, plus a token epoch bump that also revokes their access tokens.
+    """
+    user_ids = list(user_ids)
+    store = get_revocation_store()
+    blacklisted = 0
+    with transaction.atomic(using=router.db_for_write(User)):
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start : start + batch_size]
+            blacklisted += store.revoke_users(batch)
+            User.objects.filter(pk__in=batch).revoke_tokens()
+    return blacklisted
+
+
+TOKEN_EPOCH_CLAIM = "token_epoch"
+
+
+def current_token_epoch(user_id) -> int | None:
+    """Return the token epoch of user_id, or None if there is no such user."""
+    epoch = token_epochs.get(user_id)
+    if epoch is None:
+        epoch = (
+            User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list("token_epoch", flat=True)
+            .first()
+        )
+        if epoch is not None:
+            token_epochs.fill(user_id, epoch)
+    return epoch
+
+
+def is_revoked(token: Token, epoch: int | None = None) -> bool:
+    """
+    Return whether token was issued before its user's current epoch.
+
+    epoch is the user's epoch if the caller has already loaded the row;
+    otherwise it is looked up.
+    """
+    if epoch is None:
+        user_id = token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return False
+        epoch = current_token_epoch(user_id)
+    return epoch is not None and token.get(TOKEN_EPOCH_CLAIM, 0) < epoch
+
+
+class TokenEpochMixin:
+    """Embed the user's token epoch in tokens issued for them."""
+
+    @classmethod
+    def for_user(cls, user: User):
+        """Return a token for user carrying its current token epoch."""
+        token = super().for_user(user)  # type: ignore[misc]
+        token[TOKEN_EPOCH_CLAIM] = user.token_epoch
+        return token
+
+
+class AccessToken(TokenEpochMixin, BaseAccessToken):
+    """Access token carrying the user's token epoch."""
+
+
+class RefreshToken(BaseRefreshToken):
+    """Refresh token kept in the configured revocation store."""
+
+    access_token_class = AccessToken
+
+    def __init__(self, token=None, verify: bool = True, check_epoch: bool = True):
+        # The refresh serializer checks the epoch against the row it loads.
+        self.check_epoch = check_epoch
+        super().__init__(token, verify)
+
+    @classmethod
+    def for_user(cls, user: User) -> "RefreshToken":
+        """Return a refresh token for user, recorded if the store tracks issues."""
+        # Skips BlacklistMixin.for_user, which always writes an OutstandingToken.
+        token = super(BlacklistMixin, cls).for_user(user)
+        token[TOKEN_EPOCH_CLAIM] = user.token_epoch
+        get_revocation_store().issue(token, user)
+        return token
+
+    def outstand(self) -> None:
+        """Record this rotated token, if the store tracks issued tokens."""
+        get_revocation_store().outstand(self)
+
+    def check_blacklist(self) -> None:
+        """Raise TokenError if this token has been blacklisted or revoked."""
+        if get_revocation_store().is_revoked(self.payload):
+            raise TokenError(_("Token is blacklisted"))
+        if self.check_epoch and is_revoked(self):
+            raise TokenError(_("Token has been revoked"))
+
+    def blacklist(self) -> None:
+        """
+        Revoke this token in the revocation store.
+
+        Raise TokenError if it was already revoked. Rotation revokes the old
+        token before issuing a new one, so a replayed or concurrently rotated
+        token is rejected here even if check_blacklist() let it through.
+        """
+        if not get_revocation_store().revoke(self):
+            raise TokenError(_("Token is blacklisted"))
+
+    async def ablacklist(self) -> None:
+        """Async version of blacklist() using the async ORM."""
+        await get_revocation_store().arevoke(self)
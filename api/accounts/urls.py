@@ -1,13 +1,29 @@
 """Account URLs."""
 
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
 
-from .views import LogoutView
+from .views import (
+    CurrentUserView,
+    LogoutAllView,
+    LogoutView,
+    RevokeSessionsView,
+    TokenObtainPairView,
+    UserViewSet,
+)
 
 router = DefaultRouter()
+router.register("auth/users", UserViewSet)
 
 urlpatterns = [
+    # Served before the router so the async view handles users/me/.
+    path("auth/users/me/", CurrentUserView.as_view(), name="user-me"),
     path("", include(router.urls)),
+    re_path(r"^auth/jwt/create/?", TokenObtainPairView.as_view(), name="jwt-create"),
+    re_path(r"^auth/jwt/refresh/?", TokenRefreshView.as_view(), name="jwt-refresh"),
+    re_path(r"^auth/jwt/verify/?", TokenVerifyView.as_view(), name="jwt-verify"),
     path("auth/logout/", LogoutView.as_view(), name="logout"),
+    path("auth/logout/all/", LogoutAllView.as_view(), name="logout-all"),
+    path("auth/logout/users/", RevokeSessionsView.as_view(), name="logout-users"),
 ]
@@ -1,19 +1,180 @@
 """Account views."""
 
+import hmac
+
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from djoser import signals
+from djoser.conf import settings as djoser_settings
+from djoser.views import UserViewSet as BaseUserViewSet
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView as BaseTokenObtainPairView,
+)
+
+from .concurrency import run_cpu_bound
+from .keys import signing_keys
+from .metrics import metrics
+from .models import User
+from .provisioning import provision_users
+from .serializers import RevokeSessionsSerializer, UserSerializer
+from .throttling import AuthRateThrottle
+from .tokens import RefreshToken, revoke_user_tokens
+
+
+class AuthThrottleMixin:
+    """Apply the "auth" throttle scope on top of the default throttles."""
+
+    auth_throttled_actions: tuple[str, ...] | None = None
+
+    def get_throttles(self):
+        """Add the auth throttle for credential and recovery endpoints."""
+        throttles = super().get_throttles()  # type: ignore[misc]
+        action = getattr(self, "action", None)
+        if self.auth_throttled_actions is None or action in self.auth_throttled_actions:
+            throttles.append(AuthRateThrottle())
+        return throttles
+
+
+class TokenObtainPairView(AuthThrottleMixin, BaseTokenObtainPairView):
+    """Obtain a JWT pair, throttled by the "auth" scope."""
+
+
+class UserViewSet(AuthThrottleMixin, BaseUserViewSet):
+    """Djoser user viewset whose writes commit together with queued emails."""
+
+    auth_throttled_actions = ("create", "reset_password", "reset_password_confirm")
+
+    def dispatch(self, request, *args, **kwargs):
+        """Run unsafe requests in a transaction."""
+        if request.method in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic():
+            return super().dispatch(request, *args, **kwargs)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        permission_classes=[IsAdminUser],
+    )
+    def bulk(self, request):
+        """Register up to MAX_BATCH_SIZE users in one call (staff only)."""
+        rows = request.data.get("users") if isinstance(request.data, dict) else None
+        limit = settings.ACCOUNTS_PROVISIONING["MAX_BATCH_SIZE"]
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError({"users": ["Expected a non-empty list of users."]})
+        if len(rows) > limit:
+            raise ValidationError({"users": [f"At most {limit} users per request."]})
+
+        results = provision_users(rows, request, sender=type(self))
+        created = sum(result["status"] == "created" for result in results)
+        code = status.HTTP_201_CREATED
+        if created < len(rows):
+            code = status.HTTP_207_MULTI_STATUS
+        return Response(
+            {"created": created, "failed": len(rows) - created, "results": results},
+            status=code,
+        )
+
+
+def etag_matches(request, etag: str) -> bool:
+    """Return whether If-None-Match names etag, weakly compared, or is "*"."""
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    if etags == ["*"]:
+        return True
+    etag = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == etag for tag in etags)
+
+
+def user_etag(user) -> str:
+    """Return a strong ETag for the user's current version."""
+    # The pk is included because every user shares the users/me/ URL.
+    return f'"{user.pk.hex}-{user.version.hex}"'
+
+
+class CurrentUserView(AsyncAPIView):
+    """
+    Async replacement for djoser's users/me/ endpoint.
+
+    Responses carry an ETag built from ``User.version``, which is part of
+    the cached authentication row, so ``If-None-Match`` is answered with a
+    304 without querying or serializing the user.
+    """
+
+    permission_classes = [IsAuthenticated]
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Make clients revalidate and keep per-user caches separate."""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Authorization",))
+        return response
 
-class LogoutView(APIView):
+    async def get(self, request):
+        """Return the current user, or 304 if the client's copy is current."""
+        etag = user_etag(request.user)
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(UserSerializer(request.user).data, headers={"ETag": etag})
+
+    async def put(self, request):
+        """Replace the current user's writable fields."""
+        return await self._update(request, partial=False)
+
+    async def patch(self, request):
+        """Update some of the current user's writable fields."""
+        return await self._update(request, partial=True)
+
+    async def delete(self, request):
+        """Delete the current user after confirming their password."""
+        user = request.user
+        current_password = request.data.get("current_password", "")
+        if not await run_cpu_bound(check_password, current_password, user.password):
+            raise ValidationError(
+                {
+                    "current_password": [
+                        djoser_settings.CONSTANTS.messages.INVALID_PASSWORD_ERROR
+                    ]
+                }
+            )
+        await user.adelete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    async def _update(self, request, partial: bool) -> Response:
+        user = request.user
+        serializer = UserSerializer(
+            user, data=request.data, partial=partial, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        for attr, value in serializer.validated_data.items():
+            setattr(user, attr, value)
+        await user.asave(update_fields=list(serializer.validated_data))
+        await signals.user_updated.asend(
+            sender=self.__class__, user=user, request=request
+        )
+        return Response(UserSerializer(user).data, headers={"ETag": user_etag(user)})
+
+
+class LogoutView(AsyncAPIView):
     """Logout view that blacklists the refresh token."""
 
     permission_classes = [IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         """Blacklist the refresh token to logout user."""
         refresh_token = request.data.get("refresh")
 
@@ -24,8 +185,9 @@ class LogoutView(APIView):
             )
 
         try:
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+            # Validation may fall through to a blacklist query.
+            token = await sync_to_async(RefreshToken)(refresh_token)
+            await token.ablacklist()
             return Response(
                 {"detail": "Successfully logged out."},
                 status=status.HTTP_200_OK,
@@ -35,3 +197,86 @@ class LogoutView(APIView):
                 {"detail": "Invalid or expired token."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+
+
+class LogoutAllView(AsyncAPIView):
+    """Logout view that ends every session of the current user."""
+
+    permission_classes = [IsAuthenticated]
+
+    async def post(self, request):
+        """Revoke all of the user's refresh and access tokens."""
+        blacklisted = await sync_to_async(revoke_user_tokens)([request.user.pk])
+        return Response(
+            {"detail": "Logged out of all sessions.", "blacklisted": blacklisted},
+            status=status.HTTP_200_OK,
+        )
+
+
+class RevokeSessionsView(APIView):
+    """End every session of many users at once (staff only)."""
+
+    permission_classes = [IsAdminUser]
+    lookup_batch_size = 500
+
+    def post(self, request):
+        """Revoke the tokens of the users given by id or email."""
+        serializer = RevokeSessionsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        emails = serializer.validated_data["emails"]
+        batch_size = self.lookup_batch_size
+        found_ids: set = set()
+        email_users: set = set()
+        found_emails: set[str] = set()
+        for start in range(0, len(ids), batch_size):
+            rows = User.objects.filter(pk__in=ids[start : start + batch_size])
+            found_ids.update(rows.values_list("pk", flat=True))
+        for start in range(0, len(emails), batch_size):
+            batch = [email.lower() for email in emails[start : start + batch_size]]
+            rows = User.objects.annotate(email_lower=Lower("email")).filter(
+                email_lower__in=batch
+            )
+            for pk, email in rows.values_list("pk", "email_lower"):
+                email_users.add(pk)
+                found_emails.add(email)
+        not_found = [str(pk) for pk in ids if pk not in found_ids] + [
+            email for email in emails if email.lower() not in found_emails
+        ]
+        users = found_ids | email_users
+        blacklisted = revoke_user_tokens(list(users))
+        return Response(
+            {
+                "users": len(users),
+                "blacklisted": blacklisted,
+                "not_found": not_found,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+def metrics_view(request):
+    """Serve Prometheus metrics to scrapers presenting the metrics token."""
+    token = settings.ACCOUNTS_METRICS["TOKEN"]
+    if not metrics.enabled or not token:
+        raise Http404
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        return HttpResponse("Unauthorized", status=401, content_type="text/plain")
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def jwks_view(request):
+    """Serve the public JWT signing keys for verifying tokens locally."""
+    if not signing_keys.enabled:
+        raise Http404
+    document, etag = signing_keys.jwks()
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(document, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=signing_keys.max_age)
+    return response
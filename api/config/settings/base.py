@@ -1,6 +1,7 @@
 """Base settings for the API."""
 
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -36,16 +37,35 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "accounts.middleware.PrometheusMetricsMiddleware",
+    "accounts.middleware.RequestMetricsMiddleware",
+    "accounts.middleware.ProfilingMiddleware",
+    "accounts.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "accounts.middleware.RouteMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Middleware that RouteMiddleware runs only under a path prefix (the longest
+# match wins). The JWT-only API and metrics skip the browser-session stack.
+ACCOUNTS_ROUTE_MIDDLEWARE = {
+    "/api/": [],
+    "/metrics": [],
+    "/.well-known/": [],
+    "": [
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+    ],
+}
+
+# The admin's middleware checks only look at MIDDLEWARE; accounts.E001
+# checks the admin's route in ACCOUNTS_ROUTE_MIDDLEWARE instead.
+SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -65,6 +85,10 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
+
+# Threads for CPU-bound work (password hashing) in async views
+ACCOUNTS_CPU_THREADS = int(os.getenv("CPU_THREADS", "4"))
 
 # Database
 DATABASES = {
@@ -78,6 +102,50 @@ DATABASES = {
     }
 }
 
+# Read replicas: database aliases that safe requests may read from. A user
+# whose data was written reads from the primary for STICKY_SECONDS; the
+# marker lives in CACHE_ALIAS. The default "shared" cache is local to each
+# host, so with several app servers point CACHE_ALIAS at a cache they all
+# reach; a system check warns otherwise.
+DATABASE_ROUTERS = ["accounts.routers.ReplicaRouter"]
+ACCOUNTS_DATABASE_ROUTING = {
+    "REPLICAS": [],
+    "STICKY_SECONDS": int(os.getenv("DB_REPLICA_STICKY_SECONDS", "10")),
+    "CACHE_ALIAS": os.getenv("DB_REPLICA_CACHE_ALIAS", "shared"),
+    "PRIMARY_APPS": ["sessions"],
+}
+
+# Cache
+# "shared" lives in a local SQLite file that every worker on the host opens,
+# so throttle counters and cross-worker signals agree between processes.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": "accounts.cache_backends.SQLiteCache",
+        "LOCATION": os.getenv(
+            "SHARED_CACHE_PATH",
+            str(Path(tempfile.gettempdir()) / "auth-api-shared-cache.sqlite3"),
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
+    },
+}
+
+# Cache used by the sliding-window throttles
+ACCOUNTS_THROTTLE_CACHE = "shared"
+
+# Failed-login scores per account and per IP. Scores halve every HALF_LIFE
+# seconds; after THRESHOLD recent failures, logins are rejected before hashing.
+ACCOUNTS_LOGIN_GUARD = {
+    "ENABLED": True,
+    "ACCOUNT_THRESHOLD": 10,
+    "IP_THRESHOLD": 50,
+    "HALF_LIFE": 300,
+    "MAX_SCORE": 160,
+    "CACHE_ALIAS": "shared",
+}
+
 # Auth
 AUTH_USER_MODEL = "accounts.User"
 
@@ -104,12 +172,12 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "accounts.throttling.SlidingWindowAnonRateThrottle",
+        "accounts.throttling.SlidingWindowUserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/hour",
@@ -125,6 +193,99 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.TokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "accounts.serializers.TokenVerifySerializer",
+    # RS256, ES256 or EdDSA sign with ACCOUNTS_SIGNING_KEYS instead of SECRET_KEY
+    "ALGORITHM": os.getenv("JWT_ALGORITHM", "HS256"),
+}
+
+# Key ring for asymmetric JWT algorithms, published at /.well-known/jwks.json.
+# `manage.py rotate_signing_key` adds keys; each signs only after it has been
+# published for JWKS_MAX_AGE seconds, so cached JWKS documents already know it.
+ACCOUNTS_SIGNING_KEYS = {
+    "DIRECTORY": os.getenv("JWT_KEY_DIR", str(BASE_DIR / "keys")),
+    "ACTIVE_KID": os.getenv("JWT_ACTIVE_KID", ""),
+    "JWKS_MAX_AGE": int(os.getenv("JWKS_MAX_AGE", "3600")),
+    "RELOAD_INTERVAL": 60.0,
+}
+
+# Bloom filter in front of the refresh token blacklist. Workers pick up each
+# other's blacklist writes through a generation counter in CACHE_ALIAS and,
+# at the latest, after SYNC_INTERVAL seconds. Ids skipped by a catch-up are
+# re-read for GAP_TIMEOUT seconds in case their rows were still committing.
+# A stale filter cannot let a rotated token through: rotation fails when the
+# old token's blacklist row already exists.
+ACCOUNTS_BLACKLIST_FILTER = {
+    "ENABLED": True,
+    "ERROR_RATE": 0.01,
+    "MIN_CAPACITY": 100_000,
+    "SYNC_INTERVAL": 1.0,
+    "REBUILD_INTERVAL": 3600.0,
+    "GAP_TIMEOUT": 60.0,
+    "MAX_GAPS": 1000,
+    "CACHE_ALIAS": "shared",
+}
+
+# Validated access tokens, kept per process until they expire so repeat
+# requests skip signature and claim checks.
+ACCOUNTS_TOKEN_CACHE = {
+    "ENABLED": os.getenv("TOKEN_CACHE_ENABLED", "True").lower() == "true",
+    "MAXSIZE": int(os.getenv("TOKEN_CACHE_MAXSIZE", "8192")),
+}
+
+# User cache for JWT authentication. Entries live in a per-process LRU for
+# LOCAL_TTL seconds; set CACHE_ALIAS to share them across workers. A write
+# leaves a per-user marker in BROADCAST_ALIAS, which workers check at most
+# every SYNC_INTERVAL seconds per entry; writes to more than MAX_MARKERS users
+# at once clear every worker's cache instead. With several hosts, point
+# BROADCAST_ALIAS at a cache they all reach.
+ACCOUNTS_USER_CACHE = {
+    "ENABLED": True,
+    "MAXSIZE": int(os.getenv("USER_CACHE_MAXSIZE", "4096")),
+    "LOCAL_TTL": int(os.getenv("USER_CACHE_LOCAL_TTL", "30")),
+    "TIMEOUT": int(os.getenv("USER_CACHE_TIMEOUT", "300")),
+    "CACHE_ALIAS": os.getenv("USER_CACHE_ALIAS") or None,
+    "BROADCAST_ALIAS": os.getenv("USER_CACHE_BROADCAST_ALIAS", "shared"),
+    "SYNC_INTERVAL": float(os.getenv("USER_CACHE_SYNC_INTERVAL", "1.0")),
+    "MAX_MARKERS": 100,
+    "FIELDS": (
+        "id",
+        "password",
+        "email",
+        "username",
+        "full_name",
+        "is_active",
+        "is_staff",
+        "is_superuser",
+        "agreed_to_terms",
+        "agreed_at",
+        "date_joined",
+        "version",
+        "token_epoch",
+    ),
+}
+
+# Current token epoch per user, checked on every authenticated request.
+# Workers read it from CACHE_ALIAS and keep it for LOCAL_TTL seconds, so a
+# revocation reaches every worker sharing that cache within that time.
+# Entries there expire after SHARED_TTL seconds, after which the epoch is
+# read from the user row again; hosts with their own CACHE_ALIAS see a
+# revocation once that happens and their cached user row is reloaded.
+ACCOUNTS_TOKEN_EPOCHS = {
+    "MAXSIZE": int(os.getenv("TOKEN_EPOCH_CACHE_MAXSIZE", "8192")),
+    "LOCAL_TTL": float(os.getenv("TOKEN_EPOCH_LOCAL_TTL", "1.0")),
+    "SHARED_TTL": float(os.getenv("TOKEN_EPOCH_SHARED_TTL", "5.0")),
+    "CACHE_ALIAS": "shared",
+}
+
+# Where revoked refresh tokens are kept. "outstanding" uses simplejwt's
+# OutstandingToken and BlacklistedToken tables, which record every issued
+# token. "compact" stores only revoked ones, as a JTI hash, a user id and an
+# expiry bucket of BUCKET_SECONDS; buckets are dropped whole once expired.
+ACCOUNTS_REVOCATION_STORE = {
+    "BACKEND": os.getenv("REVOCATION_STORE", "outstanding"),
+    "BUCKET_SECONDS": int(os.getenv("REVOCATION_BUCKET_SECONDS", "86400")),
 }
 
 # Token expiration for activation and password reset emails (30 minutes)
@@ -156,6 +317,11 @@ DJOSER = {
     },
 }
 
+# Staff-only bulk registration (POST auth/users/bulk/)
+ACCOUNTS_PROVISIONING = {
+    "MAX_BATCH_SIZE": int(os.getenv("BULK_REGISTRATION_MAX_USERS", "100")),
+}
+
 # Frontend URLs (for email links)
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
@@ -172,6 +338,64 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "resend")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "noreply@example.com")
 
+# Per-request cost accounting: a JSON log line on the "accounts.metrics"
+# logger for a SAMPLE_RATE fraction of requests, plus a warning for statements
+# repeated DUPLICATE_THRESHOLD times (likely N+1). The Server-Timing header is
+# sent only to staff users and to clients in SERVER_TIMING_IPS. When disabled
+# the middleware is dropped from the stack.
+ACCOUNTS_REQUEST_METRICS = {
+    "ENABLED": os.getenv("REQUEST_METRICS_ENABLED", "False").lower() == "true",
+    "SAMPLE_RATE": float(os.getenv("REQUEST_METRICS_SAMPLE_RATE", "1.0")),
+    "SERVER_TIMING": True,
+    "SERVER_TIMING_IPS": [
+        ip for ip in os.getenv("SERVER_TIMING_IPS", "").split(",") if ip
+    ],
+    "LOG": True,
+    "DUPLICATE_THRESHOLD": 3,
+}
+
+# Prometheus metrics. Workers write their counters to DIRECTORY (use a tmpfs
+# path); /metrics sums them and requires "Authorization: Bearer <TOKEN>". The
+# endpoint is disabled while TOKEN is empty.
+ACCOUNTS_METRICS = {
+    "ENABLED": os.getenv("METRICS_ENABLED", "True").lower() == "true",
+    "DIRECTORY": os.getenv(
+        "METRICS_DIR", os.path.join(tempfile.gettempdir(), "auth-api-metrics")
+    ),
+    "FLUSH_INTERVAL": 5.0,
+    "TOKEN": os.getenv("METRICS_TOKEN", ""),
+}
+
+# Sampling profiler, switched on per route in the admin (Profiler
+# configuration) or per request with the HEADER header, honoured only when
+# the request authenticates as staff. Stacks go to
+# DIRECTORY/profile-<pid>.folded; sampling stays under MAX_OVERHEAD of a core.
+ACCOUNTS_PROFILER = {
+    "ENABLED": os.getenv("PROFILER_ENABLED", "True").lower() == "true",
+    "DIRECTORY": os.getenv(
+        "PROFILER_DIR", os.path.join(tempfile.gettempdir(), "auth-api-profiles")
+    ),
+    "HEADER": "X-Profile",
+    "INTERVAL": 0.005,
+    "MAX_OVERHEAD": 0.02,
+    "MAX_ACTIVE": 8,
+    "MAX_STACKS": 10_000,
+    "MAX_DEPTH": 100,
+    "FLUSH_INTERVAL": 10.0,
+    "CONFIG_TTL": 5.0,
+}
+
+# Email outbox: authentication emails are queued in the database and
+# delivered by `python manage.py process_email_outbox`.
+EMAIL_OUTBOX = {
+    "ENABLED": os.getenv("EMAIL_OUTBOX_ENABLED", "True").lower() == "true",
+    "BATCH_SIZE": 50,
+    "POLL_INTERVAL": 2.0,
+    "MAX_ATTEMPTS": 5,
+    "RETRY_BACKOFF": 30,  # seconds, doubled after each failed attempt
+    "MAX_BACKOFF": 3600,
+}
+
 # API Documentation (drf-spectacular)
 SPECTACULAR_SETTINGS = {
     "TITLE": "Auth API",
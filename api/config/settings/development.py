@@ -21,3 +21,6 @@ CORS_ALLOWED_ORIGINS = [
 
 # Email: Use console backend for local development (prints to terminal)
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+
+# Send emails inline so they show up in the runserver console
+EMAIL_OUTBOX["ENABLED"] = False  # noqa: F405
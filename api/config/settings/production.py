@@ -11,6 +11,39 @@ ALLOWED_HOSTS = [h for h in os.getenv("ALLOWED_HOSTS", "").split(",") if h]
 
 CORS_ALLOWED_ORIGINS = [o for o in os.getenv("CORS_ALLOWED_ORIGINS", "").split(",") if o]
 
+# Database: a psycopg connection pool per worker process, so requests reuse
+# connections instead of paying for TCP, TLS and authentication each time.
+# With health checks on, every checkout is validated with an empty query.
+DATABASES = {
+    "default": {
+        **DATABASES["default"],  # noqa: F405
+        "CONN_HEALTH_CHECKS": os.getenv("DB_HEALTH_CHECKS", "True").lower() == "true",
+    }
+}
+if os.getenv("DB_POOL_ENABLED", "True").lower() == "true":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        }
+    }
+
+# Read replicas share the primary's credentials and pool settings.
+REPLICA_HOSTS = [h for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h]
+for index, host in enumerate(REPLICA_HOSTS):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+ACCOUNTS_DATABASE_ROUTING = {
+    **ACCOUNTS_DATABASE_ROUTING,  # noqa: F405
+    "REPLICAS": [f"replica_{index}" for index in range(len(REPLICA_HOSTS))],
+}
+
 # Security
 SECURE_SSL_REDIRECT = True
 SESSION_COOKIE_SECURE = True
@@ -20,3 +53,31 @@ SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = "DENY"
+
+# Lighter workers: the schema views are only mounted with DEBUG, so
+# drf-spectacular is never loaded in production.
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "drf_spectacular"]  # noqa: F405
+REST_FRAMEWORK = {  # noqa: F405
+    key: value
+    for key, value in REST_FRAMEWORK.items()  # noqa: F405
+    if key != "DEFAULT_SCHEMA_CLASS"
+}
+
+# API-only deployments can drop the admin along with the session and message
+# support it needs; serve the admin from a separate deployment instead.
+if os.getenv("ADMIN_ENABLED", "True").lower() != "true":
+    ADMIN_APPS = (
+        "django.contrib.admin",
+        "django.contrib.sessions",
+        "django.contrib.messages",
+    )
+    ADMIN_MIDDLEWARE = (
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+    )
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_APPS]
+    ACCOUNTS_ROUTE_MIDDLEWARE = {
+        prefix: [m for m in stack if m not in ADMIN_MIDDLEWARE]
+        for prefix, stack in ACCOUNTS_ROUTE_MIDDLEWARE.items()  # noqa: F405
+    }
@@ -1,18 +1,24 @@
 """URL configuration for the API."""
 
+from django.apps import apps
 from django.conf import settings
-from django.contrib import admin
 from django.urls import include, path
 
+from accounts.views import jwks_view, metrics_view
+
 urlpatterns = [
-    path("admin/", admin.site.urls),
-    # Auth endpoints (Djoser)
-    path("api/v1/auth/", include("djoser.urls")),
-    path("api/v1/auth/", include("djoser.urls.jwt")),
-    # API endpoints
+    path("metrics", metrics_view, name="metrics"),
+    path(".well-known/jwks.json", jwks_view, name="jwks"),
+    # API endpoints (Djoser user and JWT endpoints are served by accounts)
     path("api/v1/", include("accounts.urls")),
 ]
 
+# The admin is left out of API-only deployments (ADMIN_ENABLED=False)
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
+
 # API Documentation - only available in DEBUG mode
 if settings.DEBUG:
     from drf_spectacular.views import (
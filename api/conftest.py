@@ -1,13 +1,70 @@
 """Shared pytest fixtures."""
 
 import pytest
+from django.core.cache import caches
 from rest_framework.test import APIClient
 
+from accounts.blacklist import blacklist_filter
+from accounts.cache import token_cache, token_epochs, user_cache
+from accounts.metrics import metrics
 from accounts.models import User
+from accounts.profiling import profiler
 
 USER_PASSWORD = "TestPass123!"
 
 
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """Start every test with an empty user cache."""
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with no validated tokens or token epochs cached."""
+    token_cache.clear()
+    token_epochs.clear()
+    yield
+    token_cache.clear()
+    token_epochs.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache():
+    """Start every test without throttle counters or login failures."""
+    caches["shared"].clear()
+    yield
+    caches["shared"].clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_blacklist_filter():
+    """Rebuild the blacklist filter from each test's database."""
+    blacklist_filter.reset()
+    yield
+    blacklist_filter.reset()
+
+
+@pytest.fixture(autouse=True)
+def isolate_metrics(tmp_path):
+    """Give every test an empty metrics registry and directory."""
+    metrics.directory = tmp_path / "metrics"
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture(autouse=True)
+def isolate_profiler(tmp_path):
+    """Give every test an empty profiler and re-read the admin switch."""
+    profiler.directory = tmp_path / "profiles"
+    profiler.reset()
+    yield
+    profiler.reset()
+
+
 @pytest.fixture
 def api_client() -> APIClient:
     """Return an unauthenticated API client."""
@@ -58,3 +115,12 @@ def authenticated_client(api_client: APIClient, user: User) -> APIClient:
     """Return an authenticated API client."""
     api_client.force_authenticate(user=user)
     return api_client
+
+
+@pytest.fixture
+def staff_client(api_client: APIClient, user: User) -> APIClient:
+    """Return a client authenticated as a staff user."""
+    user.is_staff = True
+    user.save()
+    api_client.force_authenticate(user=user)
+    return api_client